@@ -1,8 +1,178 @@
 """Configurações do projeto carregadas de variáveis de ambiente."""
 
 import os
+from typing import Optional
+
 from dotenv import load_dotenv
 
 load_dotenv()
 
 DATABASE_URL: str = os.getenv("DATABASE_URL")
+
+# Banco usado pelas rotas de leitura (GET), como uma réplica. Vazio usa o
+# mesmo banco de DATABASE_URL.
+READ_DATABASE_URL: str = os.getenv("READ_DATABASE_URL", "") or DATABASE_URL
+
+# Pool de conexões de cada engine (escrita e leitura): conexões mantidas,
+# conexões extras sob pico, espera máxima por uma conexão livre, teste da
+# conexão antes do uso e idade máxima de uma conexão, em segundos (-1 =
+# sem limite).
+DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT_SECONDS: float = float(
+    os.getenv("DB_POOL_TIMEOUT_SECONDS", "30")
+)
+DB_POOL_PRE_PING: bool = (
+    os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+)
+DB_POOL_RECYCLE_SECONDS: int = int(
+    os.getenv("DB_POOL_RECYCLE_SECONDS", "1800")
+)
+
+# Tempo máximo de cada comando no PostgreSQL (`statement_timeout`), em
+# milissegundos, no engine de escrita e no de leitura (0 = sem limite).
+DB_STATEMENT_TIMEOUT_MS: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+DB_READ_STATEMENT_TIMEOUT_MS: int = int(
+    os.getenv("DB_READ_STATEMENT_TIMEOUT_MS", str(DB_STATEMENT_TIMEOUT_MS))
+)
+
+# Tamanho dos mini-lotes enviados ao Flair em classificações em lote.
+CLASSIFIER_MINI_BATCH_SIZE: int = int(
+    os.getenv("CLASSIFIER_MINI_BATCH_SIZE", "32")
+)
+
+# Quantidade máxima de avaliações aceitas em POST /reviews/batch.
+REVIEW_BATCH_MAX_SIZE: int = int(os.getenv("REVIEW_BATCH_MAX_SIZE", "1000"))
+
+# Paginação de GET /reviews/: tamanho padrão e máximo de cada página.
+REVIEW_PAGE_SIZE: int = int(os.getenv("REVIEW_PAGE_SIZE", "100"))
+REVIEW_MAX_PAGE_SIZE: int = int(os.getenv("REVIEW_MAX_PAGE_SIZE", "1000"))
+
+# Tamanho máximo do texto buscado em GET /reviews/search.
+REVIEW_SEARCH_MAX_QUERY_LENGTH: int = int(
+    os.getenv("REVIEW_SEARCH_MAX_QUERY_LENGTH", "200")
+)
+
+# Linhas lidas do cursor do banco e enviadas a cada bloco de
+# GET /reviews/export.
+REVIEW_EXPORT_CHUNK_SIZE: int = int(
+    os.getenv("REVIEW_EXPORT_CHUNK_SIZE", "1000")
+)
+
+# Respostas com pelo menos `GZIP_MIN_SIZE` bytes são comprimidas com gzip,
+# no nível `GZIP_COMPRESS_LEVEL` (1 a 9), quando o cliente envia
+# `Accept-Encoding: gzip`.
+GZIP_MIN_SIZE: int = int(os.getenv("GZIP_MIN_SIZE", "1000"))
+GZIP_COMPRESS_LEVEL: int = int(os.getenv("GZIP_COMPRESS_LEVEL", "6"))
+
+# Avaliações por INSERT de várias linhas e por transação na criação em
+# lote.
+REVIEW_INSERT_CHUNK_SIZE: int = int(
+    os.getenv("REVIEW_INSERT_CHUNK_SIZE", "500")
+)
+
+# Cache do relatório de GET /reviews/report: dias guardados em memória
+# (0 desativa) e idade máxima de cada dia, em segundos (0 = sem expiração).
+# Cada worker descarta os dias das avaliações que ele mesmo cria; a
+# expiração limita o atraso em relação às criadas pelos demais workers.
+REPORT_CACHE_MAX_DAYS: int = int(os.getenv("REPORT_CACHE_MAX_DAYS", "3660"))
+REPORT_CACHE_TTL_SECONDS: float = float(
+    os.getenv("REPORT_CACHE_TTL_SECONDS", "60")
+)
+# Segundos, após a criação de uma avaliação, em que o dia dela é lido do
+# banco a cada relatório sem voltar ao cache, para não guardar a contagem
+# de uma réplica de leitura que ainda não recebeu a inserção.
+REPORT_CACHE_GRACE_SECONDS: float = float(
+    os.getenv("REPORT_CACHE_GRACE_SECONDS", "5")
+)
+
+# Cache de classificações: entradas na camada LRU em memória (0 desativa),
+# camada persistente opcional ("sqlite", "redis" ou "memory") e sua URL.
+CLASSIFICATION_CACHE_SIZE: int = int(
+    os.getenv("CLASSIFICATION_CACHE_SIZE", "10000")
+)
+CLASSIFICATION_CACHE_BACKEND: str = os.getenv(
+    "CLASSIFICATION_CACHE_BACKEND", ""
+)
+CLASSIFICATION_CACHE_URL: str = os.getenv("CLASSIFICATION_CACHE_URL")
+CLASSIFICATION_CACHE_TTL: Optional[int] = int(
+    os.getenv("CLASSIFICATION_CACHE_TTL", "0")
+) or None
+
+# Carrega e aquece o classificador na inicialização da aplicação. Se
+# desativado, o modelo é carregado na primeira classificação.
+CLASSIFIER_PRELOAD: bool = (
+    os.getenv("CLASSIFIER_PRELOAD", "true").lower() == "true"
+)
+
+# Agendador de micro-lotes: agrupa classificações concorrentes de
+# POST /reviews/ em uma única inferência quando o lote atinge o tamanho
+# máximo ou o primeiro texto espera o tempo máximo.
+SCHEDULER_ENABLED: bool = (
+    os.getenv("SCHEDULER_ENABLED", "true").lower() == "true"
+)
+SCHEDULER_MAX_BATCH_SIZE: int = int(
+    os.getenv("SCHEDULER_MAX_BATCH_SIZE", "32")
+)
+SCHEDULER_MAX_WAIT_MS: float = float(
+    os.getenv("SCHEDULER_MAX_WAIT_MS", "5")
+)
+SCHEDULER_MAX_QUEUE_SIZE: int = int(
+    os.getenv("SCHEDULER_MAX_QUEUE_SIZE", "1000")
+)
+
+# Threads do executor dedicado à classificação nas rotas assíncronas.
+CLASSIFIER_EXECUTOR_WORKERS: int = int(
+    os.getenv("CLASSIFIER_EXECUTOR_WORKERS", "4")
+)
+
+# Backend de inferência do modelo: "flair" (precisão total),
+# "flair-quantized" (int8 dinâmico em CPU) ou "stub" (determinístico,
+# para testes).
+CLASSIFIER_BACKEND: str = os.getenv("CLASSIFIER_BACKEND", "flair")
+
+# Lematização com spaCy para o casamento de léxicos. Desativada por
+# padrão até a acurácia com lemas ser validada nos casos de referência;
+# desativada, o spaCy não é carregado. `LEMMATIZER_N_PROCESS` > 1 usa
+# vários processos no `nlp.pipe` das classificações em lote.
+CLASSIFIER_LEMMATIZE: bool = (
+    os.getenv("CLASSIFIER_LEMMATIZE", "false").lower() == "true"
+)
+SPACY_MODEL: str = os.getenv("SPACY_MODEL", "pt_core_news_sm")
+LEMMATIZER_BATCH_SIZE: int = int(os.getenv("LEMMATIZER_BATCH_SIZE", "64"))
+LEMMATIZER_N_PROCESS: int = int(os.getenv("LEMMATIZER_N_PROCESS", "1"))
+LEMMATIZER_CACHE_SIZE: int = int(
+    os.getenv("LEMMATIZER_CACHE_SIZE", "50000")
+)
+
+# Modo de textos longos: avaliações com mais de `CLASSIFIER_LONG_TEXT_CHARS`
+# caracteres ou mais tokens que o orçamento são divididas em sentenças,
+# pontuadas em lote. Só as sentenças iniciais que cabem em
+# `CLASSIFIER_MAX_TOKENS_PER_REVIEW` tokens são pontuadas pelo modelo, o
+# que limita o custo de CPU por avaliação; as regras analisam o texto
+# inteiro.
+CLASSIFIER_LONG_TEXT_CHARS: int = int(
+    os.getenv("CLASSIFIER_LONG_TEXT_CHARS", "1000")
+)
+CLASSIFIER_MAX_TOKENS_PER_REVIEW: int = int(
+    os.getenv("CLASSIFIER_MAX_TOKENS_PER_REVIEW", "256")
+)
+
+# Threads intra-op do PyTorch em cada worker (0 mantém o padrão do
+# PyTorch, que usa todos os núcleos). Com vários workers, use
+# aproximadamente núcleos / workers para evitar disputa de CPU.
+TORCH_NUM_THREADS: int = int(os.getenv("TORCH_NUM_THREADS", "0"))
+
+# Distância máxima, em caracteres, entre termos consecutivos dos padrões
+# de neutralidade (0 = sem limite, apenas na mesma linha).
+NEUTRAL_PATTERN_MAX_GAP: int = int(os.getenv("NEUTRAL_PATTERN_MAX_GAP", "0"))
+
+# Arquivo JSON com os léxicos, padrões e limiares das regras heurísticas
+# (vazio = `app/services/rules.json`). Com
+# `CLASSIFIER_RULES_WATCH_SECONDS` > 0, cada worker verifica o arquivo
+# nesse intervalo e recarrega as regras quando ele muda, sem recarregar o
+# modelo.
+CLASSIFIER_RULES_PATH: str = os.getenv("CLASSIFIER_RULES_PATH", "")
+CLASSIFIER_RULES_WATCH_SECONDS: float = float(
+    os.getenv("CLASSIFIER_RULES_WATCH_SECONDS", "0")
+)
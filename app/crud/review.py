@@ -1,81 +1,718 @@
 """Operações CRUD para o modelo Review."""
 
+import base64
+import binascii
+import json
+from collections import Counter
 from datetime import date
-from typing import Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
 
-from sqlalchemy import and_, func
-from sqlalchemy.orm import Session
+from sqlalchemy import (
+    ClauseElement,
+    Executable,
+    Row,
+    and_,
+    column,
+    delete,
+    func,
+    insert,
+    literal_column,
+    select,
+    table,
+    tuple_,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
 
-from app.models.review import Review
+from app.config import REVIEW_INSERT_CHUNK_SIZE
+from app.metrics import DB_QUERY_SECONDS
+from app.models.review import SEARCH_TS_CONFIG, Review, ReviewDailySentiment
 from app.schemas.review import ReviewBase, SentimentsEnum
-from app.services.classifier import classify_sentiment
+from app.services.classifier import classify_sentiment_async
+from app.services.idempotency import review_content_hash
 
 
-def create_review(db: Session, review_data: ReviewBase) -> Review:
+class BulkInsertError(Exception):
+    """Falha ao inserir um dos blocos de `create_reviews_bulk`.
+
+    Attributes:
+        created (List[Review]): Avaliações dos blocos anteriores, já
+            confirmadas no banco.
+    """
+
+    def __init__(self, created: List[Review], error: Exception):
+        super().__init__(str(error))
+        self.created = created
+
+
+class DuplicateReviewError(Exception):
+    """A avaliação já existe, com o mesmo conteúdo ou a mesma
+    Idempotency-Key.
+
+    Attributes:
+        existing (Review): Avaliação já gravada.
+    """
+
+    def __init__(self, existing: Review):
+        super().__init__(f"Avaliação já existente (ID {existing.id}).")
+        self.existing = existing
+
+
+# INSERT com ON CONFLICT de cada dialeto, usado no resumo diário.
+UPSERT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+# Tabela FTS5 de `review_text` no SQLite, criada em `SEARCH_DDL`.
+REVIEWS_FTS = table("reviews_fts", column("rowid"), column("rank"))
+
+
+# Colunas de `ReviewResponse`, lidas na listagem, na busca e na exportação
+# sem instanciar objetos `Review` nem passar pelo identity map da sessão.
+REVIEW_COLUMNS = (
+    Review.id,
+    Review.customer_name,
+    Review.review_text,
+    Review.evaluation_date,
+    Review.sentiment,
+)
+
+
+def content_hash(review_data: ReviewBase) -> str:
+    """Retorna o hash do conteúdo da avaliação, gravado em
+    `Review.content_hash`."""
+    return review_content_hash(
+        review_data.customer_name,
+        review_data.review_text,
+        review_data.evaluation_date,
+    )
+
+
+async def create_review(
+    db: AsyncSession,
+    review_data: ReviewBase,
+    sentiment: Optional[str] = None,
+    idempotency_key: Optional[str] = None,
+) -> Review:
     """Cria uma nova avaliação no banco de dados após classificar o sentimento.
 
+    O resumo diário por sentimento é atualizado na mesma transação.
+
     Args:
-        db (Session): Sessão ativa do banco de dados.
+        db (AsyncSession): Sessão ativa do banco de dados.
         review_data (ReviewBase): Dados da avaliação fornecida pelo cliente.
+        sentiment (Optional[str]): Sentimento já classificado. Se omitido,
+            o texto é classificado aqui.
+        idempotency_key (Optional[str]): Idempotency-Key da requisição.
 
     Returns:
         Review: Objeto da avaliação criada.
+
+    Raises:
+        DuplicateReviewError: Se já existir uma avaliação com o mesmo
+            conteúdo ou a mesma Idempotency-Key. A transação é desfeita.
     """
-    sentiment = classify_sentiment(review_data.review_text)
+    if sentiment is None:
+        sentiment = await classify_sentiment_async(review_data.review_text)
 
     review = Review(
         customer_name=review_data.customer_name,
         review_text=review_data.review_text,
         evaluation_date=review_data.evaluation_date,
         sentiment=sentiment,
+        content_hash=content_hash(review_data),
+        idempotency_key=idempotency_key,
     )
-    db.add(review)
-    db.commit()
-    db.refresh(review)
+    try:
+        db.add(review)
+        await increment_daily_sentiment(
+            db, Counter([(review.evaluation_date, SentimentsEnum(sentiment))])
+        )
+        with DB_QUERY_SECONDS.labels("writer", "COMMIT").time():
+            await db.commit()
+    except IntegrityError:
+        # Outra requisição gravou a mesma avaliação antes desta.
+        await db.rollback()
+        existing = (
+            await get_reviews_by_content_hash(db, [review.content_hash])
+        ).get(review.content_hash)
+        if existing is None and idempotency_key:
+            existing = await get_review_by_idempotency_key(
+                db, idempotency_key
+            )
+        if existing is None:
+            raise
+        raise DuplicateReviewError(existing)
     return review
 
 
-def get_reviews(
-    db: Session,
+async def get_reviews_by_content_hash(
+    db: AsyncSession, hashes: Sequence[str]
+) -> Dict[str, Review]:
+    """Busca as avaliações já gravadas com os hashes de conteúdo
+    informados.
+
+    Args:
+        db (AsyncSession): Sessão ativa do banco de dados.
+        hashes (Sequence[str]): Hashes calculados por `content_hash`.
+
+    Returns:
+        Dict[str, Review]: Avaliações encontradas, pelo hash.
+    """
+    if not hashes:
+        return {}
+    result = await db.execute(
+        select(Review).where(Review.content_hash.in_(set(hashes)))
+    )
+    return {review.content_hash: review for review in result.scalars()}
+
+
+async def get_review_by_idempotency_key(
+    db: AsyncSession, idempotency_key: str
+) -> Optional[Review]:
+    """Busca a avaliação criada pela requisição com a Idempotency-Key
+    informada.
+
+    Args:
+        db (AsyncSession): Sessão ativa do banco de dados.
+        idempotency_key (str): Valor do cabeçalho Idempotency-Key.
+
+    Returns:
+        Optional[Review]: Avaliação encontrada ou None.
+    """
+    result = await db.execute(
+        select(Review).where(Review.idempotency_key == idempotency_key)
+    )
+    return result.scalar_one_or_none()
+
+
+async def create_reviews(
+    db: AsyncSession,
+    items: Sequence[Tuple[ReviewBase, str]],
+) -> List[Review]:
+    """Cria várias avaliações já classificadas em uma única transação.
+
+    Args:
+        db (AsyncSession): Sessão ativa do banco de dados.
+        items (Sequence[Tuple[ReviewBase, str]]): Pares com os dados da
+            avaliação e o sentimento já classificado.
+
+    Returns:
+        List[Review]: Avaliações criadas, na mesma ordem da entrada.
+    """
+    return await create_reviews_bulk(db, items, chunk_size=len(items) or 1)
+
+
+async def create_reviews_bulk(
+    db: AsyncSession,
+    items: Sequence[Tuple[ReviewBase, str]],
+    chunk_size: int = REVIEW_INSERT_CHUNK_SIZE,
+) -> List[Review]:
+    """Insere avaliações já classificadas em blocos, com uma transação por
+    bloco.
+
+    Cada bloco é gravado por INSERTs de várias linhas com RETURNING, que
+    devolvem o ID e as datas geradas pelo banco na mesma ida, sem o
+    unit of work do ORM nem um `refresh` por avaliação. O resumo diário
+    por sentimento é atualizado na transação do bloco. Os itens não
+    devem repetir o conteúdo entre si nem o de avaliações existentes
+    (ver `get_reviews_by_content_hash`): o índice único de
+    `content_hash` faz o bloco falhar.
+
+    Args:
+        db (AsyncSession): Sessão ativa do banco de dados.
+        items (Sequence[Tuple[ReviewBase, str]]): Pares com os dados da
+            avaliação e o sentimento já classificado.
+        chunk_size (int): Avaliações por bloco e por transação.
+
+    Returns:
+        List[Review]: Avaliações criadas, na mesma ordem da entrada. Não
+        ficam associadas à sessão.
+
+    Raises:
+        BulkInsertError: Se um bloco falhar. O bloco é desfeito e os
+            anteriores permanecem confirmados, disponíveis em `created`.
+    """
+    statement = insert(Review).returning(
+        Review.id,
+        Review.created_at,
+        Review.updated_at,
+        sort_by_parameter_order=True,
+    )
+    created: List[Review] = []
+    for offset in range(0, len(items), chunk_size):
+        rows = [
+            {
+                "customer_name": review_data.customer_name,
+                "review_text": review_data.review_text,
+                "evaluation_date": review_data.evaluation_date,
+                "sentiment": SentimentsEnum(sentiment),
+                "content_hash": content_hash(review_data),
+            }
+            for review_data, sentiment in items[offset:offset + chunk_size]
+        ]
+        try:
+            result = await db.execute(statement, rows)
+            generated = result.all()
+            await increment_daily_sentiment(
+                db,
+                Counter(
+                    (row["evaluation_date"], row["sentiment"]) for row in rows
+                ),
+            )
+            with DB_QUERY_SECONDS.labels("writer", "COMMIT").time():
+                await db.commit()
+        except SQLAlchemyError as e:
+            await db.rollback()
+            raise BulkInsertError(created, e) from e
+
+        created.extend(
+            Review(
+                id=review_id,
+                created_at=created_at,
+                updated_at=updated_at,
+                **row,
+            )
+            for row, (review_id, created_at, updated_at) in zip(
+                rows, generated
+            )
+        )
+    return created
+
+
+def encode_cursor(evaluation_date: date, review_id: int) -> str:
+    """Codifica a posição de uma avaliação na ordenação da listagem em um
+    cursor opaco.
+
+    Args:
+        evaluation_date (date): Data da última avaliação da página.
+        review_id (int): ID da última avaliação da página.
+
+    Returns:
+        str: Cursor em base64 seguro para URLs.
+    """
+    raw = f"{evaluation_date.isoformat()}:{review_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[date, int]:
+    """Decodifica um cursor gerado por `encode_cursor`.
+
+    Raises:
+        ValueError: Se o cursor for inválido.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        evaluation_date, review_id = raw.decode().split(":")
+        return date.fromisoformat(evaluation_date), int(review_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise ValueError("Cursor de paginação inválido.") from e
+
+
+def _review_filters(
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
-) -> List[Review]:
-    """Retorna todas as avaliações, com filtro opcional por intervalo de datas.
+    sentiment: Optional[SentimentsEnum] = None,
+    customer_name: Optional[str] = None,
+) -> List[Any]:
+    """Monta as condições dos filtros da listagem. Cada filtro é uma
+    comparação simples sobre uma coluna indexada."""
+    conditions = []
+    if start_date:
+        conditions.append(Review.evaluation_date >= start_date)
+    if end_date:
+        conditions.append(Review.evaluation_date <= end_date)
+    if sentiment:
+        conditions.append(Review.sentiment == sentiment)
+    if customer_name:
+        conditions.append(Review.customer_name == customer_name)
+    return conditions
+
+
+async def get_reviews(
+    db: AsyncSession,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    sentiment: Optional[SentimentsEnum] = None,
+    customer_name: Optional[str] = None,
+    limit: Optional[int] = None,
+    after: Optional[Tuple[date, int]] = None,
+) -> List[Row]:
+    """Retorna avaliações da mais recente para a mais antiga, com filtros
+    opcionais e paginação por cursor (keyset).
+
+    A ordenação é por `(evaluation_date, id)` decrescente, e a página
+    seguinte começa logo após a última avaliação da anterior, sem OFFSET:
+    o custo de cada página não cresce com a sua posição na listagem.
+    Seleciona apenas as colunas de `REVIEW_COLUMNS`.
 
     Args:
-        db (Session): Sessão ativa do banco de dados.
+        db (AsyncSession): Sessão ativa do banco de dados.
         start_date (Optional[date]): Data inicial do filtro.
         end_date (Optional[date]): Data final do filtro.
+        sentiment (Optional[SentimentsEnum]): Sentimento das avaliações.
+        customer_name (Optional[str]): Nome exato do cliente.
+        limit (Optional[int]): Quantidade máxima de avaliações. Sem limite
+            se omitido.
+        after (Optional[Tuple[date, int]]): Data e ID da última avaliação
+            da página anterior, como retornados por `decode_cursor`.
 
     Returns:
-        List[Review]: Lista de avaliações encontradas.
+        List[Row]: Linhas com as colunas de `REVIEW_COLUMNS`.
     """
-    query = db.query(Review)
-    if start_date:
-        query = query.filter(Review.evaluation_date >= start_date)
-    if end_date:
-        query = query.filter(Review.evaluation_date <= end_date)
-    return query.order_by(Review.evaluation_date.desc()).all()
+    query = select(*REVIEW_COLUMNS).where(
+        *_review_filters(start_date, end_date, sentiment, customer_name)
+    )
+    if after:
+        query = query.where(
+            tuple_(Review.evaluation_date, Review.id) < tuple_(*after)
+        )
+    query = query.order_by(
+        Review.evaluation_date.desc(), Review.id.desc()
+    ).limit(limit)
+    result = await db.execute(query)
+    return list(result.all())
+
+
+def _search_query(dialect: str, terms: List[str]):
+    """Monta a busca de texto completo do dialeto, com todos os termos
+    obrigatórios e ordenada pela relevância."""
+    if dialect == "postgresql":
+        vector = literal_column("reviews.search_vector")
+        ts_query = postgresql.plainto_tsquery(
+            SEARCH_TS_CONFIG, " ".join(terms)
+        )
+        return (
+            select(*REVIEW_COLUMNS)
+            .where(vector.op("@@")(ts_query))
+            .order_by(
+                func.ts_rank_cd(vector, ts_query).desc(), Review.id.desc()
+            )
+        )
+    if dialect == "sqlite":
+        # Cada termo entre aspas, para que a sintaxe do FTS5 (AND, NEAR,
+        # "*"...) digitada pelo usuário seja tratada como texto.
+        match = " ".join(
+            '"{}"'.format(term.replace('"', '""')) for term in terms
+        )
+        return (
+            select(*REVIEW_COLUMNS)
+            .join(REVIEWS_FTS, REVIEWS_FTS.c.rowid == Review.id)
+            .where(literal_column("reviews_fts").op("MATCH")(match))
+            .order_by(REVIEWS_FTS.c.rank, Review.id.desc())
+        )
+    raise NotImplementedError(
+        f"Busca de texto completo não suportada no banco '{dialect}'."
+    )
 
 
-def get_review_by_id(db: Session, review_id: int) -> Optional[Review]:
+async def search_reviews(
+    db: AsyncSession,
+    query: str,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    sentiment: Optional[SentimentsEnum] = None,
+    limit: Optional[int] = None,
+    offset: int = 0,
+) -> List[Row]:
+    """Busca avaliações que mencionam todos os termos do texto informado,
+    da mais relevante para a menos relevante.
+
+    Usa o índice de texto completo de `review_text`: a coluna `tsvector`
+    com índice GIN no PostgreSQL (com radicais do português) ou a tabela
+    FTS5 no SQLite (sem acentos nem diferença de maiúsculas).
+
+    Args:
+        db (AsyncSession): Sessão ativa do banco de dados.
+        query (str): Termos buscados.
+        start_date (Optional[date]): Data inicial do filtro.
+        end_date (Optional[date]): Data final do filtro.
+        sentiment (Optional[SentimentsEnum]): Sentimento das avaliações.
+        limit (Optional[int]): Quantidade máxima de avaliações. Sem limite
+            se omitido.
+        offset (int): Avaliações a pular, para as páginas seguintes.
+
+    Returns:
+        List[Row]: Linhas com as colunas de `REVIEW_COLUMNS`.
+
+    Raises:
+        NotImplementedError: Se o banco não tiver suporte à busca.
+    """
+    terms = query.split()
+    if not terms:
+        return []
+
+    statement = (
+        _search_query(db.get_bind().dialect.name, terms)
+        .where(*_review_filters(start_date, end_date, sentiment))
+        .limit(limit)
+        .offset(offset)
+    )
+    result = await db.execute(statement)
+    return list(result.all())
+
+
+async def stream_reviews(
+    db: AsyncSession,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    sentiment: Optional[SentimentsEnum] = None,
+    customer_name: Optional[str] = None,
+    chunk_size: int = 1000,
+) -> AsyncIterator[Sequence[Row]]:
+    """Lê as avaliações filtradas em blocos, da mais antiga para a mais
+    recente, sem carregar o resultado inteiro em memória.
+
+    Seleciona apenas as colunas de `REVIEW_COLUMNS`, sem instanciar objetos
+    `Review`, e usa um cursor no servidor (`yield_per`) onde o driver
+    suporta, de modo que a memória usada depende de `chunk_size` e não do
+    tamanho do intervalo.
+
+    Args:
+        db (AsyncSession): Sessão ativa do banco de dados, mantida aberta
+            até o fim da iteração.
+        start_date (Optional[date]): Data inicial do filtro.
+        end_date (Optional[date]): Data final do filtro.
+        sentiment (Optional[SentimentsEnum]): Sentimento das avaliações.
+        customer_name (Optional[str]): Nome exato do cliente.
+        chunk_size (int): Linhas buscadas do banco a cada bloco.
+
+    Yields:
+        Sequence[Row]: Blocos de até `chunk_size` linhas.
+    """
+    query = (
+        select(*REVIEW_COLUMNS)
+        .where(
+            *_review_filters(start_date, end_date, sentiment, customer_name)
+        )
+        .order_by(Review.evaluation_date, Review.id)
+        .execution_options(yield_per=chunk_size)
+    )
+    result = await db.stream(query)
+    async for rows in result.partitions():
+        yield rows
+
+
+class Explain(Executable, ClauseElement):
+    """`EXPLAIN (FORMAT JSON)` de uma consulta do PostgreSQL.
+
+    Os valores dos filtros seguem como parâmetros da consulta, e não
+    como texto no SQL.
+    """
+
+    inherit_cache = False
+
+    def __init__(self, statement: Executable):
+        self.statement = statement
+
+
+@compiles(Explain)
+def _compile_explain(element: Explain, compiler, **kw) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(
+        element.statement, **kw
+    )
+
+
+async def count_reviews(
+    db: AsyncSession,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    sentiment: Optional[SentimentsEnum] = None,
+    customer_name: Optional[str] = None,
+) -> int:
+    """Conta as avaliações que atendem aos filtros da listagem.
+
+    No PostgreSQL, retorna a estimativa do planejador (`EXPLAIN`), obtida
+    sem percorrer a tabela; nos demais bancos, executa um `COUNT(*)`.
+
+    Args:
+        db (AsyncSession): Sessão ativa do banco de dados.
+        start_date (Optional[date]): Data inicial do filtro.
+        end_date (Optional[date]): Data final do filtro.
+        sentiment (Optional[SentimentsEnum]): Sentimento das avaliações.
+        customer_name (Optional[str]): Nome exato do cliente.
+
+    Returns:
+        int: Total, exato ou estimado, de avaliações.
+    """
+    conditions = _review_filters(
+        start_date, end_date, sentiment, customer_name
+    )
+    if db.get_bind().dialect.name != "postgresql":
+        query = select(func.count()).select_from(Review).where(*conditions)
+        return (await db.execute(query)).scalar_one()
+
+    query = select(Review.id).where(*conditions)
+    plan = (await db.execute(Explain(query))).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def get_review_by_id(
+    db: AsyncSession, review_id: int
+) -> Optional[Review]:
     """Busca uma avaliação específica pelo ID.
 
     Args:
-        db (Session): Sessão ativa do banco de dados.
+        db (AsyncSession): Sessão ativa do banco de dados.
         review_id (int): ID da avaliação desejada.
 
     Returns:
         Optional[Review]: Objeto da avaliação se encontrada, senão None.
     """
-    return db.query(Review).filter(Review.id == review_id).first()
+    return await db.get(Review, review_id)
+
+
+async def increment_daily_sentiment(
+    db: AsyncSession,
+    counts: Counter,
+):
+    """Soma as quantidades informadas ao resumo diário por sentimento, sem
+    confirmar a transação.
+
+    Usa um único INSERT ... ON CONFLICT DO UPDATE com todas as chaves,
+    em ordem, para que transações concorrentes travem as linhas do resumo
+    sempre na mesma sequência.
+
+    Args:
+        db (AsyncSession): Sessão com a transação das inserções.
+        counts (Counter): Quantidade de avaliações por par
+            (evaluation_date, sentiment).
+    """
+    dialect = db.get_bind().dialect.name
+    upsert = UPSERT_INSERTS.get(dialect)
+    if upsert is None:
+        raise NotImplementedError(
+            f"Resumo diário não suportado no banco '{dialect}'."
+        )
+
+    statement = upsert(ReviewDailySentiment).values(
+        [
+            {
+                "evaluation_date": evaluation_date,
+                "sentiment": sentiment,
+                "review_count": count,
+            }
+            for (evaluation_date, sentiment), count in sorted(
+                counts.items(), key=lambda item: (item[0][0], item[0][1].value)
+            )
+        ]
+    )
+    await db.execute(
+        statement.on_conflict_do_update(
+            index_elements=[
+                ReviewDailySentiment.evaluation_date,
+                ReviewDailySentiment.sentiment,
+            ],
+            set_={
+                "review_count": (
+                    ReviewDailySentiment.review_count
+                    + statement.excluded.review_count
+                ),
+            },
+        )
+    )
+
+
+async def rebuild_daily_sentiment(
+    db: AsyncSession,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+) -> int:
+    """Recalcula o resumo diário a partir da tabela de avaliações, em uma
+    única transação.
 
+    Usado para preencher o resumo de avaliações gravadas antes dele ou
+    corrigir divergências.
 
-def get_review_report(db: Session, start_date: date, end_date: date) -> Dict[str, int]:  # noqa:E501
+    Args:
+        db (AsyncSession): Sessão ativa do banco de dados.
+        start_date (Optional[date]): Primeira data recalculada. Todas se
+            omitida.
+        end_date (Optional[date]): Última data recalculada. Todas se
+            omitida.
+
+    Returns:
+        int: Linhas gravadas no resumo.
+    """
+    review_filters = _review_filters(start_date, end_date)
+    rollup_filters = []
+    if start_date:
+        rollup_filters.append(
+            ReviewDailySentiment.evaluation_date >= start_date
+        )
+    if end_date:
+        rollup_filters.append(ReviewDailySentiment.evaluation_date <= end_date)
+
+    await db.execute(delete(ReviewDailySentiment).where(*rollup_filters))
+    counts = (
+        select(
+            Review.evaluation_date,
+            Review.sentiment,
+            func.count(Review.id),
+        )
+        .where(*review_filters)
+        .group_by(Review.evaluation_date, Review.sentiment)
+    )
+    result = await db.execute(
+        insert(ReviewDailySentiment).from_select(
+            ["evaluation_date", "sentiment", "review_count"], counts
+        )
+    )
+    with DB_QUERY_SECONDS.labels("writer", "COMMIT").time():
+        await db.commit()
+    return result.rowcount
+
+
+async def get_daily_sentiment_counts(
+    db: AsyncSession,
+    start_date: date,
+    end_date: date,
+) -> Dict[date, Dict[str, int]]:
+    """Lê o resumo diário por sentimento de um intervalo de datas.
+
+    Args:
+        db (AsyncSession): Sessão ativa do banco de dados.
+        start_date (date): Data inicial do período.
+        end_date (date): Data final do período.
+
+    Returns:
+        Dict[date, Dict[str, int]]: Contagem por sentimento de cada data
+        com avaliações. Datas sem avaliações não aparecem.
+    """
+    query = select(
+        ReviewDailySentiment.evaluation_date,
+        ReviewDailySentiment.sentiment,
+        ReviewDailySentiment.review_count,
+    ).where(
+        and_(
+            ReviewDailySentiment.evaluation_date >= start_date,
+            ReviewDailySentiment.evaluation_date <= end_date,
+        )
+    )
+
+    counts: Dict[date, Dict[str, int]] = {}
+    for evaluation_date, sentiment, count in await db.execute(query):
+        day = counts.setdefault(
+            evaluation_date, {value.value: 0 for value in SentimentsEnum}
+        )
+        day[sentiment.value] = count
+    return counts
+
+
+async def get_review_report(db: AsyncSession, start_date: date, end_date: date) -> Dict[str, int]:  # noqa:E501
     """Gera um relatório com contagem de sentimentos em um intervalo de datas.
 
+    Soma o resumo diário por sentimento, de modo que o custo cresce com o
+    número de dias do período e não com o de avaliações.
+
     Args:
-        db (Session): Sessão ativa do banco de dados.
+        db (AsyncSession): Sessão ativa do banco de dados.
         start_date (date): Data inicial do período.
         end_date (date): Data final do período.
 
@@ -83,17 +720,20 @@ def get_review_report(db: Session, start_date: date, end_date: date) -> Dict[str
         Dict[str, int]: Dict com chaves "positive", "neutral" e "negative".
     """
     query = (
-        db.query(Review.sentiment, func.count(Review.id))
-        .filter(
+        select(
+            ReviewDailySentiment.sentiment,
+            func.sum(ReviewDailySentiment.review_count),
+        )
+        .where(
             and_(
-                Review.evaluation_date >= start_date,
-                Review.evaluation_date <= end_date,
+                ReviewDailySentiment.evaluation_date >= start_date,
+                ReviewDailySentiment.evaluation_date <= end_date,
             )
         )
-        .group_by(Review.sentiment)
+        .group_by(ReviewDailySentiment.sentiment)
     )
 
     results = {sentiment.value: 0 for sentiment in SentimentsEnum}
-    for sentiment, count in query:
-        results[sentiment.value] = count
+    for sentiment, count in await db.execute(query):
+        results[sentiment.value] = int(count)
     return results
@@ -1,29 +1,201 @@
-"""Configuração do banco de dados e sessão para a aplicação."""
+"""Configuração do banco de dados e sessão para a aplicação.
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import declarative_base, sessionmaker
+Há dois engines: o de escrita, em DATABASE_URL, e o de leitura, em
+READ_DATABASE_URL (uma réplica, por exemplo), usado pelas rotas GET. Sem
+READ_DATABASE_URL, as leituras vão ao mesmo banco, mas por um pool
+próprio, para que consultas pesadas não ocupem as conexões da gravação.
+"""
 
-from app.config import DATABASE_URL
+import time
+from typing import Any, Dict
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.config import (
+    DATABASE_URL,
+    DB_MAX_OVERFLOW,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE_SECONDS,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT_SECONDS,
+    DB_READ_STATEMENT_TIMEOUT_MS,
+    DB_STATEMENT_TIMEOUT_MS,
+    READ_DATABASE_URL,
+)
+from app.metrics import DB_POOL_WAIT_SECONDS, instrument_engine
+
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def to_async_url(url: str) -> str:
+    """Converte a URL do banco para o driver assíncrono correspondente.
+
+    Aceita URLs síncronas como `postgresql://` ou `postgresql+psycopg2://`
+    e as troca por `postgresql+asyncpg://` (ou `sqlite+aiosqlite://`).
+
+    Args:
+        url (str): URL de conexão configurada.
+
+    Returns:
+        str: URL com o driver assíncrono.
+    """
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        return url
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
 
-engine = create_engine(DATABASE_URL)
 
-SessionLocal = sessionmaker(
-    autocommit=False,
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """Pool de conexões que registra o tempo de espera de cada checkout.
+
+    A métrica é rotulada com o `pool_logging_name` do engine ("writer" ou
+    "reader"), que o SQLAlchemy preserva quando o pool é recriado.
+    """
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_WAIT_SECONDS.labels(
+                self._orig_logging_name or "default"
+            ).observe(time.perf_counter() - start)
+
+
+def is_memory_sqlite(url: str) -> bool:
+    """Indica se a URL é de um SQLite em memória, que existe apenas na
+    conexão que o criou."""
+    parsed = make_url(url)
+    return parsed.get_backend_name() == "sqlite" and parsed.database in (
+        None,
+        "",
+        ":memory:",
+    )
+
+
+def engine_options(
+    url: str,
+    name: str = "writer",
+    statement_timeout_ms: int = 0,
+) -> Dict[str, Any]:
+    """Retorna as opções do engine para a URL informada.
+
+    O SQLite em memória mantém seu pool padrão, de conexão única; os demais
+    bancos usam o `InstrumentedAsyncPool` com as configurações de pool de
+    `app/config.py`. No PostgreSQL, `statement_timeout_ms` é aplicado a
+    cada conexão como `statement_timeout`.
+
+    Args:
+        url (str): URL de conexão configurada.
+        name (str): Nome do engine nas métricas do pool.
+        statement_timeout_ms (int): Tempo máximo de cada comando, em
+            milissegundos (0 = sem limite).
+
+    Returns:
+        Dict[str, Any]: Argumentos para `create_async_engine`.
+    """
+    if is_memory_sqlite(url):
+        return {}
+
+    options: Dict[str, Any] = {
+        "poolclass": InstrumentedAsyncPool,
+        "pool_logging_name": name,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT_SECONDS,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+        "pool_recycle": DB_POOL_RECYCLE_SECONDS,
+    }
+    if make_url(url).get_backend_name() == "postgresql" and (
+        statement_timeout_ms > 0
+    ):
+        options["connect_args"] = {
+            "server_settings": {"statement_timeout": str(statement_timeout_ms)}  # noqa: E501
+        }
+    return options
+
+
+def create_engine_for(url: str, name: str, statement_timeout_ms: int = 0):
+    """Cria e instrumenta o engine assíncrono de uma URL.
+
+    Args:
+        url (str): URL de conexão configurada.
+        name (str): Nome do engine nas métricas ("writer" ou "reader").
+        statement_timeout_ms (int): Tempo máximo de cada comando no
+            PostgreSQL, em milissegundos (0 = sem limite).
+
+    Returns:
+        AsyncEngine: Engine criado.
+    """
+    engine = create_async_engine(
+        to_async_url(url), **engine_options(url, name, statement_timeout_ms)
+    )
+    instrument_engine(engine, name)
+    return engine
+
+
+engine = create_engine_for(DATABASE_URL, "writer", DB_STATEMENT_TIMEOUT_MS)
+# Um segundo engine sobre o mesmo SQLite em memória veria outro banco.
+read_engine = (
+    engine
+    if READ_DATABASE_URL == DATABASE_URL and is_memory_sqlite(DATABASE_URL)
+    else create_engine_for(
+        READ_DATABASE_URL, "reader", DB_READ_STATEMENT_TIMEOUT_MS
+    )
+)
+
+AsyncSessionLocal = async_sessionmaker(
+    class_=AsyncSession,
     autoflush=False,
+    expire_on_commit=False,
     bind=engine,
 )
+ReadSessionLocal = async_sessionmaker(
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+    bind=read_engine,
+)
 
 Base = declarative_base()
 
 
-def get_db():
-    """Provedor de sessão do banco de dados para injeção no FastAPI.
+async def get_write_db():
+    """Provedor de sessão do banco de escrita para injeção no FastAPI.
+
+    Yields:
+        AsyncSession: Sessão assíncrona do banco de dados SQLAlchemy.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_read_db():
+    """Provedor de sessão do banco de leitura para injeção no FastAPI.
+
+    As leituras podem não refletir imediatamente as gravações mais
+    recentes quando READ_DATABASE_URL aponta para uma réplica.
 
     Yields:
-        Session: Sessão do banco de dados SQLAlchemy.
+        AsyncSession: Sessão assíncrona do banco de dados SQLAlchemy.
     """
-    db = SessionLocal()
-    try:
+    async with ReadSessionLocal() as db:
         yield db
-    finally:
-        db.close()
+
+
+async def dispose_engines():
+    """Fecha as conexões dos pools de escrita e de leitura."""
+    await engine.dispose()
+    if read_engine is not engine:
+        await read_engine.dispose()
@@ -1,9 +1,70 @@
 """Aplicação FastAPI para API de avaliações e análise de sentimentos."""
 
+import logging
+import time
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
+from starlette.concurrency import run_in_threadpool
 
+from app.config import (
+    CLASSIFIER_PRELOAD,
+    GZIP_COMPRESS_LEVEL,
+    GZIP_MIN_SIZE,
+    TORCH_NUM_THREADS,
+)
+from app.database import dispose_engines
+from app.metrics import MetricsMiddleware
+from app.routers.health import health_router
+from app.routers.metrics import metrics_router
 from app.routers.review import review_router
+from app.routers.rules import rules_router
+from app.services.backends import configure_torch_threads
+from app.services.classifier import (
+    shutdown_classifier,
+    start_rules_watcher,
+    warmup_classifier,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Carrega e aquece o classificador antes de aceitar requisições,
+    inicia o monitoramento do arquivo de regras e encerra o agendador, o
+    executor de classificação, o monitoramento e os pools do banco ao
+    final.
+
+    Com o gunicorn (`gunicorn.conf.py`), o modelo já vem carregado do
+    processo mestre e aqui cada worker apenas fixa suas threads do PyTorch
+    e executa o aquecimento.
+    """
+    configure_torch_threads(TORCH_NUM_THREADS)
+    if CLASSIFIER_PRELOAD:
+        start = time.perf_counter()
+        await run_in_threadpool(warmup_classifier)
+        logger.info(
+            "Aplicação pronta em %.2fs.", time.perf_counter() - start
+        )
+    start_rules_watcher()
+    yield
+    await run_in_threadpool(shutdown_classifier)
+    await dispose_engines()
+
 
-app = FastAPI(title="Sentiment Reviews API")
+app = FastAPI(title="Sentiment Reviews API", lifespan=lifespan)
+# Adicionado antes, o gzip fica dentro das métricas, que incluem o tempo de
+# compressão.
+app.add_middleware(
+    GZipMiddleware,
+    minimum_size=GZIP_MIN_SIZE,
+    compresslevel=GZIP_COMPRESS_LEVEL,
+)
+app.add_middleware(MetricsMiddleware)
 
+app.include_router(health_router)
+app.include_router(metrics_router)
 app.include_router(review_router)
+app.include_router(rules_router)
@@ -0,0 +1,237 @@
+"""Métricas da aplicação no formato do Prometheus.
+
+Os histogramas e contadores são atualizados nos pontos quentes (rotas,
+etapas do classificador, inferência e banco) e expostos em `/metrics`.
+Os contadores que o classificador, o cache, o agendador, o backend e o
+cache do relatório já mantêm são lidos apenas no momento da coleta, sem
+custo no caminho da requisição.
+
+Com vários workers do gunicorn, defina `PROMETHEUS_MULTIPROC_DIR` para
+que os histogramas de todos os processos sejam agregados; os valores lidos
+do classificador continuam sendo os do worker que atende a coleta.
+"""
+
+import os
+import time
+from typing import Dict, Iterator
+
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.multiprocess import MultiProcessCollector
+from prometheus_client.registry import Collector
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Latência das requisições HTTP por rota.",
+    ["method", "route", "status"],
+)
+CLASSIFIER_STAGE_SECONDS = Histogram(
+    "classifier_stage_duration_seconds",
+    "Duração de cada etapa da classificação de um lote de textos.",
+    ["stage"],
+)
+MODEL_BATCH_SIZE = Histogram(
+    "classifier_model_batch_size",
+    "Quantidade de textos por chamada ao modelo.",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024),
+)
+CLASSIFICATIONS = Counter(
+    "classifications",
+    "Classificações realizadas, por sentimento e caminho de decisão.",
+    ["sentiment", "path"],
+)
+DB_QUERY_SECONDS = Histogram(
+    "db_query_duration_seconds",
+    "Duração das operações no banco, por engine e tipo de comando.",
+    ["engine", "operation"],
+)
+DB_POOL_WAIT_SECONDS = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Espera por uma conexão do pool, incluindo a abertura de conexões.",
+    ["engine"],
+)
+
+# Engines instrumentados, por nome, cujos pools são expostos pelo
+# `PoolCollector`.
+ENGINES: Dict[str, AsyncEngine] = {}
+
+# Seções de `get_classifier_status` expostas como gauges e o prefixo de
+# cada uma.
+STATUS_SECTIONS = {
+    "classifier": "classifier",
+    "backend": "classifier_backend",
+    "cache": "classification_cache",
+    "rules": "classifier_rules",
+    "scheduler": "inference_scheduler",
+}
+
+
+class ClassifierCollector(Collector):
+    """Expõe os contadores do classificador, do cache, do agendador e do
+    backend de inferência como gauges, lidos a cada coleta."""
+
+    def describe(self) -> Iterator[GaugeMetricFamily]:
+        # Sem `describe`, o registro chamaria `collect` ao registrar o
+        # coletor, importando o classificador durante a importação deste
+        # módulo.
+        return iter(())
+
+    def collect(self) -> Iterator[GaugeMetricFamily]:
+        # Importado aqui: o classificador também usa este módulo.
+        from app.services.classifier import get_classifier_status
+
+        status = get_classifier_status()
+        yield GaugeMetricFamily(
+            "classifier_ready",
+            "Classificador carregado e aquecido.",
+            value=float(status["ready"]),
+        )
+        for section, prefix in STATUS_SECTIONS.items():
+            for key, value in (status.get(section) or {}).items():
+                if isinstance(value, (int, float)):
+                    yield GaugeMetricFamily(
+                        f"{prefix}_{key}",
+                        f"Valor de '{key}' em '{section}'.",
+                        value=float(value),
+                    )
+
+
+class ReportCacheCollector(Collector):
+    """Expõe os contadores do cache do relatório como gauges, lidos a cada
+    coleta."""
+
+    def describe(self) -> Iterator[GaugeMetricFamily]:
+        return iter(())
+
+    def collect(self) -> Iterator[GaugeMetricFamily]:
+        from app.services.report_cache import report_cache
+
+        for key, value in report_cache.get_stats().items():
+            yield GaugeMetricFamily(
+                f"report_cache_{key}",
+                f"Valor de '{key}' no cache do relatório.",
+                value=float(value),
+            )
+
+
+class PoolCollector(Collector):
+    """Expõe a ocupação do pool de cada engine instrumentado."""
+
+    # Gauge e método do pool (`QueuePool`) que fornece o valor.
+    GAUGES = {
+        "db_pool_size": ("size", "Conexões mantidas pelo pool."),
+        "db_pool_checked_out": (
+            "checkedout", "Conexões do pool em uso."
+        ),
+        "db_pool_overflow": (
+            "overflow", "Conexões abertas além do tamanho do pool."
+        ),
+    }
+
+    def describe(self) -> Iterator[GaugeMetricFamily]:
+        return iter(())
+
+    def collect(self) -> Iterator[GaugeMetricFamily]:
+        for name, (method, documentation) in self.GAUGES.items():
+            gauge = GaugeMetricFamily(name, documentation, labels=["engine"])
+            for engine_name, engine in ENGINES.items():
+                read = getattr(engine.pool, method, None)
+                if read is not None:
+                    gauge.add_metric([engine_name], float(read()))
+            yield gauge
+
+
+REGISTRY.register(ClassifierCollector())
+REGISTRY.register(ReportCacheCollector())
+REGISTRY.register(PoolCollector())
+
+
+def render_metrics() -> bytes:
+    """Gera o texto de exposição de todas as métricas registradas."""
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return generate_latest(REGISTRY)
+
+    registry = CollectorRegistry()
+    MultiProcessCollector(registry)
+    registry.register(ClassifierCollector())
+    registry.register(ReportCacheCollector())
+    registry.register(PoolCollector())
+    return generate_latest(registry)
+
+
+class MetricsMiddleware:
+    """Middleware ASGI que mede a latência de cada requisição HTTP.
+
+    A rota é identificada pelo caminho declarado (ex: "/reviews/{review_id}")
+    e não pela URL, para manter a cardinalidade baixa.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = getattr(scope.get("route"), "path", "unmatched")
+            REQUEST_LATENCY.labels(
+                scope["method"], route, str(status_code)
+            ).observe(time.perf_counter() - start)
+
+
+def instrument_engine(engine: AsyncEngine, name: str):
+    """Registra a duração de cada comando executado pelo engine e expõe a
+    ocupação do seu pool.
+
+    Args:
+        engine (AsyncEngine): Engine a ser instrumentado.
+        name (str): Nome do engine nas métricas ("writer" ou "reader").
+    """
+    ENGINES[name] = engine
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _start(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _stop(conn, cursor, statement, parameters, context, executemany):
+        start = conn.info["query_start"].pop()
+        DB_QUERY_SECONDS.labels(
+            name, statement_operation(statement)
+        ).observe(time.perf_counter() - start)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _discard(context):
+        starts = context.connection and context.connection.info.get(
+            "query_start"
+        )
+        if starts:
+            starts.pop()
+
+
+def statement_operation(statement: str) -> str:
+    """Retorna o comando SQL (SELECT, INSERT...) de uma instrução."""
+    words = statement.split(None, 1)
+    return words[0].upper() if words else "UNKNOWN"
@@ -1,6 +1,17 @@
-"""Modelo ORM para a tabela de avaliações (reviews)."""
+"""Modelos ORM das avaliações (reviews) e do seu resumo diário por
+sentimento, e o índice de texto completo das avaliações."""
 
-from sqlalchemy import Column, Date, DateTime, Enum, Integer, String
+from sqlalchemy import (
+    DDL,
+    Column,
+    Date,
+    DateTime,
+    Enum,
+    Index,
+    Integer,
+    String,
+    event,
+)
 from sqlalchemy.sql import func
 
 from app.database import Base
@@ -11,32 +22,33 @@ class Review(Base):
     """Representa uma avaliação de cliente no banco de dados."""
 
     __tablename__ = "reviews"
+    # Lê `created_at` e `updated_at` no próprio INSERT (RETURNING), sem o
+    # SELECT extra de um `refresh`.
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(
         Integer,
         primary_key=True,
-        index=True,
     )
     customer_name = Column(
         String(255),
         nullable=False,
-        index=True,
     )
+    # Sem índice B-tree: textos longos incham o índice, encarecem cada
+    # INSERT e podem passar do limite de tamanho de linha do PostgreSQL.
+    # As buscas usam o índice de texto completo de `SEARCH_DDL`.
     review_text = Column(
         String(5000),
         nullable=False,
-        index=True,
     )
     evaluation_date = Column(
         Date,
         nullable=False,
-        index=True,
     )
     created_at = Column(
         DateTime(timezone=True),
         nullable=False,
         server_default=func.now(),
-        index=True,
     )
     updated_at = Column(
         DateTime(timezone=True),
@@ -51,7 +63,18 @@ class Review(Base):
             create_type=True,
         ),
         nullable=False,
-        index=True,
+    )
+    # Hash de (cliente, texto normalizado, data), de `review_content_hash`:
+    # reenvios da mesma avaliação devolvem a já gravada. Nulo apenas nas
+    # duplicatas gravadas antes da migração 0005.
+    content_hash = Column(
+        String(64),
+        nullable=True,
+    )
+    # Cabeçalho Idempotency-Key da requisição que criou a avaliação.
+    idempotency_key = Column(
+        String(255),
+        nullable=True,
     )
 
     def __repr__(self) -> str:
@@ -61,3 +84,119 @@ class Review(Base):
             f"sentiment='{self.sentiment.value}', "
             f"date='{self.evaluation_date}')>"
         )
+
+
+# Índices de reviews (migração 0004). As consultas filtram por intervalo
+# de datas e ordenam por (evaluation_date, id) decrescente; nenhuma usa
+# `created_at`, e `sentiment` só aparece junto com as datas.
+Index(
+    "ix_reviews_evaluation_date_sentiment",
+    Review.evaluation_date,
+    Review.sentiment,
+)
+Index(
+    "ix_reviews_evaluation_date_id",
+    Review.evaluation_date.desc(),
+    Review.id.desc(),
+)
+Index(
+    "ix_reviews_customer_name_evaluation_date_id",
+    Review.customer_name,
+    Review.evaluation_date.desc(),
+    Review.id.desc(),
+)
+# Únicos (migração 0005): garantem uma só linha por conteúdo e por
+# Idempotency-Key, mesmo entre workers. Os nulos não conflitam.
+Index("ix_reviews_content_hash", Review.content_hash, unique=True)
+Index("ix_reviews_idempotency_key", Review.idempotency_key, unique=True)
+
+
+class ReviewDailySentiment(Base):
+    """Quantidade de avaliações por data e sentimento.
+
+    Mantida na mesma transação das inserções em `reviews`, permite que o
+    relatório some uma linha por dia e sentimento em vez de contar todas
+    as avaliações do período.
+    """
+
+    __tablename__ = "review_daily_sentiment"
+
+    evaluation_date = Column(
+        Date,
+        primary_key=True,
+    )
+    sentiment = Column(
+        Enum(
+            SentimentsEnum,
+            name="sentiments_enum",
+            create_type=False,
+        ),
+        primary_key=True,
+    )
+    review_count = Column(
+        Integer,
+        nullable=False,
+        default=0,
+    )
+
+    def __repr__(self) -> str:
+        """Representação legível do objeto ReviewDailySentiment."""
+        return (
+            f"<ReviewDailySentiment(date='{self.evaluation_date}', "
+            f"sentiment='{self.sentiment.value}', "
+            f"count={self.review_count})>"
+        )
+
+
+# Configuração de texto completo do PostgreSQL usada na coluna e nas
+# consultas de busca.
+SEARCH_TS_CONFIG = "portuguese"
+
+# Índice de texto completo de `review_text`, criado pela migração 0003 e,
+# em `create_all` (testes e benchmarks), junto com a tabela. No
+# PostgreSQL, uma coluna `tsvector` gerada com índice GIN; no SQLite,
+# substituto local, uma tabela FTS5 de conteúdo externo mantida por
+# triggers. A coluna e a tabela não são mapeadas no ORM: as buscas as
+# referenciam diretamente em `search_reviews`.
+SEARCH_DDL = {
+    "postgresql": [
+        "ALTER TABLE reviews ADD COLUMN search_vector tsvector "
+        f"GENERATED ALWAYS AS (to_tsvector('{SEARCH_TS_CONFIG}', "
+        "review_text)) STORED",
+        "CREATE INDEX ix_reviews_search_vector ON reviews "
+        "USING GIN (search_vector)",
+    ],
+    "sqlite": [
+        "CREATE VIRTUAL TABLE reviews_fts USING fts5(review_text, "
+        "content='reviews', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2')",
+        "CREATE TRIGGER reviews_fts_insert AFTER INSERT ON reviews BEGIN "
+        "INSERT INTO reviews_fts (rowid, review_text) "
+        "VALUES (new.id, new.review_text); END",
+        "CREATE TRIGGER reviews_fts_delete AFTER DELETE ON reviews BEGIN "
+        "INSERT INTO reviews_fts (reviews_fts, rowid, review_text) "
+        "VALUES ('delete', old.id, old.review_text); END",
+        "CREATE TRIGGER reviews_fts_update AFTER UPDATE OF review_text "
+        "ON reviews BEGIN "
+        "INSERT INTO reviews_fts (reviews_fts, rowid, review_text) "
+        "VALUES ('delete', old.id, old.review_text); "
+        "INSERT INTO reviews_fts (rowid, review_text) "
+        "VALUES (new.id, new.review_text); END",
+    ],
+}
+
+for dialect, statements in SEARCH_DDL.items():
+    for statement in statements:
+        event.listen(
+            Review.__table__,
+            "after_create",
+            DDL(statement).execute_if(dialect=dialect),
+        )
+
+# A tabela FTS5 não pertence ao metadata e é removida antes de `reviews`;
+# os triggers são removidos junto com a tabela.
+event.listen(
+    Review.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS reviews_fts").execute_if(dialect="sqlite"),
+)
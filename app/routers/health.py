@@ -0,0 +1,43 @@
+"""Rotas de verificação de saúde e prontidão da aplicação."""
+
+from fastapi import APIRouter, status
+from fastapi.responses import JSONResponse
+
+from app.services.classifier import get_classifier_status
+
+health_router = APIRouter(prefix="/health", tags=["Saúde"])
+
+
+@health_router.get(
+    "/live",
+    summary="Verificação de vida",
+    response_description="A aplicação está em execução",
+)
+def liveness():
+    """Indica que o processo está de pé, independente do modelo."""
+    return {"status": "ok"}
+
+
+@health_router.get(
+    "/ready",
+    summary="Verificação de prontidão",
+    response_description="O classificador está carregado e aquecido",
+)
+def readiness():
+    """Indica se a aplicação pode receber tráfego.
+
+    Retorna 503 enquanto o classificador não estiver carregado e aquecido,
+    junto com os tempos de carga, aquecimento e primeira requisição.
+    """
+    classifier_status = get_classifier_status()
+    return JSONResponse(
+        status_code=(
+            status.HTTP_200_OK
+            if classifier_status["ready"]
+            else status.HTTP_503_SERVICE_UNAVAILABLE
+        ),
+        content={
+            "status": "ready" if classifier_status["ready"] else "starting",
+            **classifier_status,
+        },
+    )
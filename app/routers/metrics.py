@@ -0,0 +1,21 @@
+"""Rota de exposição das métricas no formato do Prometheus."""
+
+from fastapi import APIRouter
+from fastapi.responses import Response
+from prometheus_client import CONTENT_TYPE_LATEST
+
+from app.metrics import render_metrics
+
+metrics_router = APIRouter(tags=["Métricas"])
+
+
+@metrics_router.get(
+    "/metrics",
+    summary="Métricas da aplicação",
+    response_description="Métricas no formato de texto do Prometheus",
+)
+def metrics():
+    """Retorna latências por rota, etapas do classificador, tamanhos de
+    lote do modelo, duração das consultas e do checkout de conexões e
+    classificações por sentimento."""
+    return Response(render_metrics(), media_type=CONTENT_TYPE_LATEST)
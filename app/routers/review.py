@@ -1,24 +1,71 @@
 """Rotas RESTful para criação, listagem e consulta de avaliações."""
 
 from datetime import date
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Response,
+    status,
+)
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import ValidationError
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.config import (
+    REVIEW_EXPORT_CHUNK_SIZE,
+    REVIEW_MAX_PAGE_SIZE,
+    REVIEW_PAGE_SIZE,
+    REVIEW_SEARCH_MAX_QUERY_LENGTH,
+)
+from app.database import ReadSessionLocal, get_read_db, get_write_db
 from app.models.review import Review
-from app.schemas.review import ReviewCreate, ReviewResponse
-from app.services.classifier import classify_sentiment
+from app.schemas.review import (
+    ExportFormat,
+    ReviewBatchCreate,
+    ReviewBatchItemResult,
+    ReviewBatchResponse,
+    ReviewCreate,
+    ReviewResponse,
+    SentimentsEnum,
+)
+from app.services.classifier import (
+    classify_sentiment_async,
+    classify_sentiment_batch_async,
+)
+from app.services.export import FORMATTERS, MEDIA_TYPES, as_dicts, csv_header
+from app.services.idempotency import review_flights
+from app.services.report_cache import report_cache
+from app.services.scheduler import SchedulerOverloadedError
 from app.crud.review import (
+    BulkInsertError,
+    DuplicateReviewError,
+    content_hash,
+    count_reviews,
     create_review,
+    create_reviews_bulk,
+    decode_cursor,
+    encode_cursor,
     get_reviews,
-    get_review_report,
+    get_daily_sentiment_counts,
     get_review_by_id,
+    get_review_by_idempotency_key,
+    get_review_report,
+    get_reviews_by_content_hash,
+    search_reviews,
+    stream_reviews,
 )
 
-review_router = APIRouter(prefix="/reviews", tags=["Avaliações"])
+review_router = APIRouter(
+    prefix="/reviews",
+    tags=["Avaliações"],
+    default_response_class=ORJSONResponse,
+)
 
 
 @review_router.post(
@@ -27,60 +74,303 @@ review_router = APIRouter(prefix="/reviews", tags=["Avaliações"])
     status_code=status.HTTP_201_CREATED,
     summary="Criar nova avaliação",
     response_description="Avaliação criada com sucesso",
+    responses={
+        200: {
+            "model": ReviewResponse,
+            "description": (
+                "Avaliação já existente, devolvida sem nova classificação"
+            ),
+        },
+        409: {"description": "Idempotency-Key usada com outro conteúdo"},
+    },
 )
-def create_new_review(
+async def create_new_review(
     review_in: ReviewCreate,
-    db: Session = Depends(get_db),
+    response: Response,
+    idempotency_key: Optional[str] = Header(
+        None,
+        min_length=1,
+        max_length=255,
+        description="Chave que identifica a requisição entre reenvios",
+    ),
+    db: AsyncSession = Depends(get_write_db),
 ) -> ReviewResponse:
-    """Cria uma nova avaliação com classificação automática de sentimento."""
-    try:
-        sentiment = classify_sentiment(review_in.review_text)
-    except ValueError as e:
+    """Cria uma nova avaliação com classificação automática de sentimento.
+
+    A criação é idempotente: se já existir uma avaliação do mesmo cliente,
+    com o mesmo texto (a menos de espaçamento) e a mesma data, ou criada
+    com o mesmo `Idempotency-Key`, ela é devolvida com status 200 e o
+    cabeçalho `Idempotent-Replayed`, sem classificar o texto de novo.
+    Envios simultâneos do mesmo conteúdo no worker aguardam uma única
+    classificação.
+    """
+    key = content_hash(review_in)
+
+    async def classify_and_create() -> Tuple[Review, bool]:
+        try:
+            existing = await get_reviews_by_content_hash(db, [key])
+        except SQLAlchemyError:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Erro ao buscar a avaliação no banco de dados.",
+            )
+        if key in existing:
+            return existing[key], False
+
+        try:
+            sentiment = await classify_sentiment_async(review_in.review_text)
+        except SchedulerOverloadedError:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Classificador sobrecarregado. Tente novamente.",
+            )
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=(
+                    "Texto da avaliação inválido para classificação: "
+                    f"{str(e)}"
+                ),
+            )
+        except Exception:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Erro interno ao classificar o sentimento.",
+            )
+
+        try:
+            review = await create_review(
+                db, review_in, sentiment, idempotency_key
+            )
+        except SQLAlchemyError:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Erro ao salvar a avaliação no banco de dados.",
+            )
+
+        report_cache.invalidate([review.evaluation_date])
+        return review, True
+
+    review = None
+    if idempotency_key:
+        try:
+            review = await get_review_by_idempotency_key(db, idempotency_key)
+        except SQLAlchemyError:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Erro ao buscar a avaliação no banco de dados.",
+            )
+
+    if review is None:
+        try:
+            (review, created), shared = await review_flights.run(
+                key, classify_and_create
+            )
+        except DuplicateReviewError as e:
+            review, created, shared = e.existing, False, False
+        if created and not shared:
+            return review
+
+    if idempotency_key and review.content_hash != key:
         raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            status_code=status.HTTP_409_CONFLICT,
             detail=(
-                "Texto da avaliação inválido para classificação: "
-                f"{str(e)}"
+                "Idempotency-Key já usada em uma avaliação com outro "
+                "conteúdo."
             ),
         )
+
+    response.status_code = status.HTTP_200_OK
+    response.headers["Idempotent-Replayed"] = "true"
+    return review
+
+
+async def _classify_batch_items(texts: List[str]) -> List[Optional[str]]:
+    """Classifica os textos em lote, isolando falhas item a item.
+
+    Se a passada em lote falhar, os textos são reclassificados um a um
+    para que apenas os itens problemáticos fiquem sem sentimento.
+    """
+    try:
+        return await classify_sentiment_batch_async(texts)
     except Exception:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Erro interno ao classificar o sentimento.",
-        )
+        pass
 
-    review = Review(
-        customer_name=review_in.customer_name,
-        review_text=review_in.review_text,
-        evaluation_date=review_in.evaluation_date,
-        sentiment=sentiment,
+    sentiments = []
+    for text in texts:
+        try:
+            sentiments.append(await classify_sentiment_async(text))
+        except Exception:
+            sentiments.append(None)
+    return sentiments
+
+
+@review_router.post(
+    "/batch",
+    response_model=ReviewBatchResponse,
+    summary="Criar avaliações em lote",
+    response_description="Resultado do processamento de cada avaliação",
+)
+async def create_reviews_batch(
+    batch_in: ReviewBatchCreate,
+    db: AsyncSession = Depends(get_write_db),
+) -> ReviewBatchResponse:
+    """Cria várias avaliações, classificando os textos em uma única passada.
+
+    Cada item é validado, classificado e persistido de forma independente
+    na resposta: itens inválidos ou que falharem na classificação são
+    reportados em `error` sem impedir a criação dos demais. As avaliações
+    são gravadas em blocos de `REVIEW_INSERT_CHUNK_SIZE`, cada um na sua
+    transação; se um bloco falhar, seus itens e os seguintes são
+    reportados com erro e os anteriores permanecem criados. Itens com o
+    conteúdo de uma avaliação existente, ou de um item anterior do lote,
+    são devolvidos com `duplicate` sem nova classificação.
+    """
+    results: List[Optional[ReviewBatchItemResult]] = [None] * len(
+        batch_in.reviews
     )
 
+    valid = []
+    for index, raw_review in enumerate(batch_in.reviews):
+        try:
+            valid.append((index, ReviewCreate.model_validate(raw_review)))
+        except ValidationError as e:
+            messages = "; ".join(err["msg"] for err in e.errors())
+            results[index] = ReviewBatchItemResult(
+                index=index,
+                error=f"Dados da avaliação inválidos: {messages}",
+            )
+
+    # Itens já gravados ou repetidos no lote não são classificados: o
+    # primeiro item de cada conteúdo representa os demais.
+    hashes = [content_hash(review_in) for _, review_in in valid]
     try:
-        return create_review(db, review)
+        existing = await get_reviews_by_content_hash(db, hashes)
     except SQLAlchemyError:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Erro ao salvar a avaliação no banco de dados.",
+            detail="Erro ao buscar avaliações no banco de dados.",
+        )
+
+    first_index = {}
+    pending = []
+    repeated = []
+    for (index, review_in), key in zip(valid, hashes):
+        if key in existing:
+            results[index] = ReviewBatchItemResult(
+                index=index,
+                review=ReviewResponse.model_validate(
+                    existing[key], from_attributes=True
+                ),
+                duplicate=True,
+            )
+        elif key in first_index:
+            repeated.append((index, first_index[key]))
+        else:
+            first_index[key] = index
+            pending.append((index, review_in))
+
+    sentiments = await _classify_batch_items(
+        [review_in.review_text for _, review_in in pending]
+    )
+
+    classified = []
+    for (index, review_in), sentiment in zip(pending, sentiments):
+        if sentiment is None:
+            results[index] = ReviewBatchItemResult(
+                index=index,
+                error="Erro interno ao classificar o sentimento.",
+            )
+        else:
+            classified.append((index, review_in, sentiment))
+
+    try:
+        reviews = await create_reviews_bulk(
+            db,
+            [(review_in, sentiment) for _, review_in, sentiment in classified],
+        )
+    except BulkInsertError as e:
+        # Os blocos anteriores ao que falhou já foram confirmados.
+        reviews = e.created
+        for index, _, _ in classified[len(reviews):]:
+            results[index] = ReviewBatchItemResult(
+                index=index,
+                error="Erro ao salvar a avaliação no banco de dados.",
+            )
+
+    report_cache.invalidate(review.evaluation_date for review in reviews)
+
+    for (index, _, _), review in zip(classified, reviews):
+        results[index] = ReviewBatchItemResult(
+            index=index,
+            review=ReviewResponse.model_validate(review, from_attributes=True),
+        )
+
+    for index, first in repeated:
+        results[index] = results[first].model_copy(
+            update={
+                "index": index,
+                "duplicate": results[first].review is not None,
+            }
         )
 
+    failed = sum(1 for result in results if result.error is not None)
+    duplicates = sum(1 for result in results if result.duplicate)
+    return ReviewBatchResponse(
+        created=len(results) - failed - duplicates,
+        duplicates=duplicates,
+        failed=failed,
+        results=results,
+    )
+
 
 @review_router.get(
     "/",
     response_model=List[ReviewResponse],
     summary="Listar avaliações",
-    response_description="Lista de avaliações encontradas",
+    response_description=(
+        "Página de avaliações, da mais recente para a mais antiga. O "
+        "cursor da página seguinte vem no cabeçalho X-Next-Cursor"
+    ),
 )
-def list_reviews(
+async def list_reviews(
     start_date: Optional[date] = Query(
         None, description="Data inicial (yyyy-mm-dd)"
     ),
     end_date: Optional[date] = Query(
         None, description="Data final (yyyy-mm-dd)"
     ),
-    db: Session = Depends(get_db),
-) -> List[ReviewResponse]:
-    """Lista avaliações com filtro opcional por intervalo de datas."""
+    sentiment: Optional[SentimentsEnum] = Query(
+        None, description="Sentimento das avaliações"
+    ),
+    customer_name: Optional[str] = Query(
+        None, description="Nome exato do cliente"
+    ),
+    limit: int = Query(
+        REVIEW_PAGE_SIZE,
+        ge=1,
+        le=REVIEW_MAX_PAGE_SIZE,
+        description="Quantidade máxima de avaliações na página",
+    ),
+    cursor: Optional[str] = Query(
+        None, description="Valor de X-Next-Cursor da página anterior"
+    ),
+    include_total: bool = Query(
+        False,
+        description=(
+            "Retorna o total no cabeçalho X-Total-Count (estimado no "
+            "PostgreSQL)"
+        ),
+    ),
+    db: AsyncSession = Depends(get_read_db),
+) -> ORJSONResponse:
+    """Lista avaliações com filtros opcionais e paginação por cursor.
+
+    Enquanto houver mais avaliações, a resposta traz o cabeçalho
+    X-Next-Cursor, a ser repassado em `cursor` para obter a página
+    seguinte. As linhas, lidas só com as colunas da resposta, são
+    serializadas direto pelo orjson, sem a validação do `response_model`.
+    """
     if start_date and end_date and start_date > end_date:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -88,33 +378,150 @@ def list_reviews(
         )
 
     try:
-        return get_reviews(db, start_date, end_date)
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+        )
+
+    filters = {
+        "start_date": start_date,
+        "end_date": end_date,
+        "sentiment": sentiment,
+        "customer_name": customer_name,
+    }
+    headers = {}
+    try:
+        # Um item a mais indica se existe a página seguinte.
+        reviews = await get_reviews(
+            db, **filters, limit=limit + 1, after=after
+        )
+        if include_total:
+            headers["X-Total-Count"] = str(
+                await count_reviews(db, **filters)
+            )
     except SQLAlchemyError:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Erro ao recuperar avaliações.",
         )
 
+    if len(reviews) > limit:
+        reviews = reviews[:limit]
+        last = reviews[-1]
+        headers["X-Next-Cursor"] = encode_cursor(
+            last.evaluation_date, last.id
+        )
+    return ORJSONResponse(as_dicts(reviews), headers=headers)
+
+
+@review_router.get(
+    "/search",
+    response_model=List[ReviewResponse],
+    summary="Buscar avaliações por texto",
+    response_description=(
+        "Avaliações que mencionam todos os termos, da mais relevante para "
+        "a menos relevante. O deslocamento da página seguinte vem no "
+        "cabeçalho X-Next-Offset"
+    ),
+)
+async def search(
+    q: str = Query(
+        ...,
+        min_length=1,
+        max_length=REVIEW_SEARCH_MAX_QUERY_LENGTH,
+        description="Termos buscados no texto das avaliações",
+    ),
+    start_date: Optional[date] = Query(
+        None, description="Data inicial (yyyy-mm-dd)"
+    ),
+    end_date: Optional[date] = Query(
+        None, description="Data final (yyyy-mm-dd)"
+    ),
+    sentiment: Optional[SentimentsEnum] = Query(
+        None, description="Sentimento das avaliações"
+    ),
+    limit: int = Query(
+        REVIEW_PAGE_SIZE,
+        ge=1,
+        le=REVIEW_MAX_PAGE_SIZE,
+        description="Quantidade máxima de avaliações na página",
+    ),
+    offset: int = Query(
+        0, ge=0, description="Valor de X-Next-Offset da página anterior"
+    ),
+    db: AsyncSession = Depends(get_read_db),
+) -> ORJSONResponse:
+    """Busca avaliações pelo texto, usando o índice de texto completo.
+
+    Os resultados são ordenados pela relevância, que depende da consulta,
+    por isso a paginação é por deslocamento. Enquanto houver mais
+    avaliações, a resposta traz o cabeçalho X-Next-Offset. Como na
+    listagem, as linhas são serializadas direto pelo orjson.
+    """
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A data inicial não pode ser posterior à data final.",
+        )
+
+    try:
+        # Um item a mais indica se existe a página seguinte.
+        reviews = await search_reviews(
+            db,
+            q,
+            start_date=start_date,
+            end_date=end_date,
+            sentiment=sentiment,
+            limit=limit + 1,
+            offset=offset,
+        )
+    except SQLAlchemyError:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro ao buscar avaliações.",
+        )
+
+    headers = {}
+    if len(reviews) > limit:
+        reviews = reviews[:limit]
+        headers["X-Next-Offset"] = str(offset + limit)
+    return ORJSONResponse(as_dicts(reviews), headers=headers)
+
 
 @review_router.get(
     "/report",
     summary="Relatório de sentimentos",
     response_description="Distribuição de sentimentos entre as avaliações",
 )
-def get_report(
+async def get_report(
     start_date: date = Query(..., description="Data inicial (yyyy-mm-dd)"),
     end_date: date = Query(..., description="Data final (yyyy-mm-dd)"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """Gera relatório de avaliações por tipo de sentimento."""
+    """Gera relatório de avaliações por tipo de sentimento.
+
+    As contagens de cada dia ficam em cache no worker e são descartadas
+    quando uma avaliação daquela data é criada; os dias ausentes ou
+    descartados são lidos em uma única consulta ao resumo diário.
+    Intervalos maiores que o cache são somados direto no resumo diário.
+    """
     if start_date > end_date:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="A data inicial não pode ser posterior à data final.",
         )
 
+    async def load(start: date, end: date):
+        return await get_daily_sentiment_counts(db, start, end)
+
+    async def load_totals(start: date, end: date):
+        return await get_review_report(db, start, end)
+
     try:
-        return get_review_report(db, start_date, end_date)
+        return await report_cache.get_report(
+            start_date, end_date, load, load_totals
+        )
     except SQLAlchemyError:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -122,19 +529,86 @@ def get_report(
         )
 
 
+@review_router.get(
+    "/export",
+    response_class=StreamingResponse,
+    summary="Exportar avaliações",
+    response_description="Avaliações em NDJSON ou CSV, enviadas em blocos",
+    responses={
+        200: {"content": {media: {} for media in MEDIA_TYPES.values()}},
+    },
+)
+async def export_reviews(
+    start_date: Optional[date] = Query(
+        None, description="Data inicial (yyyy-mm-dd)"
+    ),
+    end_date: Optional[date] = Query(
+        None, description="Data final (yyyy-mm-dd)"
+    ),
+    sentiment: Optional[SentimentsEnum] = Query(
+        None, description="Sentimento das avaliações"
+    ),
+    customer_name: Optional[str] = Query(
+        None, description="Nome exato do cliente"
+    ),
+    format: ExportFormat = Query(
+        ExportFormat.NDJSON, description="Formato da exportação"
+    ),
+) -> StreamingResponse:
+    """Exporta as avaliações filtradas, da mais antiga para a mais recente.
+
+    As linhas são lidas do banco em blocos de `REVIEW_EXPORT_CHUNK_SIZE` e
+    cada bloco é enviado assim que serializado, de modo que a memória usada
+    não depende do tamanho do intervalo. A sessão, no banco de leitura, é
+    aberta pelo próprio gerador da resposta, pois a do `get_read_db` é
+    encerrada antes do envio do corpo.
+    """
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A data inicial não pode ser posterior à data final.",
+        )
+
+    formatter = FORMATTERS[format]
+
+    async def body():
+        if format == ExportFormat.CSV:
+            yield csv_header()
+        async with ReadSessionLocal() as db:
+            async for rows in stream_reviews(
+                db,
+                start_date,
+                end_date,
+                sentiment,
+                customer_name,
+                chunk_size=REVIEW_EXPORT_CHUNK_SIZE,
+            ):
+                yield formatter(rows)
+
+    return StreamingResponse(
+        body(),
+        media_type=MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="reviews.{format.value}"'
+            ),
+        },
+    )
+
+
 @review_router.get(
     "/{review_id}",
     response_model=ReviewResponse,
     summary="Obter avaliação por ID",
     response_description="Avaliação encontrada",
 )
-def get_review_by_id_route(
+async def get_review_by_id_route(
     review_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> ReviewResponse:
     """Recupera uma avaliação específica pelo ID."""
     try:
-        review = get_review_by_id(db, review_id)
+        review = await get_review_by_id(db, review_id)
     except SQLAlchemyError:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -0,0 +1,45 @@
+"""Rotas de consulta e recarga das regras heurísticas do classificador."""
+
+from fastapi import APIRouter, HTTPException, status
+
+from app.services.classifier import get_classifier, reload_rules
+
+rules_router = APIRouter(prefix="/rules", tags=["Regras"])
+
+
+@rules_router.get(
+    "/",
+    summary="Regras em uso",
+    response_description="Versão e origem das regras heurísticas em uso",
+)
+def get_rules():
+    """Retorna a versão, o hash e o arquivo das regras em uso neste worker."""
+    return get_classifier().get_rules_info()
+
+
+@rules_router.post(
+    "/reload",
+    summary="Recarregar regras",
+    response_description="Regras recarregadas a partir do arquivo",
+)
+def reload():
+    """Relê o arquivo de regras e troca léxicos, padrões e limiares sem
+    recarregar o modelo.
+
+    Executada fora do event loop. Se o arquivo for inválido, as regras em
+    uso são mantidas e a rota retorna 422. Com vários workers, apenas o
+    worker que atende a requisição é recarregado; use
+    `CLASSIFIER_RULES_WATCH_SECONDS` para recarregar todos.
+    """
+    try:
+        return reload_rules()
+    except OSError as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao ler o arquivo de regras: {str(e)}",
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Arquivo de regras inválido: {str(e)}",
+        )
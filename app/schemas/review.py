@@ -2,9 +2,12 @@
 
 from datetime import date
 from enum import Enum
+from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, Field, field_validator
 
+from app.config import REVIEW_BATCH_MAX_SIZE
+
 
 class SentimentsEnum(str, Enum):
     """Enum para classificação de sentimentos."""
@@ -14,6 +17,13 @@ class SentimentsEnum(str, Enum):
     NEGATIVE = "negative"
 
 
+class ExportFormat(str, Enum):
+    """Formatos de exportação de avaliações."""
+
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
 class ReviewBase(BaseModel):
     """Schema base para dados de avaliação de clientes."""
 
@@ -92,3 +102,64 @@ class ReviewResponse(BaseModel):
     sentiment: SentimentsEnum = Field(
         ..., json_schema_extra={"example": "positive"}
     )
+
+
+class ReviewBatchCreate(BaseModel):
+    """Schema para criação de avaliações em lote.
+
+    Cada item é validado individualmente como `ReviewCreate`, de modo que
+    um item inválido não impede o processamento dos demais.
+    """
+
+    reviews: List[Dict[str, Any]] = Field(
+        ...,
+        min_length=1,
+        max_length=REVIEW_BATCH_MAX_SIZE,
+        description="Avaliações no mesmo formato de POST /reviews/",
+    )
+
+
+class ReviewBatchItemResult(BaseModel):
+    """Resultado do processamento de um item do lote."""
+
+    index: int = Field(
+        ...,
+        description="Posição do item na lista enviada",
+        json_schema_extra={"example": 0},
+    )
+
+    review: Optional[ReviewResponse] = Field(
+        None, description="Avaliação criada, se o item foi processado"
+    )
+
+    duplicate: bool = Field(
+        False,
+        description=(
+            "Se a avaliação já existia (ou repete um item anterior do "
+            "lote) e foi devolvida sem nova classificação"
+        ),
+    )
+
+    error: Optional[str] = Field(
+        None, description="Motivo da falha, se o item não foi processado"
+    )
+
+
+class ReviewBatchResponse(BaseModel):
+    """Schema de resposta para criação de avaliações em lote."""
+
+    created: int = Field(
+        ...,
+        description="Avaliações gravadas por este lote",
+        json_schema_extra={"example": 2},
+    )
+
+    duplicates: int = Field(
+        0,
+        description="Itens devolvidos com `duplicate`, sem nova gravação",
+        json_schema_extra={"example": 0},
+    )
+
+    failed: int = Field(..., json_schema_extra={"example": 0})
+
+    results: List[ReviewBatchItemResult]
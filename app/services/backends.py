@@ -0,0 +1,221 @@
+"""Backends de inferência do modelo usado pelo classificador de sentimentos.
+
+Cada backend apenas pontua textos, devolvendo rótulo e confiança; as
+regras heurísticas ficam em `SentimentClassifier`.
+"""
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple
+
+import psutil
+
+from app.config import CLASSIFIER_MINI_BATCH_SIZE
+from app.metrics import MODEL_BATCH_SIZE
+
+MODEL_NAME = "sentiment"
+
+
+class ClassifierBackend(ABC):
+    """Interface comum dos backends de inferência.
+
+    Mede o tempo de carga, o consumo de memória (variação do RSS do
+    processo durante a carga) e a latência de cada lote pontuado.
+    """
+
+    name: str = ""
+
+    def __init__(self):
+        self.loaded = False
+        self._stats_lock = threading.Lock()
+        self._load_seconds: Optional[float] = None
+        self._memory_bytes: Optional[int] = None
+        self._batches = 0
+        self._items = 0
+        self._total_batch_seconds = 0.0
+        self._last_batch_seconds: Optional[float] = None
+
+    def load(self):
+        """Carrega o modelo, registrando tempo e memória consumidos."""
+        process = psutil.Process()
+        rss_before = process.memory_info().rss
+        start = time.perf_counter()
+        self._load()
+        self._load_seconds = time.perf_counter() - start
+        self._memory_bytes = max(process.memory_info().rss - rss_before, 0)
+        self.loaded = True
+
+    def predict(
+        self,
+        texts: List[str],
+        mini_batch_size: Optional[int] = None,
+    ) -> List[Tuple[str, float]]:
+        """Pontua vários textos em uma única chamada.
+
+        Args:
+            texts (List[str]): Textos a serem pontuados.
+            mini_batch_size (Optional[int]): Tamanho dos mini-lotes. Usa
+                `CLASSIFIER_MINI_BATCH_SIZE` se omitido.
+
+        Returns:
+            List[Tuple[str, float]]: Rótulo ("positive" ou "negative") e
+            confiança de cada texto, na mesma ordem da entrada.
+        """
+        if not texts:
+            return []
+
+        MODEL_BATCH_SIZE.observe(len(texts))
+        start = time.perf_counter()
+        predictions = self._predict(
+            texts, mini_batch_size or CLASSIFIER_MINI_BATCH_SIZE
+        )
+        elapsed = time.perf_counter() - start
+        with self._stats_lock:
+            self._batches += 1
+            self._items += len(texts)
+            self._total_batch_seconds += elapsed
+            self._last_batch_seconds = elapsed
+        return predictions
+
+    @abstractmethod
+    def _load(self):
+        """Carrega o modelo do backend."""
+
+    @abstractmethod
+    def _predict(
+        self, texts: List[str], mini_batch_size: int
+    ) -> List[Tuple[str, float]]:
+        """Pontua os textos com o modelo já carregado."""
+
+    def get_stats(self) -> Dict[str, Optional[float]]:
+        """Retorna as métricas de carga e de inferência do backend.
+
+        Returns:
+            Dict[str, Optional[float]]: Nome do backend, tempo de carga,
+            memória consumida na carga, lotes e itens pontuados e latência
+            média e do último lote, em segundos.
+        """
+        with self._stats_lock:
+            return {
+                "backend": self.name,
+                "load_seconds": self._load_seconds,
+                "memory_bytes": self._memory_bytes,
+                "batches": self._batches,
+                "items": self._items,
+                "average_batch_seconds": (
+                    self._total_batch_seconds / self._batches
+                    if self._batches
+                    else None
+                ),
+                "last_batch_seconds": self._last_batch_seconds,
+            }
+
+
+class FlairBackend(ClassifierBackend):
+    """Modelo Flair `sentiment` em precisão total no PyTorch."""
+
+    name = "flair"
+
+    def _load(self):
+        # Importado aqui para que importar o módulo não carregue o PyTorch.
+        from flair.models import TextClassifier
+
+        self.model = TextClassifier.load(MODEL_NAME)
+
+    def _predict(
+        self, texts: List[str], mini_batch_size: int
+    ) -> List[Tuple[str, float]]:
+        from flair.data import Sentence
+
+        sentences = [Sentence(text) for text in texts]
+        self.model.predict(sentences, mini_batch_size=mini_batch_size)
+        return [
+            (sentence.labels[0].value.lower(), sentence.labels[0].score)
+            for sentence in sentences
+        ]
+
+
+class QuantizedFlairBackend(FlairBackend):
+    """Modelo Flair com as camadas lineares quantizadas dinamicamente em
+    int8, para inferência mais rápida e menor em CPU."""
+
+    name = "flair-quantized"
+
+    def _load(self):
+        import torch
+
+        super()._load()
+        self.model.eval()
+        self.model = torch.ao.quantization.quantize_dynamic(
+            self.model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+
+
+class StubBackend(ClassifierBackend):
+    """Backend determinístico e sem dependências, usado em testes.
+
+    Conta palavras de polaridade conhecidas: mais negativas resultam em
+    "negative", caso contrário "positive". A confiança é alta quando há
+    palavras de uma só polaridade e baixa quando há empate ou mistura.
+    """
+
+    name = "stub"
+
+    POSITIVE_WORDS = ("bom", "boa", "ótimo", "excelente", "rápido", "resolv")
+    NEGATIVE_WORDS = ("não", "ruim", "péssim", "horrível", "demor", "nunca")
+
+    def _load(self):
+        pass
+
+    def _predict(
+        self, texts: List[str], mini_batch_size: int
+    ) -> List[Tuple[str, float]]:
+        predictions = []
+        for text in texts:
+            lowered = text.lower()
+            positive = sum(word in lowered for word in self.POSITIVE_WORDS)
+            negative = sum(word in lowered for word in self.NEGATIVE_WORDS)
+            label = "negative" if negative > positive else "positive"
+            confidence = 0.95 if not (positive and negative) else 0.6
+            predictions.append((label, confidence))
+        return predictions
+
+
+def configure_torch_threads(num_threads: int):
+    """Limita as threads intra-op do PyTorch no processo atual.
+
+    Args:
+        num_threads (int): Número de threads; 0 mantém o padrão.
+    """
+    if num_threads <= 0:
+        return
+    import torch
+
+    torch.set_num_threads(num_threads)
+
+
+BACKENDS = {
+    backend.name: backend
+    for backend in (FlairBackend, QuantizedFlairBackend, StubBackend)
+}
+
+
+def create_backend(name: str) -> ClassifierBackend:
+    """Cria o backend de inferência pelo nome configurado.
+
+    Args:
+        name (str): "flair", "flair-quantized" ou "stub".
+
+    Returns:
+        ClassifierBackend: Backend ainda não carregado.
+
+    Raises:
+        ValueError: Se o nome não corresponder a nenhum backend.
+    """
+    try:
+        return BACKENDS[name]()
+    except KeyError:
+        raise ValueError(
+            f"Backend de classificação desconhecido: {name}"
+        ) from None
@@ -0,0 +1,280 @@
+"""Cache de classificações endereçado pelo conteúdo do texto."""
+
+import hashlib
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, Optional
+
+
+def normalize_cache_text(text: str) -> str:
+    """Normaliza o texto para a chave do cache.
+
+    Apenas remove espaços nas pontas e colapsa espaços internos, pois o
+    modelo Flair diferencia maiúsculas e acentos; textos que diferem só
+    em espaçamento compartilham a mesma entrada.
+    """
+    return " ".join(text.split())
+
+
+class CacheBackend(ABC):
+    """Camada persistente opcional do cache de classificações."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        """Retorna o sentimento armazenado para a chave, se houver."""
+
+    @abstractmethod
+    def set(self, key: str, sentiment: str):
+        """Armazena o sentimento para a chave."""
+
+    @abstractmethod
+    def clear(self):
+        """Remove todas as entradas armazenadas."""
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """Camada persistente em um arquivo SQLite local."""
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS classification_cache "
+                "(key TEXT PRIMARY KEY, sentiment TEXT NOT NULL)"
+            )
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT sentiment FROM classification_cache WHERE key = ?",
+                (key,),
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, sentiment: str):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO classification_cache (key, sentiment) "
+                "VALUES (?, ?)",
+                (key, sentiment),
+            )
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM classification_cache")
+
+
+class RedisCacheBackend(CacheBackend):
+    """Camada persistente em um servidor compatível com Redis.
+
+    Aceita qualquer cliente com `get`, `set(..., ex=...)`, `scan_iter` e
+    `delete`, como `redis.Redis` ou `InMemoryRedisClient`.
+    """
+
+    def __init__(
+        self,
+        client,
+        prefix: str = "sentiment:",
+        ttl_seconds: Optional[int] = None,
+    ):
+        self._client = client
+        self._prefix = prefix
+        self._ttl_seconds = ttl_seconds
+
+    def get(self, key: str) -> Optional[str]:
+        value = self._client.get(self._prefix + key)
+        if isinstance(value, bytes):
+            value = value.decode()
+        return value
+
+    def set(self, key: str, sentiment: str):
+        self._client.set(self._prefix + key, sentiment, ex=self._ttl_seconds)
+
+    def clear(self):
+        for key in self._client.scan_iter(match=self._prefix + "*"):
+            self._client.delete(key)
+
+
+class InMemoryRedisClient:
+    """Substituto local de um cliente Redis, usado em testes e dev.
+
+    Implementa apenas os comandos usados por `RedisCacheBackend` e ignora
+    o tempo de expiração.
+    """
+
+    def __init__(self):
+        self._data: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            return self._data.get(key)
+
+    def set(self, key: str, value: str, ex: Optional[int] = None):
+        with self._lock:
+            self._data[key] = value.encode()
+
+    def scan_iter(self, match: str = "*"):
+        prefix = match.rstrip("*")
+        with self._lock:
+            keys = [key for key in self._data if key.startswith(prefix)]
+        return iter(keys)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._data.pop(key, None)
+
+
+class ClassificationCache:
+    """Cache de sentimentos com camada LRU em memória e persistência opcional.
+
+    A chave é o SHA-256 da versão do classificador e do texto normalizado.
+    Como a versão é derivada dos léxicos e do modelo, qualquer mudança
+    neles produz chaves novas e invalida as entradas antigas sem limpeza
+    explícita. Os métodos aceitam uma versão explícita para que um lote
+    classificado com regras que foram recarregadas no meio do caminho seja
+    gravado sob a versão com que foi de fato calculado.
+    """
+
+    def __init__(
+        self,
+        version: str,
+        max_size: int,
+        backend: Optional[CacheBackend] = None,
+    ):
+        self.version = version
+        self.max_size = max_size
+        self.backend = backend
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._backend_hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def make_key(self, text: str, version: Optional[str] = None) -> str:
+        """Calcula a chave do cache para o texto na versão informada ou,
+        se omitida, na versão atual."""
+        version = version or self.version
+        payload = f"{version}\x00{normalize_cache_text(text)}"
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, text: str, version: Optional[str] = None) -> Optional[str]:
+        """Busca o sentimento do texto, primeiro em memória e depois na
+        camada persistente.
+
+        Args:
+            text (str): Texto da avaliação.
+            version (Optional[str]): Versão do classificador. Usa a atual
+                se omitida.
+
+        Returns:
+            Optional[str]: Sentimento em cache, ou None em caso de miss.
+        """
+        key = self.make_key(text, version)
+        with self._lock:
+            sentiment = self._entries.get(key)
+            if sentiment is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return sentiment
+
+        sentiment = self.backend.get(key) if self.backend else None
+        with self._lock:
+            if sentiment is None:
+                self._misses += 1
+                return None
+            self._backend_hits += 1
+            self._store(key, sentiment)
+        return sentiment
+
+    def set(
+        self,
+        text: str,
+        sentiment: str,
+        version: Optional[str] = None,
+    ):
+        """Armazena o sentimento do texto em todas as camadas, na versão
+        informada ou, se omitida, na versão atual."""
+        key = self.make_key(text, version)
+        with self._lock:
+            self._store(key, sentiment)
+        if self.backend:
+            self.backend.set(key, sentiment)
+
+    def _store(self, key: str, sentiment: str):
+        """Insere na camada LRU, removendo a entrada menos usada se cheia."""
+        if self.max_size <= 0:
+            return
+        self._entries[key] = sentiment
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def clear(self):
+        """Remove todas as entradas de todas as camadas."""
+        with self._lock:
+            self._entries.clear()
+        if self.backend:
+            self.backend.clear()
+
+    def get_stats(self) -> Dict[str, float]:
+        """Retorna os contadores de uso do cache.
+
+        Returns:
+            Dict[str, float]: Acertos em memória ("hits") e na camada
+            persistente ("backend_hits"), falhas, remoções por LRU, tamanho
+            atual e taxa de acerto.
+        """
+        with self._lock:
+            hits = self._hits + self._backend_hits
+            lookups = hits + self._misses
+            return {
+                "hits": self._hits,
+                "backend_hits": self._backend_hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "size": len(self._entries),
+                "hit_ratio": hits / lookups if lookups else 0.0,
+            }
+
+
+def build_cache_backend(
+    kind: str,
+    url: Optional[str],
+    ttl_seconds: Optional[int] = None,
+) -> Optional[CacheBackend]:
+    """Cria a camada persistente conforme a configuração.
+
+    Args:
+        kind (str): "sqlite", "redis", "memory" ou vazio para nenhuma.
+        url (Optional[str]): Caminho do arquivo SQLite ou URL do Redis.
+        ttl_seconds (Optional[int]): Expiração das entradas no Redis.
+
+    Returns:
+        Optional[CacheBackend]: Camada criada, ou None se desabilitada.
+    """
+    if not kind:
+        return None
+    if kind == "sqlite":
+        return SQLiteCacheBackend(url or "classification_cache.sqlite3")
+    if kind == "redis":
+        try:
+            import redis
+        except ImportError as e:
+            raise ValueError(
+                "O backend 'redis' requer o pacote redis instalado."
+            ) from e
+        return RedisCacheBackend(
+            redis.Redis.from_url(url or "redis://localhost:6379/0"),
+            ttl_seconds=ttl_seconds,
+        )
+    if kind == "memory":
+        return RedisCacheBackend(
+            InMemoryRedisClient(), ttl_seconds=ttl_seconds
+        )
+    raise ValueError(f"Backend de cache desconhecido: {kind}")
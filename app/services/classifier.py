@@ -1,86 +1,282 @@
 """Módulo para classificação de sentimentos com modelo Flair e heurísticas."""
 
-import re
-from typing import Dict, List
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple, Union
 
-import spacy
-from flair.data import Sentence
-from flair.models import TextClassifier
 from unidecode import unidecode
 
+from app.config import (
+    CLASSIFICATION_CACHE_BACKEND,
+    CLASSIFICATION_CACHE_SIZE,
+    CLASSIFICATION_CACHE_TTL,
+    CLASSIFICATION_CACHE_URL,
+    CLASSIFIER_BACKEND,
+    CLASSIFIER_EXECUTOR_WORKERS,
+    CLASSIFIER_LEMMATIZE,
+    CLASSIFIER_LONG_TEXT_CHARS,
+    CLASSIFIER_MAX_TOKENS_PER_REVIEW,
+    CLASSIFIER_PRELOAD,
+    CLASSIFIER_RULES_PATH,
+    CLASSIFIER_RULES_WATCH_SECONDS,
+    LEMMATIZER_BATCH_SIZE,
+    LEMMATIZER_CACHE_SIZE,
+    LEMMATIZER_N_PROCESS,
+    NEUTRAL_PATTERN_MAX_GAP,
+    SCHEDULER_ENABLED,
+    SCHEDULER_MAX_BATCH_SIZE,
+    SCHEDULER_MAX_QUEUE_SIZE,
+    SCHEDULER_MAX_WAIT_MS,
+    SPACY_MODEL,
+)
+from app.metrics import CLASSIFICATIONS, CLASSIFIER_STAGE_SECONDS
 from app.schemas.review import SentimentsEnum
+from app.services.backends import (
+    MODEL_NAME,
+    ClassifierBackend,
+    create_backend,
+)
+from app.services.cache import ClassificationCache, build_cache_backend
+from app.services.lemmatizer import Lemmatizer
+from app.services.long_text import (
+    aggregate_predictions,
+    count_tokens,
+    fit_to_budget,
+)
+from app.services.matcher import (
+    KeywordSequenceMatcher,
+    LexiconMatcher,
+    normalize_text,
+)
+from app.services.rules import (
+    DEFAULT_RULES_PATH,
+    RuleSet,
+    RulesWatcher,
+    load_rules_config,
+    rules_digest,
+)
+from app.services.scheduler import InferenceScheduler
+
+logger = logging.getLogger(__name__)
+
+# Incrementar ao alterar a árvore de decisão, para invalidar o cache.
+RULES_VERSION = "1"
+
+# Limites superiores (em caracteres) das faixas de tamanho usadas nas
+# métricas de latência; textos maiores caem na última faixa.
+LENGTH_BUCKETS = (200, 1000, 2500)
+
+
+def _observe_stage(stage: str, start: float) -> float:
+    """Registra a duração de uma etapa iniciada em `start` e retorna o
+    instante atual, início da etapa seguinte."""
+    now = time.perf_counter()
+    CLASSIFIER_STAGE_SECONDS.labels(stage).observe(now - start)
+    return now
+
+
+def length_bucket(length: int) -> str:
+    """Retorna o nome da faixa de tamanho de um texto, como "<=200" ou
+    ">2500"."""
+    for limit in LENGTH_BUCKETS:
+        if length <= limit:
+            return f"<={limit}"
+    return f">{LENGTH_BUCKETS[-1]}"
+
+
+def _lexicon(name: str) -> property:
+    """Propriedade somente leitura para um léxico das regras em uso."""
+    return property(
+        lambda self: self.rules.lexicons[name],
+        doc=f"Léxico '{name}' das regras em uso.",
+    )
 
 
 class SentimentClassifier:
     """Classificador de sentimentos com regras específicas para suporte B2B."""
 
-    def __init__(self):
-        self.classifier = TextClassifier.load("sentiment")
-        self.nlp = spacy.load("pt_core_news_sm", disable=["ner", "parser"])
-
-        self.very_positive = [
-            "extremamente satisfeito", "acima do esperado", "excelente",
-            "ótimo", "muito bom", "impecável", "superou completamente",
-            "nota 10", "melhor atendimento", "impressionada", "adorei",
-            "sem complicação", "prestativa", "recomendo", "surpreendeu",
-            "muito bem preparados", "competentes", "eficiente", "rapidez",
-            "primeira", "perfeito", "qualidade", "atenciosa", "dedicada",
-            "prático", "sem nenhuma complicação", "realmente de qualidade",
-            "muito prestativa", "se dedicou", "superou", "expectativas"
-        ]
-
-        self.very_negative = [
-            "péssima", "decepcionante", "insatisfeito", "horrível",
-            "inaceitável", "despreparo", "não resolveu", "despreparado",
-            "não conseguiram resolver", "problema não foi resolvido",
-            "desperdiçou", "perdi tempo", "não soube", "confuso",
-            "contraditório", "ignorou", "fraco", "recorrente", "demorado",
-            "nunca resolvem", "total despreparo", "solução errada",
-            "muito tempo", "não tive uma boa experiência", "frustrado",
-            "vou reconsiderar", "bastante insatisfeito", "decepcionado",
-            "completamente despreparado", "não conseguiu solucionar",
-            "falta de consistência", "muito mais tempo", "não era clara"
-        ]
-
-        self.neutral_indicators = [
-            "mas", "porém", "contudo", "entretanto", "no entanto",
-            "apesar de", "embora", "mesmo assim", "ainda assim",
-            "por outro lado", "ao mesmo tempo", "educado mas",
-            "respeitoso mas", "tentou mas", "esforço mas",
-            "infelizmente não", "não era clara", "mediana", "poderia ser",
-            "esperava mais", "não tão eficiente", "agradeço pelo esforço",
-            "sem solução definitiva", "meio incompleta", "pela metade",
-            "mais ou menos", "ok mas", "demorou um pouco", "não muito",
-            "razoável", "aceitável", "satisfatória", "poderia ser mais",
-            "resultado final me deixou", "esperava mais",
-            "espero que melhorem", "funcionado bem",
-            "não conseguiu solucionar", "tentou várias", "ao final",
-            "agradeço pelo esforço", "infelizmente não conseguiu"
-        ]
+    def __init__(self, backend: Optional[ClassifierBackend] = None):
+        self.backend = backend or create_backend(CLASSIFIER_BACKEND)
+        if not self.backend.loaded:
+            self.backend.load()
+
+        # Sem lematização o spaCy nem é importado.
+        self.lemmatizer = (
+            Lemmatizer(
+                SPACY_MODEL,
+                batch_size=LEMMATIZER_BATCH_SIZE,
+                n_process=LEMMATIZER_N_PROCESS,
+                cache_size=LEMMATIZER_CACHE_SIZE,
+            )
+            if CLASSIFIER_LEMMATIZE
+            else None
+        )
+        self.nlp = self.lemmatizer.nlp if self.lemmatizer else None
+
+        self.rules_path = CLASSIFIER_RULES_PATH or DEFAULT_RULES_PATH
+        self._rules_lock = threading.Lock()
+        self._rules_reloads = 0
+        rules = self.build_rules(load_rules_config(self.rules_path))
+        # Regras em uso e a versão do classificador derivada delas, trocadas
+        # juntas em uma única atribuição por `reload_rules`.
+        self._active: Tuple[RuleSet, str] = (
+            rules, self.compute_version(rules)
+        )
 
-        self.weakening_words = [
-            "um pouco", "meio", "mais ou menos", "razoável", "aceitável", "ok",
-            "regular", "satisfatório", "mediano", "comum", "normal", "padrão",
-            "básico", "no geral"
-        ]
+        self._stats_lock = threading.Lock()
+        self._fast_path_count = 0
+        self._model_path_count = 0
+        self._long_text_count = 0
+        self._truncated_count = 0
+        self._latency: Dict[str, List[float]] = {}
+
+        self.cache = ClassificationCache(
+            self.version,
+            CLASSIFICATION_CACHE_SIZE,
+            build_cache_backend(
+                CLASSIFICATION_CACHE_BACKEND,
+                CLASSIFICATION_CACHE_URL,
+                CLASSIFICATION_CACHE_TTL,
+            ),
+        )
 
-        self.negations = [
-            "não", "nunca", "jamais", "nada", "nenhum", "nem", "tampouco",
-            "sequer", "infelizmente"
-        ]
+    @property
+    def rules(self) -> RuleSet:
+        """Regras heurísticas em uso."""
+        return self._active[0]
+
+    @property
+    def version(self) -> str:
+        """Versão do classificador usada nas chaves do cache."""
+        return self._active[1]
+
+    very_positive = _lexicon("very_positive")
+    very_negative = _lexicon("very_negative")
+    neutral_indicators = _lexicon("neutral_indicators")
+    weakening_words = _lexicon("weakening_words")
+    negations = _lexicon("negations")
+    contradiction_words = _lexicon("contradiction_words")
+
+    @property
+    def neutral_patterns(self) -> List[Tuple[str, ...]]:
+        """Padrões de neutralidade das regras em uso."""
+        return self.rules.neutral_patterns
+
+    @property
+    def matcher(self) -> LexiconMatcher:
+        """Matcher de léxicos das regras em uso."""
+        return self.rules.matcher
+
+    @property
+    def neutral_matcher(self) -> KeywordSequenceMatcher:
+        """Matcher dos padrões de neutralidade das regras em uso."""
+        return self.rules.neutral_matcher
+
+    def build_rules(self, config: Dict[str, Any]) -> RuleSet:
+        """Constrói um `RuleSet`, pré-compilando os matchers, a partir das
+        regras já validadas."""
+        return RuleSet(
+            config,
+            self.lemmatizer.lemmatize_many if self.lemmatizer else None,
+            NEUTRAL_PATTERN_MAX_GAP or None,
+        )
 
-        self.neutral_patterns = [
-            r"educado.*mas.*não conseguiu",
-            r"respeitoso.*mas.*infelizmente",
-            r"tentou.*mas.*não.*solução",
-            r"esforço.*mas.*resultado.*frustrado",
-            r"funcionado bem.*mas.*não.*eficiente",
-            r"poderia ser.*mais.*detalhado",
-            r"satisfatória.*mas.*poderia.*completa"
-        ]
+    def compute_version(self, rules: RuleSet) -> str:
+        """Calcula a versão do classificador a partir do modelo e das regras.
+
+        Args:
+            rules (RuleSet): Regras para as quais a versão é calculada.
+
+        Returns:
+            str: Hash curto que muda sempre que o modelo, a árvore de
+            decisão ou o conteúdo do arquivo de regras forem alterados.
+        """
+        payload = json.dumps(
+            {
+                "model": MODEL_NAME,
+                "backend": self.backend.name,
+                "lemmatizer": SPACY_MODEL if self.lemmatizer else None,
+                "rules": RULES_VERSION,
+                "long_text_chars": CLASSIFIER_LONG_TEXT_CHARS,
+                "max_tokens_per_review": CLASSIFIER_MAX_TOKENS_PER_REVIEW,
+                "lexicon_version": rules.version,
+                "lexicon_digest": rules.digest,
+                "neutral_pattern_max_gap": NEUTRAL_PATTERN_MAX_GAP,
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+    def reload_rules(self, path: Optional[str] = None) -> Dict[str, Any]:
+        """Relê o arquivo de regras e troca as regras em uso, sem recarregar
+        o modelo.
+
+        Os matchers são construídos na thread que chama este método; as
+        classificações em andamento terminam com as regras anteriores.
+        Como a versão do classificador muda junto, as entradas do cache
+        calculadas com as regras anteriores deixam de ser usadas.
+
+        Args:
+            path (Optional[str]): Novo arquivo de regras. Mantém o atual se
+                omitido.
+
+        Returns:
+            Dict[str, Any]: Informações das regras em uso após a recarga,
+            com "reloaded" False se o conteúdo não mudou.
+
+        Raises:
+            OSError: Se o arquivo não puder ser lido.
+            ValueError: Se o arquivo for inválido. As regras em uso são
+                mantidas.
+        """
+        with self._rules_lock:
+            path = path or self.rules_path
+            config = load_rules_config(path)
+            reloaded = rules_digest(config) != self.rules.digest
+            if reloaded:
+                rules = self.build_rules(config)
+                version = self.compute_version(rules)
+                self._active = (rules, version)
+                self.cache.version = version
+                self._rules_reloads += 1
+                logger.info(
+                    "Regras recarregadas: versão %s (%s).",
+                    rules.version, rules.digest,
+                )
+            self.rules_path = path
+        return {**self.get_rules_info(), "reloaded": reloaded}
+
+    def get_rules_info(self) -> Dict[str, Any]:
+        """Retorna a versão, o hash e a origem das regras em uso.
+
+        Returns:
+            Dict[str, Any]: Versão declarada no arquivo ("version"), hash do
+            conteúdo ("digest"), caminho do arquivo, instante da carga,
+            quantidade de recargas e a versão do classificador usada nas
+            chaves do cache.
+        """
+        rules, version = self._active
+        return {
+            "version": rules.version,
+            "digest": rules.digest,
+            "path": self.rules_path,
+            "loaded_at": rules.loaded_at,
+            "reloads": self._rules_reloads,
+            "classifier_version": version,
+        }
 
     def preprocess_text(self, text: str) -> str:
-        """Pré-processa o texto aplicando normalização e lematização."""
+        """Pré-processa o texto aplicando normalização e lematização.
+
+        Requer `CLASSIFIER_LEMMATIZE` habilitado.
+        """
+        if self.nlp is None:
+            raise RuntimeError("Lematização desabilitada.")
         text = unidecode(text.lower())
         doc = self.nlp(text)
         tokens = [
@@ -89,107 +285,429 @@ class SentimentClassifier:
         ]
         return " ".join(tokens)
 
-    def count_matches(self, text: str, patterns: List[str]) -> int:
-        """Conta quantas expressões da lista estão presentes no texto."""
-        text = unidecode(text.lower())
-        count = 0
-        for pattern in patterns:
-            words = unidecode(pattern.lower()).split()
-            if all(word in text for word in words):
-                count += 1
-        return count
-
-    def has_contradiction(self, text: str) -> bool:
-        """Verifica se há palavras de contradição no texto."""
-        contradiction_words = [
-            "mas", "porém", "contudo", "entretanto", "no entanto", "apesar"
-        ]
-        text = unidecode(text.lower())
-        return any(word in text for word in contradiction_words)
-
     def matches_neutral_pattern(self, text: str) -> bool:
         """Verifica se o texto corresponde a padrões específicos de
         neutralidade."""
-        text = unidecode(text.lower())
-        return any(re.search(pattern, text) for pattern in self.neutral_patterns)  # noqa: E501
+        return self.neutral_matcher.match(normalize_text(text))
+
+    def analyze_heuristics(
+        self,
+        text: str,
+        lemmas: Optional[str] = None,
+        rules: Optional[RuleSet] = None,
+    ) -> Dict[str, float]:
+        """Executa apenas as análises heurísticas (sem modelo) sobre o texto.
+
+        O texto é normalizado uma única vez e os léxicos são contados em
+        uma só varredura pelo `LexiconMatcher` pré-compilado das regras.
+
+        Args:
+            text (str): Texto da avaliação.
+            lemmas (Optional[str]): Lemas já calculados do texto. Se
+                omitidos e a lematização estiver habilitada, são calculados
+                aqui.
+            rules (Optional[RuleSet]): Regras a aplicar. Usa as regras em
+                uso se omitidas.
+        """
+        rules = rules or self.rules
+        if lemmas is None and self.lemmatizer:
+            lemmas = self.lemmatizer.lemmatize(text)
+        normalized = normalize_text(text)
+        analysis = rules.matcher.match(normalized, lemmas)
+        analysis["matches_neutral_pattern"] = rules.neutral_matcher.match(
+            normalized
+        )
+        return analysis
+
+    def predict_model(
+        self,
+        texts: List[str],
+        mini_batch_size: Optional[int] = None,
+    ) -> List[Tuple[str, float]]:
+        """Executa o backend de inferência sobre vários textos de uma vez.
+
+        O rótulo e a confiança retornados alimentam as chaves
+        "flair_label" e "flair_confidence" da análise, qualquer que seja o
+        backend configurado.
+
+        Args:
+            texts (List[str]): Textos a serem classificados pelo modelo.
+            mini_batch_size (Optional[int]): Tamanho dos mini-lotes usados
+                pelo modelo. Usa `CLASSIFIER_MINI_BATCH_SIZE` se omitido.
+
+        Returns:
+            List[Tuple[str, float]]: Rótulo e confiança do modelo para cada
+            texto, na mesma ordem da entrada.
+        """
+        return self.backend.predict(texts, mini_batch_size)
+
+    def prepare_text(self, text: str) -> List[str]:
+        """Prepara o texto para o modelo.
+
+        Textos curtos são pontuados inteiros. Textos longos (mais de
+        `CLASSIFIER_LONG_TEXT_CHARS` caracteres ou de
+        `CLASSIFIER_MAX_TOKENS_PER_REVIEW` tokens) são divididos em
+        sentenças e só as iniciais que cabem no orçamento de tokens são
+        pontuadas. As heurísticas sempre analisam o texto inteiro.
+
+        Args:
+            text (str): Texto da avaliação.
+
+        Returns:
+            List[str]: Entradas a serem pontuadas pelo modelo.
+        """
+        if (
+            len(text) <= CLASSIFIER_LONG_TEXT_CHARS
+            and count_tokens(text) <= CLASSIFIER_MAX_TOKENS_PER_REVIEW
+        ):
+            return [text]
+
+        sentences, end = fit_to_budget(text, CLASSIFIER_MAX_TOKENS_PER_REVIEW)  # noqa: E501
+        with self._stats_lock:
+            self._long_text_count += 1
+            if text[end:].strip():
+                self._truncated_count += 1
+        return sentences
+
+    def score_prepared(
+        self,
+        inputs: List[List[str]],
+        mini_batch_size: Optional[int] = None,
+    ) -> List[Tuple[str, float]]:
+        """Pontua as entradas de vários textos em uma única chamada ao
+        modelo e agrega as sentenças de cada texto com
+        `aggregate_predictions`.
+
+        Args:
+            inputs (List[List[str]]): Entradas de cada texto, como
+                retornadas por `prepare_text`.
+            mini_batch_size (Optional[int]): Tamanho dos mini-lotes usados
+                pelo modelo.
+
+        Returns:
+            List[Tuple[str, float]]: Rótulo e confiança de cada texto.
+        """
+        flat = [sentence for sentences in inputs for sentence in sentences]
+        predictions = self.predict_model(flat, mini_batch_size)
+
+        scores = []
+        offset = 0
+        for sentences in inputs:
+            scores.append(
+                aggregate_predictions(
+                    predictions[offset:offset + len(sentences)],
+                    [count_tokens(sentence) for sentence in sentences],
+                )
+            )
+            offset += len(sentences)
+        return scores
 
     def analyze_sentiment_strength(self, text: str) -> Dict[str, float]:
         """Executa todas as análises heurísticas e de modelo sobre o texto."""
-        very_pos = self.count_matches(text, self.very_positive)
-        very_neg = self.count_matches(text, self.very_negative)
-        neutral = self.count_matches(text, self.neutral_indicators)
-        weak = self.count_matches(text, self.weakening_words)
-        has_contra = self.has_contradiction(text)
-        is_neutral_pattern = self.matches_neutral_pattern(text)
-
-        sentence = Sentence(text)
-        self.classifier.predict(sentence)
-        flair_label = sentence.labels[0].value.lower()
-        flair_conf = sentence.labels[0].score
-
-        return {
-            "very_positive": very_pos,
-            "very_negative": very_neg,
-            "neutral_indicators": neutral,
-            "weakening_words": weak,
-            "has_contradiction": has_contra,
-            "matches_neutral_pattern": is_neutral_pattern,
-            "flair_label": flair_label,
-            "flair_confidence": flair_conf,
-        }
+        inputs = self.prepare_text(text)
+        analysis = self.analyze_heuristics(text)
+        [(flair_label, flair_conf)] = self.score_prepared([inputs])
+        analysis["flair_label"] = flair_label
+        analysis["flair_confidence"] = flair_conf
+        return analysis
 
     def classify_sentiment(self, text: str) -> str:
-        """Classifica o sentimento com base em heurísticas e modelo."""
-        a = self.analyze_sentiment_strength(text)
+        """Classifica o sentimento com base em heurísticas e modelo.
+
+        O resultado é buscado primeiro no cache. O modelo Flair só é
+        executado quando as regras heurísticas não são suficientes para
+        decidir o sentimento.
+        """
+        rules, version = self._active
+        sentiment = self.cache.get(text, version)
+        if sentiment is None:
+            [sentiment] = self._classify_uncached([text], rules=rules)
+            self.cache.set(text, sentiment, version)
+        return sentiment
+
+    def classify_batch(
+        self,
+        texts: List[str],
+        mini_batch_size: Optional[int] = None,
+        check_cache: bool = True,
+    ) -> List[str]:
+        """Classifica vários textos com uma única passada em lote do Flair.
+
+        Textos em cache ou repetidos no lote não são reclassificados, e
+        apenas os textos que as regras heurísticas não decidem são enviados
+        ao modelo. O lote inteiro usa as regras em uso no seu início, mesmo
+        que elas sejam recarregadas durante a classificação.
+
+        Args:
+            texts (List[str]): Textos das avaliações.
+            mini_batch_size (Optional[int]): Tamanho dos mini-lotes usados
+                pelo Flair. Usa `CLASSIFIER_MINI_BATCH_SIZE` se omitido.
+            check_cache (bool): Se False, não consulta o cache antes de
+                classificar, para chamadores que já o consultaram. Os
+                resultados são armazenados no cache em qualquer caso.
+
+        Returns:
+            List[str]: Sentimento de cada texto, na mesma ordem da entrada.
+        """
+        rules, version = self._active
+        results: List[Optional[str]] = [
+            self.cache.get(text, version) if check_cache else None
+            for text in texts
+        ]
+
+        misses: Dict[str, List[int]] = {}
+        for i, result in enumerate(results):
+            if result is None:
+                misses.setdefault(texts[i], []).append(i)
+
+        sentiments = self._classify_uncached(
+            list(misses), mini_batch_size, rules
+        )
+        for (text, indexes), sentiment in zip(misses.items(), sentiments):
+            self.cache.set(text, sentiment, version)
+            for i in indexes:
+                results[i] = sentiment
+        return results
+
+    def _classify_uncached(
+        self,
+        texts: List[str],
+        mini_batch_size: Optional[int] = None,
+        rules: Optional[RuleSet] = None,
+    ) -> List[str]:
+        """Classifica os textos sem consultar o cache, executando o modelo
+        apenas para os que as regras não decidem.
+
+        As sentenças de todos os textos longos pendentes vão ao modelo na
+        mesma chamada em lote dos textos curtos.
+        """
+        rules = rules or self.rules
+        start = time.perf_counter()
+        prepared = [self.prepare_text(text) for text in texts]
+        checkpoint = _observe_stage("prepare", start)
+
+        lemmas = (
+            self.lemmatizer.lemmatize_many(texts)
+            if self.lemmatizer
+            else [None] * len(texts)
+        )
+        checkpoint = _observe_stage("lemmatize", checkpoint)
+
+        analyses = [
+            self.analyze_heuristics(text, text_lemmas, rules)
+            for text, text_lemmas in zip(texts, lemmas)
+        ]
+        results = [
+            self.decide_by_rules(analysis, rules) for analysis in analyses
+        ]
+        checkpoint = _observe_stage("heuristics", checkpoint)
+
+        pending = [i for i, result in enumerate(results) if result is None]
+        if pending:
+            predictions = self.score_prepared(
+                [prepared[i] for i in pending], mini_batch_size
+            )
+            for i, (flair_label, flair_conf) in zip(pending, predictions):
+                analyses[i]["flair_label"] = flair_label
+                analyses[i]["flair_confidence"] = flair_conf
+                results[i] = self.decide_with_model(analyses[i], rules)
+            _observe_stage("model", checkpoint)
+
+        self._record_paths(
+            fast_path=len(texts) - len(pending),
+            model_path=len(pending),
+        )
+        elapsed = time.perf_counter() - start
+        CLASSIFIER_STAGE_SECONDS.labels("total").observe(elapsed)
+        self._record_latency(
+            texts, [count_tokens(text) for text in texts], elapsed
+        )
+        model_path = set(pending)
+        for i, sentiment in enumerate(results):
+            CLASSIFICATIONS.labels(
+                sentiment, "model" if i in model_path else "rules"
+            ).inc()
+        return results
+
+    def _record_paths(self, fast_path: int = 0, model_path: int = 0):
+        """Contabiliza classificações decididas com e sem o modelo."""
+        with self._stats_lock:
+            self._fast_path_count += fast_path
+            self._model_path_count += model_path
+
+    def _record_latency(
+        self,
+        texts: List[str],
+        tokens: List[int],
+        elapsed: float,
+    ):
+        """Contabiliza a latência de classificação por faixa de tamanho.
+
+        Em lotes, o tempo total é rateado entre os textos pelo número de
+        tokens analisados de cada um.
+        """
+        total_tokens = sum(max(count, 1) for count in tokens)
+        with self._stats_lock:
+            for text, count in zip(texts, tokens):
+                seconds = elapsed * max(count, 1) / total_tokens
+                bucket = self._latency.setdefault(
+                    length_bucket(len(text)), [0, 0.0, 0.0]
+                )
+                bucket[0] += 1
+                bucket[1] += seconds
+                bucket[2] = max(bucket[2], seconds)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna os contadores de classificação por caminho de decisão.
+
+        Returns:
+            Dict[str, Any]: Total classificado, quantidade decidida só
+            pelas regras ("fast_path"), quantidade que executou o modelo
+            ("model_path"), a fração do caminho rápido, textos tratados no
+            modo de textos longos e quantos deles foram cortados pelo
+            orçamento de tokens, a latência média e máxima por faixa de
+            tamanho e, com a lematização habilitada, os contadores do cache
+            de lemas.
+        """
+        with self._stats_lock:
+            fast_path = self._fast_path_count
+            model_path = self._model_path_count
+            long_texts = self._long_text_count
+            truncated = self._truncated_count
+            latency = {
+                bucket: {
+                    "count": count,
+                    "average_seconds": total / count,
+                    "max_seconds": slowest,
+                }
+                for bucket, (count, total, slowest) in self._latency.items()
+            }
+
+        total = fast_path + model_path
+        stats = {
+            "classified": total,
+            "fast_path": fast_path,
+            "model_path": model_path,
+            "fast_path_ratio": fast_path / total if total else 0.0,
+            "long_texts": long_texts,
+            "truncated_texts": truncated,
+            "latency_by_length": latency,
+        }
+        if self.lemmatizer:
+            stats["lemmatizer"] = self.lemmatizer.get_stats()
+        return stats
+
+    def decide(
+        self,
+        a: Dict[str, float],
+        rules: Optional[RuleSet] = None,
+    ) -> str:
+        """Aplica a árvore de decisão sobre o resultado das análises."""
+        rules = rules or self.rules
+        sentiment = self.decide_by_rules(a, rules)
+        if sentiment is not None:
+            return sentiment
+        return self.decide_with_model(a, rules)
+
+    def decide_by_rules(
+        self,
+        a: Dict[str, float],
+        rules: Optional[RuleSet] = None,
+    ) -> Optional[str]:
+        """Aplica os ramos da árvore de decisão que não dependem do modelo.
+
+        Args:
+            a (Dict[str, float]): Resultado das análises heurísticas.
+            rules (Optional[RuleSet]): Regras cujos limiares são usados.
+                Usa as regras em uso se omitidas.
+
+        Returns:
+            Optional[str]: Sentimento decidido, ou None se for necessário
+            consultar o modelo Flair.
+        """
+        t = (rules or self.rules).thresholds
 
         if a["matches_neutral_pattern"]:
             return SentimentsEnum.NEUTRAL.value
 
-        if a["very_negative"] >= 3:
+        if a["very_negative"] >= t["rules_strong_negative"]:
             return SentimentsEnum.NEGATIVE.value
 
-        if a["neutral_indicators"] >= 3 or (
-            a["has_contradiction"] and a["neutral_indicators"] >= 2
+        if a["neutral_indicators"] >= t["rules_neutral_indicators"] or (
+            a["has_contradiction"] and
+            a["neutral_indicators"] >= t["rules_neutral_indicators_with_contradiction"]  # noqa: E501
         ):
             return SentimentsEnum.NEUTRAL.value
 
-        if a["very_positive"] >= 2 and a["very_negative"] >= 1:
+        if (
+            a["very_positive"] >= t["rules_mixed_positive"] and
+            a["very_negative"] >= t["rules_mixed_negative"]
+        ):
             return SentimentsEnum.NEUTRAL.value
 
-        if a["weakening_words"] >= 2 and a["has_contradiction"]:
+        if (
+            a["weakening_words"] >= t["rules_weakening_with_contradiction"] and
+            a["has_contradiction"]
+        ):
             return SentimentsEnum.NEUTRAL.value
 
-        if a["very_negative"] >= 2 and a["very_positive"] == 0:
+        if a["very_negative"] >= t["rules_negative"] and a["very_positive"] == 0:  # noqa: E501
             return SentimentsEnum.NEGATIVE.value
 
-        if a["very_positive"] >= 3:
+        if a["very_positive"] >= t["rules_positive"]:
             return SentimentsEnum.POSITIVE.value
 
-        if a["has_contradiction"] and a["flair_confidence"] < 0.8:
+        return None
+
+    def decide_with_model(
+        self,
+        a: Dict[str, float],
+        rules: Optional[RuleSet] = None,
+    ) -> str:
+        """Aplica os ramos da árvore de decisão que usam o modelo Flair.
+
+        Args:
+            a (Dict[str, float]): Resultado das análises heurísticas e do
+                modelo.
+            rules (Optional[RuleSet]): Regras cujos limiares são usados.
+                Usa as regras em uso se omitidas.
+        """
+        t = (rules or self.rules).thresholds
+
+        if (
+            a["has_contradiction"] and
+            a["flair_confidence"] < t["model_contradiction_confidence"]
+        ):
             return SentimentsEnum.NEUTRAL.value
 
-        if a["flair_confidence"] >= 0.9 and not a["has_contradiction"]:
+        if (
+            a["flair_confidence"] >= t["model_high_confidence"] and
+            not a["has_contradiction"]
+        ):
             return (
                 SentimentsEnum.POSITIVE.value
                 if a["flair_label"] == "positive"
                 else SentimentsEnum.NEGATIVE.value
             )
 
-        if a["very_positive"] >= 2 and a["very_negative"] == 0 and not a["has_contradiction"]:  # noqa: E501
+        if a["very_positive"] >= t["model_lexicon_positive"] and a["very_negative"] == 0 and not a["has_contradiction"]:  # noqa: E501
             return SentimentsEnum.POSITIVE.value
 
-        if a["very_negative"] >= 1 and a["very_positive"] == 0 and not a["has_contradiction"]:  # noqa: E501
+        if a["very_negative"] >= t["model_lexicon_negative"] and a["very_positive"] == 0 and not a["has_contradiction"]:  # noqa: E501
             return SentimentsEnum.NEGATIVE.value
 
         if (
             a["very_positive"] >= 1 and
             a["very_negative"] == 0 and
-            a["flair_confidence"] >= 0.85 and
+            a["flair_confidence"] >= t["model_positive_confidence"] and
             not a["has_contradiction"]
         ):
             return SentimentsEnum.POSITIVE.value
 
-        if a["flair_confidence"] < 0.7 or a["has_contradiction"]:
+        if (
+            a["flair_confidence"] < t["model_low_confidence"] or
+            a["has_contradiction"]
+        ):
             return SentimentsEnum.NEUTRAL.value
 
         return (
@@ -199,10 +717,265 @@ class SentimentClassifier:
         )
 
 
-# Instância global
-sentiment_classifier = SentimentClassifier()
+# Instância global, criada sob demanda por `get_classifier`.
+_classifier: Optional[SentimentClassifier] = None
+_classifier_lock = threading.Lock()
+_scheduler: Optional[InferenceScheduler] = None
+_executor: Optional[ThreadPoolExecutor] = None
+_rules_watcher: Optional[RulesWatcher] = None
+_status: Dict[str, Optional[float]] = {
+    "load_seconds": None,
+    "warmup_seconds": None,
+    "first_request_seconds": None,
+}
+
+WARMUP_TEXT = "O atendimento foi rápido e resolveu o meu problema."
+
+
+def get_classifier() -> SentimentClassifier:
+    """Retorna o classificador global, carregando os modelos na primeira
+    chamada.
+
+    Returns:
+        SentimentClassifier: Instância compartilhada do classificador.
+    """
+    global _classifier
+    if _classifier is None:
+        with _classifier_lock:
+            if _classifier is None:
+                start = time.perf_counter()
+                _classifier = SentimentClassifier()
+                _status["load_seconds"] = time.perf_counter() - start
+                logger.info(
+                    "Classificador carregado em %.2fs.",
+                    _status["load_seconds"],
+                )
+    return _classifier
+
+
+def warmup_classifier():
+    """Carrega o classificador e executa uma inferência sobre texto fixo.
+
+    A inferência vai direto ao modelo, sem passar pelo cache, para que a
+    primeira requisição real não pague a inicialização preguiçosa do
+    PyTorch.
+    """
+    classifier = get_classifier()
+    start = time.perf_counter()
+    classifier.predict_model([WARMUP_TEXT])
+    _status["warmup_seconds"] = time.perf_counter() - start
+    logger.info("Classificador aquecido em %.2fs.", _status["warmup_seconds"])
+
+
+def is_classifier_ready() -> bool:
+    """Indica se o classificador já foi carregado e aquecido.
+
+    Sem `CLASSIFIER_PRELOAD`, o modelo só é carregado na primeira
+    requisição, então o worker está sempre pronto: esperar pela carga
+    impediria o tráfego que a dispara.
+    """
+    if not CLASSIFIER_PRELOAD:
+        return True
+    return _classifier is not None and _status["warmup_seconds"] is not None
+
+
+def get_classifier_status() -> Dict[str, Any]:
+    """Retorna o estado de prontidão e os tempos de inicialização.
+
+    Returns:
+        Dict[str, Any]: Flag "ready", os tempos, em segundos, de carga dos
+        modelos, do aquecimento e da primeira requisição atendida e, após a
+        carga, as métricas do backend de inferência, do classificador, do
+        cache, a versão das regras e, se em uso, do agendador.
+    """
+    status: Dict[str, Any] = {"ready": is_classifier_ready(), **_status}
+    if _classifier is not None:
+        status["rules"] = _classifier.get_rules_info()
+        status["backend"] = _classifier.backend.get_stats()
+        status["classifier"] = _classifier.get_stats()
+        status["cache"] = _classifier.cache.get_stats()
+    if _scheduler is not None:
+        status["scheduler"] = _scheduler.get_metrics()
+    return status
+
+
+def _record_first_request(start: float):
+    """Registra a latência da primeira classificação atendida."""
+    if _status["first_request_seconds"] is None:
+        _status["first_request_seconds"] = time.perf_counter() - start
+        logger.info(
+            "Primeira classificação atendida em %.3fs.",
+            _status["first_request_seconds"],
+        )
+
+
+def get_scheduler() -> InferenceScheduler:
+    """Retorna o agendador de micro-lotes global, criando-o se necessário.
+
+    Returns:
+        InferenceScheduler: Agendador que classifica os textos enfileirados
+        com `SentimentClassifier.classify_batch`.
+    """
+    global _scheduler
+    if _scheduler is None:
+        with _classifier_lock:
+            if _scheduler is None:
+                _scheduler = InferenceScheduler(
+                    lambda texts: get_classifier().classify_batch(
+                        texts, check_cache=False
+                    ),
+                    max_batch_size=SCHEDULER_MAX_BATCH_SIZE,
+                    max_wait_ms=SCHEDULER_MAX_WAIT_MS,
+                    max_queue_size=SCHEDULER_MAX_QUEUE_SIZE,
+                )
+    return _scheduler
 
 
 def classify_sentiment(text: str) -> str:
-    """Função auxiliar que delega ao classificador global."""
-    return sentiment_classifier.classify_sentiment(text)
+    """Função auxiliar que delega ao classificador global.
+
+    Com `SCHEDULER_ENABLED`, textos fora do cache são enfileirados no
+    agendador de micro-lotes e classificados junto com as requisições
+    concorrentes.
+
+    Raises:
+        SchedulerOverloadedError: Se a fila do agendador estiver cheia.
+    """
+    start = time.perf_counter()
+    classifier = get_classifier()
+    if SCHEDULER_ENABLED:
+        sentiment = classifier.cache.get(text)
+        if sentiment is None:
+            sentiment = get_scheduler().submit(text).result()
+    else:
+        sentiment = classifier.classify_sentiment(text)
+    _record_first_request(start)
+    return sentiment
+
+
+def classify_sentiment_batch(texts: List[str]) -> List[str]:
+    """Função auxiliar que classifica vários textos em lote."""
+    start = time.perf_counter()
+    sentiments = get_classifier().classify_batch(texts)
+    _record_first_request(start)
+    return sentiments
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Retorna o executor dedicado à classificação, criando-o se necessário.
+
+    Separado do threadpool do Starlette para que a inferência saturada não
+    ocupe as threads usadas pelo restante da aplicação.
+    """
+    global _executor
+    if _executor is None:
+        with _classifier_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=CLASSIFIER_EXECUTOR_WORKERS,
+                    thread_name_prefix="classifier",
+                )
+    return _executor
+
+
+def _cached_or_submit(text: str) -> Union[str, Future]:
+    """Retorna o sentimento em cache ou enfileira o texto no agendador."""
+    sentiment = get_classifier().cache.get(text)
+    if sentiment is not None:
+        return sentiment
+    return get_scheduler().submit(text)
+
+
+async def classify_sentiment_async(text: str) -> str:
+    """Versão assíncrona de `classify_sentiment` para o event loop.
+
+    A consulta ao cache roda no executor dedicado. Com `SCHEDULER_ENABLED`,
+    a espera pelo micro-lote não ocupa nenhuma thread; sem o agendador, a
+    classificação inteira roda no executor.
+
+    Raises:
+        SchedulerOverloadedError: Se a fila do agendador estiver cheia.
+    """
+    loop = asyncio.get_running_loop()
+    if not SCHEDULER_ENABLED:
+        return await loop.run_in_executor(
+            get_executor(), classify_sentiment, text
+        )
+
+    start = time.perf_counter()
+    result = await loop.run_in_executor(
+        get_executor(), _cached_or_submit, text
+    )
+    if isinstance(result, Future):
+        result = await asyncio.wrap_future(result)
+    _record_first_request(start)
+    return result
+
+
+async def classify_sentiment_batch_async(texts: List[str]) -> List[str]:
+    """Versão assíncrona de `classify_sentiment_batch`, executada no
+    executor dedicado."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_executor(), classify_sentiment_batch, texts
+    )
+
+
+def reload_rules() -> Dict[str, Any]:
+    """Recarrega as regras do classificador global, carregando-o se
+    necessário.
+
+    Raises:
+        OSError: Se o arquivo de regras não puder ser lido.
+        ValueError: Se o arquivo de regras for inválido.
+    """
+    return get_classifier().reload_rules()
+
+
+def _reload_loaded_rules():
+    """Recarrega as regras apenas se o classificador já foi carregado."""
+    if _classifier is not None:
+        _classifier.reload_rules()
+
+
+def start_rules_watcher():
+    """Inicia o monitoramento do arquivo de regras, se
+    `CLASSIFIER_RULES_WATCH_SECONDS` for maior que zero.
+
+    Deve ser chamado em cada worker, depois do fork, pois a thread não
+    sobrevive ao fork do processo mestre.
+    """
+    global _rules_watcher
+    if CLASSIFIER_RULES_WATCH_SECONDS <= 0:
+        return
+    with _classifier_lock:
+        if _rules_watcher is None:
+            _rules_watcher = RulesWatcher(
+                CLASSIFIER_RULES_PATH or DEFAULT_RULES_PATH,
+                _reload_loaded_rules,
+                CLASSIFIER_RULES_WATCH_SECONDS,
+            )
+            _rules_watcher.start()
+
+
+def shutdown_classifier():
+    """Encerra o agendador, o executor de classificação e o monitoramento
+    do arquivo de regras."""
+    global _scheduler, _executor, _rules_watcher
+    with _classifier_lock:
+        scheduler, _scheduler = _scheduler, None
+        executor, _executor = _executor, None
+        watcher, _rules_watcher = _rules_watcher, None
+    if watcher is not None:
+        watcher.stop()
+    if scheduler is not None:
+        scheduler.stop()
+    if executor is not None:
+        executor.shutdown(wait=True)
+
+
+def __getattr__(name: str):
+    """Mantém `sentiment_classifier` acessível, carregando-o sob demanda."""
+    if name == "sentiment_classifier":
+        return get_classifier()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
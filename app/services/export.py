@@ -0,0 +1,76 @@
+"""Serialização das avaliações lidas por colunas (`REVIEW_COLUMNS`): em
+blocos, na exportação, e em listas JSON, na listagem e na busca."""
+
+import csv
+import io
+from typing import Any, Callable, Dict, List, Sequence, Union
+
+import orjson
+from sqlalchemy import Row
+
+from app.schemas.review import ExportFormat
+
+EXPORT_FIELDS = (
+    "id",
+    "customer_name",
+    "review_text",
+    "evaluation_date",
+    "sentiment",
+)
+
+MEDIA_TYPES: Dict[ExportFormat, str] = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+}
+
+
+def _values(row: Row) -> tuple:
+    """Converte a data e o sentimento da linha para texto."""
+    review_id, customer_name, review_text, evaluation_date, sentiment = row
+    return (
+        review_id,
+        customer_name,
+        review_text,
+        evaluation_date.isoformat(),
+        sentiment.value,
+    )
+
+
+def as_dicts(rows: Sequence[Row]) -> List[Dict[str, Any]]:
+    """Converte as linhas em dicionários com os campos de `ReviewResponse`.
+
+    As datas e o sentimento são mantidos como objetos, que o orjson
+    serializa diretamente (data ISO e valor do enum), sem a validação do
+    Pydantic: as linhas vêm do banco e já têm os tipos do modelo.
+    """
+    return [dict(zip(EXPORT_FIELDS, row)) for row in rows]
+
+
+def format_ndjson(rows: Sequence[Row]) -> bytes:
+    """Serializa as linhas como JSON, um objeto por linha."""
+    return b"".join(
+        orjson.dumps(item, option=orjson.OPT_APPEND_NEWLINE)
+        for item in as_dicts(rows)
+    )
+
+
+def format_csv(rows: Sequence[Row]) -> str:
+    """Serializa as linhas como CSV, sem o cabeçalho."""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(_values(row) for row in rows)
+    return buffer.getvalue()
+
+
+def csv_header() -> str:
+    """Retorna a linha de cabeçalho do CSV."""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(EXPORT_FIELDS)
+    return buffer.getvalue()
+
+
+FORMATTERS: Dict[
+    ExportFormat, Callable[[Sequence[Row]], Union[str, bytes]]
+] = {
+    ExportFormat.NDJSON: format_ndjson,
+    ExportFormat.CSV: format_csv,
+}
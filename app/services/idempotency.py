@@ -0,0 +1,101 @@
+"""Idempotência da criação de avaliações: hash do conteúdo e execução
+única de operações simultâneas com a mesma chave."""
+
+import asyncio
+import hashlib
+from datetime import date
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+from app.services.cache import normalize_cache_text
+
+
+def review_content_hash(
+    customer_name: str, review_text: str, evaluation_date: date
+) -> str:
+    """Calcula o hash que identifica uma avaliação pelo seu conteúdo.
+
+    O texto é normalizado como na chave do cache de classificações, de
+    modo que reenvios que diferem só em espaçamento têm o mesmo hash.
+    A migração 0005 tem uma cópia deste cálculo; mudá-lo exige recalcular
+    os hashes já gravados.
+
+    Args:
+        customer_name (str): Nome do cliente.
+        review_text (str): Texto da avaliação.
+        evaluation_date (date): Data da avaliação.
+
+    Returns:
+        str: SHA-256 em hexadecimal (64 caracteres).
+    """
+    raw = "\x00".join((
+        customer_name.strip(),
+        normalize_cache_text(review_text),
+        evaluation_date.isoformat(),
+    ))
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class SingleFlight:
+    """Executa uma única vez as chamadas simultâneas com a mesma chave.
+
+    A primeira chamada de uma chave executa a função; as que chegam
+    enquanto ela está em andamento aguardam e recebem o mesmo resultado
+    (ou a mesma exceção). Se a primeira for cancelada, uma das que
+    aguardam executa a função no lugar dela. Vale para as corrotinas de
+    um event loop, ou seja, de um worker.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def run(
+        self, key: str, fn: Callable[[], Awaitable[Any]]
+    ) -> Tuple[Any, bool]:
+        """Executa `fn` ou aguarda a execução em andamento da chave.
+
+        Args:
+            key (str): Chave que identifica a operação.
+            fn (Callable[[], Awaitable[Any]]): Função assíncrona executada
+                se não houver outra em andamento para a chave.
+
+        Returns:
+            Tuple[Any, bool]: Resultado de `fn` e se ele foi compartilhado
+            por outra chamada, em vez de produzido por esta.
+        """
+        while True:
+            future = self._calls.get(key)
+            if future is None:
+                break
+            try:
+                # O cancelamento de quem aguarda não cancela a execução.
+                return await asyncio.shield(future), True
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # A execução foi cancelada, e não esta chamada: a primeira
+                # a chegar aqui passa a executar a função.
+
+        future = asyncio.get_running_loop().create_future()
+        # Marca a exceção como lida mesmo sem ninguém aguardando.
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._calls[key] = future
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            del self._calls[key]
+
+
+# Criações de avaliação em andamento no worker, pelo hash do conteúdo.
+review_flights = SingleFlight()
@@ -0,0 +1,99 @@
+"""Lematização em lote com spaCy para o casamento de léxicos."""
+
+import threading
+from typing import Dict, List, Optional
+
+from app.services.matcher import normalize_text
+
+# Componentes do pt_core_news_sm que não participam da lematização e por
+# isso nem são carregados.
+EXCLUDED_COMPONENTS = ["parser", "ner", "senter"]
+
+
+class Lemmatizer:
+    """Converte textos em uma sequência normalizada de lemas.
+
+    Os lemas de cada token já visto ficam em cache: se todos os tokens de
+    um texto estiverem no cache, o pipeline do spaCy nem é executado, só o
+    tokenizador. O lema guardado é o da primeira ocorrência do token, o
+    que ignora eventuais variações de contexto.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        batch_size: int = 64,
+        n_process: int = 1,
+        cache_size: int = 50000,
+    ):
+        # Importado aqui para que o spaCy só seja carregado se a
+        # lematização estiver habilitada.
+        import spacy
+
+        self.model_name = model_name
+        self.nlp = spacy.load(model_name, exclude=EXCLUDED_COMPONENTS)
+        self.batch_size = batch_size
+        self.n_process = n_process
+        self.cache_size = cache_size
+        self._cache: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._cached_texts = 0
+        self._processed_texts = 0
+
+    def lemmatize(self, text: str) -> str:
+        """Retorna os lemas normalizados do texto, separados por espaço."""
+        return self.lemmatize_many([text])[0]
+
+    def lemmatize_many(self, texts: List[str]) -> List[str]:
+        """Lematiza vários textos, processando com `nlp.pipe` apenas os que
+        têm tokens fora do cache.
+
+        Args:
+            texts (List[str]): Textos originais.
+
+        Returns:
+            List[str]: Lemas normalizados de cada texto, na mesma ordem.
+        """
+        tokenized = [
+            [token.text for token in self.nlp.tokenizer(text)]
+            for text in texts
+        ]
+
+        results: List[Optional[str]] = []
+        pending = []
+        with self._lock:
+            for i, tokens in enumerate(tokenized):
+                if all(token in self._cache for token in tokens):
+                    results.append(
+                        " ".join(self._cache[token] for token in tokens)
+                    )
+                else:
+                    results.append(None)
+                    pending.append(i)
+            self._cached_texts += len(texts) - len(pending)
+            self._processed_texts += len(pending)
+
+        docs = self.nlp.pipe(
+            [texts[i] for i in pending],
+            batch_size=self.batch_size,
+            n_process=self.n_process,
+        )
+        for i, doc in zip(pending, docs):
+            lemmas = [normalize_text(token.lemma_) for token in doc]
+            results[i] = " ".join(lemmas)
+            with self._lock:
+                for token, lemma in zip(doc, lemmas):
+                    if len(self._cache) >= self.cache_size:
+                        break
+                    self._cache.setdefault(token.text, lemma)
+        return results
+
+    def get_stats(self) -> Dict[str, int]:
+        """Retorna quantos textos foram resolvidos pelo cache de lemas e
+        quantos passaram pelo pipeline do spaCy."""
+        with self._lock:
+            return {
+                "cached_texts": self._cached_texts,
+                "processed_texts": self._processed_texts,
+                "cached_tokens": len(self._cache),
+            }
@@ -0,0 +1,95 @@
+"""Divisão de avaliações longas em sentenças dentro de um orçamento de
+tokens e agregação das pontuações do modelo por sentença."""
+
+import re
+from typing import List, Sequence, Tuple
+
+# Fim de sentença: pontuação final seguida de espaços, ou quebra de linha.
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?;])\s+|\n\s*")
+_TOKEN = re.compile(r"\S+")
+
+
+def count_tokens(text: str) -> int:
+    """Conta os tokens do texto, separados por espaços em branco."""
+    return len(text.split())
+
+
+def split_sentences(text: str) -> List[Tuple[int, int]]:
+    """Divide o texto em sentenças.
+
+    Args:
+        text (str): Texto original.
+
+    Returns:
+        List[Tuple[int, int]]: Início e fim de cada sentença não vazia no
+        texto original.
+    """
+    spans = []
+    start = 0
+    for boundary in _SENTENCE_BOUNDARY.finditer(text):
+        if text[start:boundary.start()].strip():
+            spans.append((start, boundary.start()))
+        start = boundary.end()
+    if text[start:].strip():
+        spans.append((start, len(text)))
+    return spans
+
+
+def fit_to_budget(text: str, max_tokens: int) -> Tuple[List[str], int]:
+    """Seleciona as sentenças iniciais do texto que cabem no orçamento.
+
+    As sentenças são consumidas em ordem; a primeira que não cabe inteira
+    é cortada no limite de tokens e as seguintes são descartadas.
+
+    Args:
+        text (str): Texto original.
+        max_tokens (int): Máximo de tokens somados entre as sentenças.
+
+    Returns:
+        Tuple[List[str], int]: Sentenças selecionadas e a posição do texto
+        original onde a seleção termina.
+    """
+    sentences = []
+    remaining = max_tokens
+    end = 0
+    for start, stop in split_sentences(text):
+        tokens = list(_TOKEN.finditer(text, start, stop))
+        if len(tokens) > remaining:
+            if remaining > 0:
+                end = tokens[remaining - 1].end()
+                sentences.append(text[start:end].strip())
+            break
+        sentences.append(text[start:stop].strip())
+        remaining -= len(tokens)
+        end = stop
+    return sentences, end
+
+
+def aggregate_predictions(
+    predictions: Sequence[Tuple[str, float]],
+    weights: Sequence[int],
+) -> Tuple[str, float]:
+    """Combina as pontuações das sentenças em uma pontuação do texto.
+
+    Cada sentença vale +confiança se "positive" e -confiança se
+    "negative". O escore do texto é a média desses valores ponderada pelo
+    número de tokens de cada sentença: o sinal define o rótulo (empate é
+    "positive", como no modelo) e o valor absoluto é a confiança. Sentenças
+    com polaridades opostas, portanto, reduzem a confiança, o que leva a
+    árvore de decisão ao neutro quando nenhuma polaridade predomina. Com uma
+    única sentença o resultado é a própria pontuação do modelo.
+
+    Args:
+        predictions (Sequence[Tuple[str, float]]): Rótulo e confiança de
+            cada sentença.
+        weights (Sequence[int]): Número de tokens de cada sentença.
+
+    Returns:
+        Tuple[str, float]: Rótulo e confiança agregados.
+    """
+    weights = [max(weight, 1) for weight in weights]
+    score = sum(
+        weight * (confidence if label == "positive" else -confidence)
+        for (label, confidence), weight in zip(predictions, weights)
+    ) / sum(weights)
+    return ("positive" if score >= 0 else "negative"), abs(score)
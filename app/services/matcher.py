@@ -0,0 +1,237 @@
+"""Casamento de léxicos em uma única varredura do texto normalizado."""
+
+import re
+from collections import deque
+from typing import (
+    Callable,
+    Deque,
+    Dict,
+    FrozenSet,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from unidecode import unidecode
+
+
+def normalize_text(text: str) -> str:
+    """Normaliza o texto para casamento: minúsculas e sem acentos."""
+    return unidecode(text.lower())
+
+
+def _padded(lemmas: str) -> Optional[str]:
+    """Junta os lemas com um espaço nas pontas, para que a busca de uma
+    sequência só case com tokens inteiros."""
+    tokens = lemmas.split()
+    return f" {' '.join(tokens)} " if tokens else None
+
+
+class LexiconMatcher:
+    """Conta expressões de vários léxicos com uma única varredura do texto.
+
+    Uma expressão casa quando cada uma das suas palavras normalizadas
+    aparece como substring em qualquer posição do texto normalizado, em
+    qualquer ordem; cada expressão conta no máximo uma vez. Um termo de
+    contradição casa quando aparece inteiro como substring do texto e é
+    comparado exatamente como recebido, sem normalização.
+
+    Com `lemmatize`, cada expressão também casa pelos lemas das suas
+    palavras quando o texto é acompanhado dos seus lemas, de modo que
+    flexões como "atencioso"/"atenciosa" casam com a mesma entrada. Os
+    lemas casam apenas como tokens inteiros e, nas expressões de várias
+    palavras, como a sequência contígua dos lemas: casar por substring,
+    como no texto, faria "primeiro" casar com "primeira".
+
+    Todas as palavras distintas são compiladas em uma única alternação
+    dentro de um lookahead, testada em cada posição do texto. Em cada
+    posição a alternação devolve o termo mais longo; os termos mais curtos
+    contidos nele são deduzidos a partir de uma tabela pré-calculada.
+    """
+
+    def __init__(
+        self,
+        lexicons: Dict[str, Sequence[str]],
+        contradiction_words: Sequence[str],
+        lemmatize: Optional[Callable[[List[str]], List[str]]] = None,
+    ):
+        # Cada entrada guarda as palavras normalizadas e, com `lemmatize`,
+        # a sequência dos seus lemas entre espaços, comparada com os lemas
+        # do texto também entre espaços.
+        self._entries: Dict[
+            str, List[Tuple[FrozenSet[str], Optional[str]]]
+        ] = {}
+        for name, phrases in lexicons.items():
+            lemmas = lemmatize(list(phrases)) if lemmatize else None
+            self._entries[name] = [
+                (
+                    frozenset(normalize_text(phrase).split()),
+                    _padded(lemmas[i]) if lemmas else None,
+                )
+                for i, phrase in enumerate(phrases)
+            ]
+        self._contradiction_words = frozenset(contradiction_words)
+
+        needles = set(self._contradiction_words)
+        for entries in self._entries.values():
+            for words, _ in entries:
+                needles.update(words)
+        needles.discard("")
+
+        self._implied: Dict[str, FrozenSet[str]] = {
+            needle: frozenset(other for other in needles if other in needle)
+            for needle in needles
+        }
+        self._pattern = (
+            re.compile(
+                "(?=("
+                + "|".join(
+                    re.escape(needle)
+                    for needle in sorted(needles, key=len, reverse=True)
+                )
+                + "))"
+            )
+            if needles
+            else None
+        )
+
+    def scan(self, normalized: str) -> FrozenSet[str]:
+        """Retorna todos os termos presentes no texto já normalizado."""
+        if self._pattern is None:
+            return frozenset()
+
+        found = set()
+        for longest in set(self._pattern.findall(normalized)):
+            found |= self._implied[longest]
+        return frozenset(found)
+
+    def match(
+        self,
+        normalized: str,
+        lemmas: Optional[str] = None,
+    ) -> Dict[str, Union[int, bool]]:
+        """Conta as expressões de cada léxico e verifica contradições.
+
+        Args:
+            normalized (str): Texto já normalizado com `normalize_text`.
+            lemmas (Optional[str]): Lemas normalizados do texto. Se
+                informados, as expressões também casam pelos seus lemas.
+
+        Returns:
+            Dict[str, Union[int, bool]]: Contagem por nome de léxico e a
+            chave "has_contradiction".
+        """
+        found = self.scan(normalized)
+        padded_lemmas = _padded(lemmas) if lemmas else None
+        result: Dict[str, Union[int, bool]] = {
+            name: sum(
+                1
+                for words, lemma_sequence in entries
+                if words <= found
+                or (
+                    padded_lemmas
+                    and lemma_sequence
+                    and lemma_sequence in padded_lemmas
+                )
+            )
+            for name, entries in self._entries.items()
+        }
+        result["has_contradiction"] = bool(self._contradiction_words & found)
+        return result
+
+
+class KeywordSequenceMatcher:
+    """Detecta sequências ordenadas de termos em uma única varredura.
+
+    Cada padrão é uma sequência de termos que devem aparecer nessa ordem,
+    sem sobreposição e na mesma linha, como o regex "a.*b.*c"
+    equivalente, mas sem retrocesso: o texto é percorrido uma vez com a
+    mesma alternação em lookahead do `LexiconMatcher`, e cada ocorrência
+    de termo avança o estado dos padrões que a esperam. Quebras de linha
+    reiniciam todos os estados.
+
+    Com `max_gap`, cada termo deve começar no máximo `max_gap` caracteres
+    após o fim do termo anterior. Os termos são comparados exatamente como
+    recebidos.
+    """
+
+    def __init__(
+        self,
+        patterns: Sequence[Sequence[str]],
+        max_gap: Optional[int] = None,
+    ):
+        self.patterns = [tuple(pattern) for pattern in patterns if pattern]
+        self.max_gap = max_gap
+
+        terms = sorted(
+            {term for pattern in self.patterns for term in pattern},
+            key=len,
+            reverse=True,
+        )
+        # Termos que são prefixos de outros começam na mesma posição e não
+        # são devolvidos pela alternação, que devolve o mais longo.
+        self._prefixes: Dict[str, List[str]] = {
+            term: [other for other in terms if term.startswith(other)]
+            for term in terms
+        }
+        self._stages: Dict[str, List[Tuple[int, int]]] = {
+            term: [
+                (i, k)
+                for i, pattern in enumerate(self.patterns)
+                for k, other in enumerate(pattern)
+                if other == term
+            ]
+            for term in terms
+        }
+        self._pattern = (
+            re.compile(
+                "(?=("
+                + "|".join(re.escape(term) for term in terms)
+                + "|\n))"
+            )
+            if terms
+            else None
+        )
+
+    def match(self, normalized: str) -> bool:
+        """Indica se algum padrão ocorre no texto já normalizado."""
+        if self._pattern is None:
+            return False
+
+        # Posições finais, em ordem crescente, das cadeias parciais que
+        # terminam em cada (padrão, estágio), criadas sob demanda.
+        ends: Dict[Tuple[int, int], Deque[int]] = {}
+        for found in self._pattern.finditer(normalized):
+            longest = found.group(1)
+            if longest == "\n":
+                ends.clear()
+                continue
+
+            start = found.start()
+            for term in self._prefixes[longest]:
+                for i, k in self._stages[term]:
+                    if k and not self._chain_reaches(ends.get((i, k - 1)), start):  # noqa: E501
+                        continue
+                    if k == len(self.patterns[i]) - 1:
+                        return True
+                    chain = ends.setdefault((i, k), deque())
+                    if self.max_gap is not None or not chain:
+                        chain.append(start + len(term))
+        return False
+
+    def _chain_reaches(self, ends: Optional[Deque[int]], start: int) -> bool:
+        """Indica se alguma cadeia parcial termina antes de `start` e
+        dentro de `max_gap`.
+
+        Sem `max_gap`, basta a cadeia que termina primeiro, a única
+        guardada. Com `max_gap`, as cadeias que ficaram longe demais são
+        descartadas, pois as ocorrências seguintes começam ainda depois.
+        """
+        if not ends:
+            return False
+        if self.max_gap is not None:
+            while ends and ends[0] < start - self.max_gap:
+                ends.popleft()
+        return bool(ends) and ends[0] <= start
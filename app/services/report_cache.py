@@ -0,0 +1,235 @@
+"""Cache do relatório de sentimentos em blocos por dia.
+
+O relatório de um intervalo é a soma das contagens diárias. Como quase
+todas as avaliações novas caem em datas recentes, as contagens de dias
+antigos raramente mudam: cada dia é guardado em memória e só é
+descartado quando uma avaliação com aquela `evaluation_date` é criada
+neste worker, ou quando passa de `ttl_seconds`, o que limita por quanto
+tempo um worker pode ignorar inserções feitas pelos demais. Um dia
+invalidado há menos de `grace_seconds` é lido do banco mas não guardado,
+já que a réplica de leitura pode ainda não ter a inserção. Intervalos
+com mais dias do que cabem no cache são somados direto no banco, sem
+percorrer os dias.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, timedelta
+from typing import Awaitable, Callable, Dict, Iterable, List, Tuple
+
+from app.config import (
+    REPORT_CACHE_GRACE_SECONDS,
+    REPORT_CACHE_MAX_DAYS,
+    REPORT_CACHE_TTL_SECONDS,
+)
+from app.schemas.review import SentimentsEnum
+
+# Lê as contagens por sentimento de cada data de um intervalo; datas sem
+# avaliações podem ser omitidas.
+DailyCountsLoader = Callable[[date, date], Awaitable[Dict[date, Dict[str, int]]]]  # noqa: E501
+# Soma, no banco, as contagens por sentimento de um intervalo.
+TotalsLoader = Callable[[date, date], Awaitable[Dict[str, int]]]
+
+
+def empty_counts() -> Dict[str, int]:
+    """Contagem zerada de cada sentimento."""
+    return {sentiment.value: 0 for sentiment in SentimentsEnum}
+
+
+class ReportCache:
+    """Contagens diárias por sentimento, com camada LRU em memória.
+
+    Um relatório soma os dias em cache e busca os dias ausentes, expirados
+    ou invalidados em uma única consulta, do menor ao maior deles. Um
+    intervalo maior que `max_days` não passa pelo cache.
+    """
+
+    def __init__(
+        self,
+        max_days: int,
+        ttl_seconds: float = 0,
+        grace_seconds: float = 0,
+    ):
+        """
+        Args:
+            max_days (int): Quantidade máxima de dias em memória (0
+                desativa o cache).
+            ttl_seconds (float): Idade máxima de um dia em cache (0 = sem
+                expiração).
+            grace_seconds (float): Tempo, após a invalidação, em que um
+                dia não volta ao cache.
+        """
+        self.max_days = max_days
+        self.ttl_seconds = ttl_seconds
+        self.grace_seconds = grace_seconds
+        self._days: "OrderedDict[date, Tuple[Dict[str, int], float]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        # Invalidações feitas enquanto há consultas em andamento, para que
+        # o resultado de uma consulta iniciada antes de uma inserção não
+        # seja guardado como atual.
+        self._generation = 0
+        self._cleared = 0
+        self._invalidated: Dict[date, int] = {}
+        # Momento da última invalidação dos dias ainda na carência.
+        self._recent: Dict[date, float] = {}
+        self._loading = 0
+        self._hits = 0
+        self._misses = 0
+        self._queries = 0
+        self._invalidations = 0
+
+    def _is_fresh(self, loaded_at: float, now: float) -> bool:
+        return self.ttl_seconds <= 0 or now - loaded_at < self.ttl_seconds
+
+    async def get_report(
+        self,
+        start_date: date,
+        end_date: date,
+        load: DailyCountsLoader,
+        load_totals: TotalsLoader,
+    ) -> Dict[str, int]:
+        """Soma as contagens de sentimento do intervalo.
+
+        Args:
+            start_date (date): Data inicial do período.
+            end_date (date): Data final do período.
+            load (DailyCountsLoader): Função que lê as contagens diárias
+                do banco, chamada no máximo uma vez.
+            load_totals (TotalsLoader): Função que soma o intervalo no
+                banco, usada no lugar de `load` quando ele tem mais dias
+                do que `max_days`.
+
+        Returns:
+            Dict[str, int]: Dict com chaves "positive", "neutral" e
+            "negative".
+        """
+        days = (end_date - start_date).days + 1
+        if days > self.max_days:
+            with self._lock:
+                self._queries += 1
+            return await load_totals(start_date, end_date)
+
+        totals = empty_counts()
+        missing: List[date] = []
+
+        now = time.monotonic()
+        with self._lock:
+            for offset in range(days):
+                day = start_date + timedelta(days=offset)
+                entry = self._days.get(day)
+                if entry is None or not self._is_fresh(entry[1], now):
+                    missing.append(day)
+                    continue
+                self._days.move_to_end(day)
+                for sentiment, count in entry[0].items():
+                    totals[sentiment] += count
+            self._hits += days - len(missing)
+            self._misses += len(missing)
+            if not missing:
+                return totals
+            self._queries += 1
+            self._loading += 1
+            generation = self._generation
+
+        try:
+            loaded = await load(missing[0], missing[-1])
+        except BaseException:
+            with self._lock:
+                self._finish_loading()
+            raise
+
+        loaded_at = time.monotonic()
+        with self._lock:
+            store = generation >= self._cleared
+            for day in missing:
+                counts = loaded.get(day) or empty_counts()
+                for sentiment, count in counts.items():
+                    totals[sentiment] += count
+                if (
+                    store
+                    and self._invalidated.get(day, -1) < generation
+                    and not self._in_grace(day, loaded_at)
+                ):
+                    self._store(day, counts, loaded_at)
+            self._finish_loading()
+        return totals
+
+    def _in_grace(self, day: date, now: float) -> bool:
+        invalidated_at = self._recent.get(day)
+        return (
+            invalidated_at is not None
+            and now - invalidated_at < self.grace_seconds
+        )
+
+    def _store(self, day: date, counts: Dict[str, int], loaded_at: float):
+        """Insere o dia na camada LRU, removendo o menos usado se cheia."""
+        if self.max_days <= 0:
+            return
+        self._days[day] = (counts, loaded_at)
+        self._days.move_to_end(day)
+        while len(self._days) > self.max_days:
+            self._days.popitem(last=False)
+
+    def _finish_loading(self):
+        self._loading -= 1
+        if not self._loading:
+            self._invalidated.clear()
+
+    def invalidate(self, dates: Iterable[date]):
+        """Descarta os dias das avaliações recém-criadas.
+
+        Deve ser chamada depois do commit das inserções.
+
+        Args:
+            dates (Iterable[date]): `evaluation_date` de cada avaliação.
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._generation += 1
+            self._recent = {
+                day: invalidated_at
+                for day, invalidated_at in self._recent.items()
+                if self._in_grace(day, now)
+            }
+            for day in set(dates):
+                self._invalidations += 1
+                self._days.pop(day, None)
+                if self._loading:
+                    self._invalidated[day] = self._generation
+                if self.grace_seconds > 0:
+                    self._recent[day] = now
+
+    def clear(self):
+        """Remove todos os dias em cache."""
+        with self._lock:
+            self._generation += 1
+            self._cleared = self._generation
+            self._days.clear()
+            self._recent.clear()
+
+    def get_stats(self) -> Dict[str, float]:
+        """Retorna os contadores de uso do cache.
+
+        Returns:
+            Dict[str, float]: Dias servidos da memória ("hits") e lidos do
+            banco ("misses"), consultas feitas, dias invalidados, dias em
+            cache e taxa de acerto por dia.
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "queries": self._queries,
+                "invalidations": self._invalidations,
+                "size": len(self._days),
+                "hit_ratio": self._hits / lookups if lookups else 0.0,
+            }
+
+
+report_cache = ReportCache(
+    REPORT_CACHE_MAX_DAYS, REPORT_CACHE_TTL_SECONDS, REPORT_CACHE_GRACE_SECONDS
+)
@@ -0,0 +1,224 @@
+"""Léxicos e limiares das regras heurísticas, carregados de um arquivo JSON
+versionado e recarregáveis sem reiniciar a aplicação nem o modelo."""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from app.services.matcher import KeywordSequenceMatcher, LexiconMatcher
+
+logger = logging.getLogger(__name__)
+
+# Arquivo de regras distribuído com a aplicação.
+DEFAULT_RULES_PATH = str(Path(__file__).with_name("rules.json"))
+
+# Léxicos obrigatórios no arquivo. Os quatro primeiros são contados pelo
+# `LexiconMatcher`; "negations" é mantido para consumidores das regras.
+LEXICON_KEYS = (
+    "very_positive",
+    "very_negative",
+    "neutral_indicators",
+    "weakening_words",
+    "negations",
+    "contradiction_words",
+)
+COUNTED_LEXICONS = LEXICON_KEYS[:4]
+
+# Limiares obrigatórios da árvore de decisão. Os "rules_*" são usados em
+# `decide_by_rules` e os "model_*" em `decide_with_model`.
+THRESHOLD_KEYS = (
+    "rules_strong_negative",
+    "rules_neutral_indicators",
+    "rules_neutral_indicators_with_contradiction",
+    "rules_mixed_positive",
+    "rules_mixed_negative",
+    "rules_weakening_with_contradiction",
+    "rules_negative",
+    "rules_positive",
+    "model_contradiction_confidence",
+    "model_high_confidence",
+    "model_lexicon_positive",
+    "model_lexicon_negative",
+    "model_positive_confidence",
+    "model_low_confidence",
+)
+
+
+def load_rules_config(path: str) -> Dict[str, Any]:
+    """Lê e valida o arquivo de regras.
+
+    Args:
+        path (str): Caminho do arquivo JSON.
+
+    Returns:
+        Dict[str, Any]: Conteúdo do arquivo.
+
+    Raises:
+        OSError: Se o arquivo não puder ser lido.
+        ValueError: Se o arquivo não for um JSON válido ou faltar algum
+            léxico, padrão ou limiar.
+    """
+    with open(path, encoding="utf-8") as f:
+        config = json.load(f)
+    validate_rules_config(config)
+    return config
+
+
+def validate_rules_config(config: Any):
+    """Verifica a estrutura das regras antes de qualquer matcher ser
+    construído, para que um arquivo inválido nunca substitua o atual.
+
+    Raises:
+        ValueError: Se a estrutura for inválida.
+    """
+    if not isinstance(config, dict):
+        raise ValueError("O arquivo de regras deve conter um objeto JSON.")
+
+    version = config.get("version")
+    if not isinstance(version, str) or not version:
+        raise ValueError("'version' deve ser um texto não vazio.")
+
+    for key in LEXICON_KEYS:
+        phrases = config.get(key)
+        if not isinstance(phrases, list) or not all(
+            isinstance(phrase, str) and phrase.strip() for phrase in phrases
+        ):
+            raise ValueError(f"'{key}' deve ser uma lista de textos.")
+
+    patterns = config.get("neutral_patterns")
+    if not isinstance(patterns, list) or not all(
+        isinstance(pattern, list) and pattern and all(
+            isinstance(term, str) and term.strip() for term in pattern
+        )
+        for pattern in patterns
+    ):
+        raise ValueError(
+            "'neutral_patterns' deve ser uma lista de listas de termos."
+        )
+
+    thresholds = config.get("thresholds")
+    if not isinstance(thresholds, dict):
+        raise ValueError("'thresholds' deve ser um objeto.")
+    missing = [key for key in THRESHOLD_KEYS if key not in thresholds]
+    unknown = [key for key in thresholds if key not in THRESHOLD_KEYS]
+    if missing or unknown:
+        raise ValueError(
+            f"Limiares ausentes: {missing}; desconhecidos: {unknown}."
+        )
+    for key, value in thresholds.items():
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError(f"O limiar '{key}' deve ser numérico.")
+
+
+def rules_digest(config: Dict[str, Any]) -> str:
+    """Hash curto do conteúdo das regras, independente da formatação do
+    arquivo."""
+    payload = json.dumps(config, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+class RuleSet:
+    """Uma versão das regras: léxicos, padrões, limiares e os matchers
+    pré-compilados sobre eles.
+
+    Não é alterada depois de construída. Uma recarga constrói um novo
+    `RuleSet` fora do caminho das requisições e o classificador troca a
+    referência de uma só vez, de modo que cada lote é classificado
+    inteiro com uma única versão das regras.
+    """
+
+    def __init__(
+        self,
+        config: Dict[str, Any],
+        lemmatize: Optional[Callable[[List[str]], List[str]]] = None,
+        max_gap: Optional[int] = None,
+    ):
+        """
+        Args:
+            config (Dict[str, Any]): Regras já validadas, como retornadas
+                por `load_rules_config`.
+            lemmatize (Optional[Callable]): Lematizador em lote das
+                expressões, repassado ao `LexiconMatcher`.
+            max_gap (Optional[int]): Distância máxima entre os termos dos
+                padrões de neutralidade.
+        """
+        self.version: str = config["version"]
+        self.digest = rules_digest(config)
+        self.lexicons: Dict[str, List[str]] = {
+            key: list(config[key]) for key in LEXICON_KEYS
+        }
+        self.neutral_patterns = [
+            tuple(pattern) for pattern in config["neutral_patterns"]
+        ]
+        self.thresholds: Dict[str, float] = dict(config["thresholds"])
+        self.loaded_at = time.time()
+
+        self.matcher = LexiconMatcher(
+            {key: self.lexicons[key] for key in COUNTED_LEXICONS},
+            self.lexicons["contradiction_words"],
+            lemmatize,
+        )
+        self.neutral_matcher = KeywordSequenceMatcher(
+            self.neutral_patterns, max_gap
+        )
+
+
+class RulesWatcher:
+    """Thread que chama `on_change` quando a data de modificação do
+    arquivo de regras muda.
+
+    Falhas na recarga são registradas no log e as regras em uso são
+    mantidas; a próxima alteração do arquivo tenta de novo.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        on_change: Callable[[], Any],
+        interval_seconds: float = 5.0,
+    ):
+        self.path = path
+        self.interval_seconds = interval_seconds
+        self._on_change = on_change
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_mtime: Optional[float] = None
+
+    def _mtime(self) -> Optional[float]:
+        try:
+            return os.stat(self.path).st_mtime
+        except OSError:
+            return None
+
+    def start(self):
+        """Inicia a thread de monitoramento, tomando a data de modificação
+        atual como referência."""
+        self._last_mtime = self._mtime()
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="rules-watcher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Encerra a thread de monitoramento."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval_seconds):
+            mtime = self._mtime()
+            if mtime is None or mtime == self._last_mtime:
+                continue
+            self._last_mtime = mtime
+            try:
+                self._on_change()
+            except Exception:
+                logger.exception("Falha ao recarregar %s.", self.path)
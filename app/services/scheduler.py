@@ -0,0 +1,176 @@
+"""Agendador de inferência que agrupa classificações concorrentes em lotes."""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class SchedulerOverloadedError(RuntimeError):
+    """Lançada quando a fila de inferência está cheia."""
+
+
+def _resolve(future: Future, result=None, exception=None):
+    """Resolve o `Future` de um chamador sem afetar os demais do lote."""
+    try:
+        if exception is not None:
+            future.set_exception(exception)
+        else:
+            future.set_result(result)
+    except InvalidStateError:
+        pass
+
+
+class InferenceScheduler:
+    """Agrupa textos enviados por várias threads em uma única chamada em lote.
+
+    Uma thread dedicada retira textos da fila e chama `classify_batch`
+    quando o lote atinge `max_batch_size` ou quando o texto mais antigo
+    esperou `max_wait_ms`, o que ocorrer primeiro. Cada chamador recebe um
+    `Future` resolvido com o sentimento do seu texto.
+    """
+
+    def __init__(
+        self,
+        classify_batch: Callable[[List[str]], List[str]],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+        max_queue_size: int = 1000,
+    ):
+        self._classify_batch = classify_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait_seconds = max_wait_ms / 1000
+        self.max_queue_size = max_queue_size
+        self._queue: "queue.Queue[Optional[Tuple[str, Future]]]" = (
+            queue.Queue(maxsize=max_queue_size)
+        )
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._batches = 0
+        self._items = 0
+        self._rejected = 0
+        self._largest_batch = 0
+
+    def start(self):
+        """Inicia a thread de inferência, se ainda não estiver rodando."""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name="inference-scheduler",
+                    daemon=True,
+                )
+                self._thread.start()
+
+    def stop(self):
+        """Processa o que já está na fila e encerra a thread de inferência."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join()
+
+    def submit(self, text: str) -> Future:
+        """Enfileira um texto para classificação.
+
+        Args:
+            text (str): Texto da avaliação.
+
+        Returns:
+            Future: Resolvido com o sentimento do texto.
+
+        Raises:
+            SchedulerOverloadedError: Se a fila atingiu `max_queue_size`.
+        """
+        self.start()
+        future: Future = Future()
+        try:
+            self._queue.put_nowait((text, future))
+        except queue.Full:
+            with self._lock:
+                self._rejected += 1
+            raise SchedulerOverloadedError(
+                "Fila de classificação cheia."
+            ) from None
+        return future
+
+    def _run(self):
+        """Laço da thread de inferência."""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+
+            batch = [item]
+            deadline = time.monotonic() + self.max_wait_seconds
+            stop = False
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+
+            self._flush(batch)
+            if stop:
+                return
+
+    def _flush(self, batch: List[Tuple[str, Future]]):
+        """Classifica o lote e resolve o `Future` de cada chamador.
+
+        Os `Future` cancelados enquanto esperavam na fila (cliente
+        desconectado ou timeout) são descartados antes da classificação;
+        os demais passam a "em execução" e não podem mais ser cancelados.
+        """
+        batch = [
+            (text, future)
+            for text, future in batch
+            if future.set_running_or_notify_cancel()
+        ]
+        if not batch:
+            return
+
+        with self._lock:
+            self._batches += 1
+            self._items += len(batch)
+            self._largest_batch = max(self._largest_batch, len(batch))
+
+        try:
+            sentiments = self._classify_batch([text for text, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                _resolve(future, exception=e)
+            return
+
+        for (_, future), sentiment in zip(batch, sentiments):
+            _resolve(future, result=sentiment)
+
+    def get_metrics(self) -> Dict[str, float]:
+        """Retorna as métricas do agendador.
+
+        Returns:
+            Dict[str, float]: Profundidade atual da fila, lotes e itens
+            processados, tamanho médio e maior lote, itens rejeitados por
+            fila cheia e a configuração em uso.
+        """
+        with self._lock:
+            return {
+                "queue_depth": self._queue.qsize(),
+                "batches": self._batches,
+                "items": self._items,
+                "average_batch_size": (
+                    self._items / self._batches if self._batches else 0.0
+                ),
+                "largest_batch": self._largest_batch,
+                "rejected": self._rejected,
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait_seconds * 1000,
+                "max_queue_size": self.max_queue_size,
+            }
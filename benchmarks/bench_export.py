@@ -0,0 +1,180 @@
+"""Benchmark da exportação em streaming contra a listagem de avaliações.
+
+Popula um banco SQLite temporário com `--rows` avaliações e, para cada
+modo, sobe um processo novo do uvicorn, faz uma única requisição pelo
+intervalo inteiro e mede o tempo até o primeiro byte, o tempo total, o
+tamanho da resposta e o pico de RSS do servidor acima do RSS em repouso.
+
+- `list`: `GET /reviews/` com `limit` igual ao total de linhas (e
+  `REVIEW_MAX_PAGE_SIZE` elevado), como a listagem sem paginação.
+- `ndjson` e `csv`: `GET /reviews/export`.
+
+Uso:
+    python benchmarks/bench_export.py --rows 200000
+"""
+
+import argparse
+import json
+import os
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict
+
+import httpx
+import psutil
+
+ROOT = Path(__file__).resolve().parent.parent
+SENTIMENTS = ("POSITIVE", "NEUTRAL", "NEGATIVE")
+TEXT = (
+    "O atendimento foi educado e resolveram parte do problema, mas o "
+    "chamado {i} ainda aguarda retorno da equipe de suporte técnico."
+)
+
+
+def seed(database: Path, rows: int):
+    """Cria as tabelas e insere `rows` avaliações."""
+    subprocess.run(
+        [sys.executable, "-m", "alembic", "upgrade", "head"],
+        cwd=ROOT,
+        env={**os.environ, "DATABASE_URL": f"sqlite:///{database}"},
+        check=True,
+    )
+    first = date(2020, 1, 1)
+    with sqlite3.connect(database) as conn:
+        conn.executemany(
+            "INSERT INTO reviews "
+            "(customer_name, review_text, evaluation_date, sentiment) "
+            "VALUES (?, ?, ?, ?)",
+            (
+                (
+                    f"Cliente {i % 500}",
+                    TEXT.format(i=i),
+                    (first + timedelta(days=i % 1500)).isoformat(),
+                    random.choice(SENTIMENTS),
+                )
+                for i in range(rows)
+            ),
+        )
+
+
+class PeakRSS:
+    """Amostra o RSS de um processo em segundo plano e guarda o maior."""
+
+    def __init__(self, pid: int, interval: float = 0.005):
+        self._process = psutil.Process(pid)
+        self._interval = interval
+        self._stop = threading.Event()
+        self.peak = self._process.memory_info().rss
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, self._process.memory_info().rss)
+            time.sleep(self._interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def wait_live(base_url: str, process: subprocess.Popen, timeout: float):
+    """Aguarda `/health/live` responder ou o processo terminar."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("O uvicorn terminou antes de ficar pronto.")
+        try:
+            httpx.get(f"{base_url}/health/live")
+            return
+        except httpx.TransportError:
+            time.sleep(0.2)
+    raise TimeoutError("A API não ficou pronta a tempo.")
+
+
+def measure(mode: str, args: argparse.Namespace, database: Path):
+    """Sobe o servidor e mede uma requisição no modo informado."""
+    base_url = f"http://127.0.0.1:{args.port}"
+    path = (
+        f"/reviews/?limit={args.rows}"
+        if mode == "list"
+        else f"/reviews/export?format={mode}"
+    )
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--port", str(args.port), "--log-level", "warning",
+        ],
+        cwd=ROOT,
+        env={
+            **os.environ,
+            "DATABASE_URL": f"sqlite:///{database}",
+            "CLASSIFIER_PRELOAD": "false",
+            "REVIEW_MAX_PAGE_SIZE": str(args.rows),
+        },
+    )
+    try:
+        wait_live(base_url, process, args.startup_timeout)
+        baseline = psutil.Process(process.pid).memory_info().rss
+        size = 0
+        with PeakRSS(process.pid) as rss, httpx.Client(timeout=None) as client:
+            start = time.perf_counter()
+            first_byte = None
+            with client.stream("GET", base_url + path) as response:
+                response.raise_for_status()
+                for chunk in response.iter_raw():
+                    if first_byte is None:
+                        first_byte = time.perf_counter() - start
+                    size += len(chunk)
+            total = time.perf_counter() - start
+    finally:
+        process.terminate()
+        process.wait()
+
+    return {
+        "mode": mode,
+        "ttfb_seconds": round(first_byte, 3),
+        "total_seconds": round(total, 3),
+        "response_mib": round(size / 2**20, 1),
+        "peak_rss_delta_mib": round((rss.peak - baseline) / 2**20, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--startup-timeout", type=float, default=60)
+    parser.add_argument("--json", help="Arquivo para gravar os resultados")
+    args = parser.parse_args()
+
+    database = Path(tempfile.mkdtemp()) / "bench.sqlite3"
+    seed(database, args.rows)
+
+    results = []
+    for mode in ("list", "ndjson", "csv"):
+        result: Dict[str, Any] = measure(mode, args, database)
+        results.append(result)
+        print(
+            f"{mode}: ttfb={result['ttfb_seconds']}s "
+            f"total={result['total_seconds']}s "
+            f"resposta={result['response_mib']} MiB "
+            f"pico RSS=+{result['peak_rss_delta_mib']} MiB"
+        )
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
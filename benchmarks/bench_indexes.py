@@ -0,0 +1,166 @@
+"""Benchmark dos índices de reviews antes e depois da migração 0004.
+
+Para cada revisão, cria o esquema pelas migrações em um banco vazio
+(SQLite temporário por padrão, ou `--database-url`, que é levado de volta
+a `base` ao final), mede a vazão de INSERTs de `--rows` avaliações e, em
+seguida, o plano e a mediana de `--repeat` execuções das consultas
+quentes: páginas da listagem (com e sem filtros), o GROUP BY da
+reconstrução do resumo diário e o relatório contado direto em `reviews`.
+
+Uso:
+    python -m benchmarks.bench_indexes --rows 200000
+    python -m benchmarks.bench_indexes --database-url postgresql://...
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
+
+from alembic import command  # noqa: E402
+from alembic.config import Config  # noqa: E402
+from sqlalchemy import func, insert, select, text  # noqa: E402
+from sqlalchemy.ext.asyncio import create_async_engine  # noqa: E402
+
+from app.crud.review import REVIEW_COLUMNS  # noqa: E402
+from app.database import to_async_url  # noqa: E402
+from app.models.review import Review  # noqa: E402
+from app.schemas.review import SentimentsEnum  # noqa: E402
+
+ROOT = Path(__file__).resolve().parent.parent
+# Revisão anterior à revisão dos índices e a própria revisão; as
+# posteriores mudariam o que é medido.
+REVISIONS = ("0003", "0004")
+FIRST_DATE = date(2020, 1, 1)
+DAYS = 1500
+CHUNK_SIZE = 1000
+START, END = FIRST_DATE + timedelta(days=700), FIRST_DATE + timedelta(days=729)
+# Colunas preenchidas na carga, presentes nas duas revisões.
+SEED_COLUMNS = (
+    Review.customer_name,
+    Review.review_text,
+    Review.evaluation_date,
+    Review.sentiment,
+)
+EXPLAIN = {"sqlite": "EXPLAIN QUERY PLAN ", "postgresql": "EXPLAIN "}
+
+
+def hot_queries():
+    """Consultas medidas, como montadas em app/crud/review.py, só com
+    colunas que existem nas duas revisões."""
+    in_range = (Review.evaluation_date >= START, Review.evaluation_date <= END)
+    page = (Review.evaluation_date.desc(), Review.id.desc())
+    return {
+        "listagem": select(*REVIEW_COLUMNS).where(*in_range).order_by(*page).limit(100),  # noqa: E501
+        "listagem por sentimento": select(*REVIEW_COLUMNS)
+        .where(*in_range, Review.sentiment == SentimentsEnum.NEGATIVE)
+        .order_by(*page)
+        .limit(100),
+        "listagem por cliente": select(*REVIEW_COLUMNS)
+        .where(Review.customer_name == "Cliente 7")
+        .order_by(*page)
+        .limit(100),
+        "resumo diário": select(
+            Review.evaluation_date, Review.sentiment, func.count()
+        )
+        .where(*in_range)
+        .group_by(Review.evaluation_date, Review.sentiment),
+        "relatório em reviews": select(Review.sentiment, func.count())
+        .where(*in_range)
+        .group_by(Review.sentiment),
+    }
+
+
+def rows(count: int):
+    """Gera as avaliações inseridas, sempre as mesmas, só com as colunas
+    de `SEED_COLUMNS`."""
+    rng = random.Random(0)
+    sentiments = list(SentimentsEnum)
+    keys = [column.key for column in SEED_COLUMNS]
+    for i in range(count):
+        yield dict(zip(keys, (
+            f"Cliente {rng.randrange(2000)}",
+            "Atendimento resolveu o chamado {} em {} dias.".format(
+                i, rng.randint(1, 30)
+            ),
+            FIRST_DATE + timedelta(days=rng.randrange(DAYS)),
+            rng.choice(sentiments),
+        )))
+
+
+async def measure(url: str, args: argparse.Namespace):
+    engine = create_async_engine(to_async_url(url))
+    dialect = engine.dialect
+
+    batch = []
+    start = time.perf_counter()
+    async with engine.begin() as conn:
+        for row in rows(args.rows):
+            batch.append(row)
+            if len(batch) == CHUNK_SIZE:
+                await conn.execute(insert(Review), batch)
+                batch = []
+        if batch:
+            await conn.execute(insert(Review), batch)
+    elapsed = time.perf_counter() - start
+    print(f"  INSERT: {args.rows / elapsed:,.0f} avaliações/s")
+
+    async with engine.connect() as conn:
+        if dialect.name == "postgresql":
+            await conn.execute(text("ANALYZE reviews"))
+        else:
+            await conn.execute(text("ANALYZE"))
+        for name, query in hot_queries().items():
+            sql = str(
+                query.compile(
+                    dialect=dialect, compile_kwargs={"literal_binds": True}
+                )
+            )
+            plan = await conn.execute(text(EXPLAIN[dialect.name] + sql))
+            timings = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                await conn.execute(query)
+                timings.append(time.perf_counter() - started)
+            print(f"  {name}: {statistics.median(timings) * 1000:.2f} ms")
+            for line in plan:
+                print(f"    {line[-1]}")
+
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument(
+        "--database-url", help="Banco vazio (padrão: SQLite temporário)"
+    )
+    args = parser.parse_args()
+
+    for revision in REVISIONS:
+        url = args.database_url or "sqlite:///{}".format(
+            Path(tempfile.mkdtemp()) / "bench.sqlite3"
+        )
+        config = Config(str(ROOT / "alembic.ini"))
+        config.set_main_option("sqlalchemy.url", url)
+        config.attributes["configure_logger"] = False
+
+        command.upgrade(config, revision)
+        print(f"revisão {revision}:")
+        try:
+            asyncio.run(measure(url, args))
+        finally:
+            if args.database_url:
+                command.downgrade(config, "base")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Micro-benchmark dos padrões de neutralidade: regex com `.*` contra o
+`KeywordSequenceMatcher`.
+
+O pior caso para os regexes é um texto longo que contém os primeiros
+termos de cada padrão, repetidos, mas nunca o último: cada `.*` volta
+caractere a caractere procurando o termo seguinte, e o custo cresce com
+o quadrado do tamanho do texto. O matcher percorre o texto uma única vez.
+
+Uso:
+    python -m benchmarks.bench_neutral_patterns --length 5000
+"""
+
+import argparse
+import os
+import re
+import timeit
+
+# Só os padrões são usados; dispensa o spaCy.
+os.environ.setdefault("CLASSIFIER_LEMMATIZE", "false")
+
+from app.services.backends import StubBackend  # noqa: E402
+from app.services.classifier import SentimentClassifier  # noqa: E402
+from app.services.matcher import normalize_text  # noqa: E402
+
+TYPICAL = (
+    "O atendimento foi educado, mas não consegui entender completamente "
+    "a explicação técnica fornecida."
+)
+
+
+def worst_case(patterns, length: int) -> str:
+    """Monta um texto com todos os termos de cada padrão, menos o último,
+    repetidos até `length` caracteres."""
+    heads = " ".join(pattern[0] for pattern in patterns)
+    middles = " ".join(term for pattern in patterns for term in pattern[1:-1])
+    text = heads + " "
+    while len(text) < length:
+        text += middles + " "
+    return normalize_text(text[:length])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--length", type=int, default=5000)
+    parser.add_argument("--number", type=int, default=20)
+    args = parser.parse_args()
+
+    classifier = SentimentClassifier(backend=StubBackend())
+    patterns = classifier.neutral_patterns
+    # Regexes equivalentes aos padrões, como eram antes do matcher.
+    regexes = [
+        re.compile(".*".join(re.escape(term) for term in pattern))
+        for pattern in patterns
+    ]
+    matcher = classifier.neutral_matcher
+
+    for name, text in (
+        ("típico", normalize_text(TYPICAL)),
+        ("pior caso", worst_case(patterns, args.length)),
+    ):
+        assert matcher.match(text) == any(r.search(text) for r in regexes)
+        legacy = timeit.timeit(
+            lambda: any(r.search(text) for r in regexes), number=args.number
+        )
+        single_pass = timeit.timeit(
+            lambda: matcher.match(text), number=args.number
+        )
+        print(
+            f"{name} ({len(text)} caracteres): "
+            f"regex {legacy / args.number * 1000:.3f} ms, "
+            f"varredura única {single_pass / args.number * 1000:.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Benchmark da busca de texto completo contra um `ILIKE '%termo%'`.
+
+Popula um banco com `--rows` avaliações (SQLite temporário por padrão, ou
+o banco vazio de `--database-url`) e mede a mediana de `--repeat` buscas
+pela primeira página de cada termo, em três frequências: um termo comum,
+um raro e um ausente. O `ILIKE` percorre a tabela até preencher a página,
+então só é rápido para termos comuns; a busca de texto completo consulta
+o índice, mas ordena todas as avaliações encontradas pela relevância.
+
+Uso:
+    python -m benchmarks.bench_search --rows 200000
+    python -m benchmarks.bench_search --database-url postgresql://...
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
+
+from sqlalchemy import insert, select  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine  # noqa: E402,E501
+
+from app.crud.review import search_reviews  # noqa: E402
+from app.database import Base, to_async_url  # noqa: E402
+from app.models.review import Review  # noqa: E402
+from app.schemas.review import SentimentsEnum  # noqa: E402
+
+WORDS = (
+    "atendimento suporte chamado técnico retorno equipe problema resolvido "
+    "demora cobrança fatura pagamento aplicativo acesso senha cadastro "
+    "entrega prazo produto troca reembolso contato telefone email"
+).split()
+# Termos buscados: comum (~80% das avaliações), raro e ausente.
+TERMS = ("atendimento", "boleto", "inexistente")
+# Fração das avaliações que mencionam "boleto".
+RARE_TERM_RATE = 0.001
+PAGE_SIZE = 20
+
+
+def review_text(rng: random.Random) -> str:
+    """Gera um texto de 20 a 60 palavras, com "boleto" em 0,1% deles."""
+    words = rng.choices(WORDS, k=rng.randint(20, 60))
+    if rng.random() < RARE_TERM_RATE:
+        words.insert(rng.randrange(len(words)), "boleto")
+    return " ".join(words).capitalize() + "."
+
+
+async def seed(engine, rows: int):
+    """Cria as tabelas, com o índice de texto completo, e insere `rows`
+    avaliações."""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    rng = random.Random(0)
+    first = date(2020, 1, 1)
+    sentiments = list(SentimentsEnum)
+    async with engine.begin() as conn:
+        for start in range(0, rows, 5000):
+            await conn.execute(
+                insert(Review),
+                [
+                    {
+                        "customer_name": f"Cliente {i % 500}",
+                        "review_text": review_text(rng),
+                        "evaluation_date": first + timedelta(days=i % 1500),
+                        "sentiment": rng.choice(sentiments),
+                    }
+                    for i in range(start, min(start + 5000, rows))
+                ],
+            )
+
+
+async def median_ms(run, repeat: int) -> float:
+    """Mediana, em milissegundos, de `repeat` execuções após um
+    aquecimento."""
+    await run()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await run()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+async def measure(args: argparse.Namespace):
+    url = args.database_url or "sqlite:///{}".format(
+        Path(tempfile.mkdtemp()) / "bench.sqlite3"
+    )
+    engine = create_async_engine(to_async_url(url))
+    await seed(engine, args.rows)
+
+    async with AsyncSession(engine) as db:
+        for term in TERMS:
+            async def full_text():
+                return await search_reviews(db, term, limit=PAGE_SIZE)
+
+            async def ilike():
+                result = await db.execute(
+                    select(Review)
+                    .where(Review.review_text.ilike(f"%{term}%"))
+                    .order_by(Review.id.desc())
+                    .limit(PAGE_SIZE)
+                )
+                return list(result.scalars())
+
+            found = len(await full_text())
+            fts_ms = await median_ms(full_text, args.repeat)
+            ilike_ms = await median_ms(ilike, args.repeat)
+            print(
+                f"{term}: {found} na página | "
+                f"texto completo={fts_ms:.2f} ms ilike={ilike_ms:.2f} ms"
+            )
+
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument(
+        "--database-url", help="Banco vazio (padrão: SQLite temporário)"
+    )
+    asyncio.run(measure(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
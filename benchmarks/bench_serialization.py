@@ -0,0 +1,173 @@
+"""Benchmark da serialização das páginas da listagem antes e depois da
+leitura por colunas com o orjson.
+
+Popula um banco com `--rows` avaliações (SQLite temporário por padrão, ou
+o banco vazio de `--database-url`) e, para cada tamanho de página, mede a
+mediana de `--repeat` execuções dos dois caminhos:
+
+- antes: `select(Review)` com objetos do ORM, validados como
+  `List[ReviewResponse]` e convertidos para JSON como o FastAPI faz com o
+  `response_model` e a `JSONResponse`;
+- depois: `get_reviews`, que lê só as colunas de `REVIEW_COLUMNS`, e a
+  `ORJSONResponse` das linhas convertidas por `as_dicts`.
+
+Mostra as linhas por segundo da consulta mais a serialização e só da
+serialização, e o tamanho do corpo com gzip. Os dois corpos são
+comparados antes da medição.
+
+Uso:
+    python -m benchmarks.bench_serialization --rows 50000
+    python -m benchmarks.bench_serialization --database-url postgresql://...
+"""
+
+import argparse
+import asyncio
+import gzip
+import json
+import os
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import List
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
+
+from fastapi.responses import JSONResponse, ORJSONResponse  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy import insert, select  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine  # noqa: E402,E501
+
+from app.config import GZIP_COMPRESS_LEVEL  # noqa: E402
+from app.crud.review import get_reviews  # noqa: E402
+from app.database import Base, to_async_url  # noqa: E402
+from app.models.review import Review  # noqa: E402
+from app.schemas.review import ReviewResponse, SentimentsEnum  # noqa: E402
+from app.services.export import as_dicts  # noqa: E402
+
+PAGE_SIZES = (100, 1000, 5000)
+ADAPTER = TypeAdapter(List[ReviewResponse])
+
+
+async def seed(engine, rows: int):
+    """Cria as tabelas e insere `rows` avaliações."""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    first = date(2020, 1, 1)
+    sentiments = list(SentimentsEnum)
+    async with engine.begin() as conn:
+        for start in range(0, rows, 5000):
+            await conn.execute(
+                insert(Review),
+                [
+                    {
+                        "customer_name": f"Cliente {i % 500}",
+                        "review_text": (
+                            f"Atendimento do chamado {i} resolvido pela "
+                            "equipe de suporte em poucos dias."
+                        ),
+                        "evaluation_date": first + timedelta(days=i % 1500),
+                        "sentiment": sentiments[i % 3],
+                    }
+                    for i in range(start, min(start + 5000, rows))
+                ],
+            )
+
+
+def serialize_before(reviews) -> bytes:
+    """Valida os objetos do ORM no `response_model` e gera o JSON."""
+    value = ADAPTER.validate_python(reviews, from_attributes=True)
+    return JSONResponse(ADAPTER.dump_python(value, mode="json")).body
+
+
+def serialize_after(rows) -> bytes:
+    """Gera o JSON das linhas lidas por colunas."""
+    return ORJSONResponse(as_dicts(rows)).body
+
+
+async def query_before(db: AsyncSession, limit: int):
+    result = await db.execute(
+        select(Review)
+        .order_by(Review.evaluation_date.desc(), Review.id.desc())
+        .limit(limit)
+    )
+    reviews = list(result.scalars())
+    # Sem o identity map cheio entre as execuções.
+    db.expunge_all()
+    return reviews
+
+
+async def median_seconds(run, repeat: int) -> float:
+    """Mediana, em segundos, de `repeat` execuções após um aquecimento."""
+    await run()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await run()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+async def measure(args: argparse.Namespace):
+    url = args.database_url or "sqlite:///{}".format(
+        Path(tempfile.mkdtemp()) / "bench.sqlite3"
+    )
+    engine = create_async_engine(to_async_url(url))
+    await seed(engine, args.rows)
+
+    async with AsyncSession(engine) as db:
+        for limit in PAGE_SIZES:
+            reviews = await query_before(db, limit)
+            rows = await get_reviews(db, limit=limit)
+            before, after = serialize_before(reviews), serialize_after(rows)
+            assert json.loads(before) == json.loads(after)
+
+            async def full_before():
+                serialize_before(await query_before(db, limit))
+
+            async def full_after():
+                serialize_after(await get_reviews(db, limit=limit))
+
+            async def only_before():
+                serialize_before(reviews)
+
+            async def only_after():
+                serialize_after(rows)
+
+            count = len(rows)
+            results = {
+                name: count / await median_seconds(run, args.repeat)
+                for name, run in (
+                    ("consulta+json antes", full_before),
+                    ("consulta+json depois", full_after),
+                    ("json antes", only_before),
+                    ("json depois", only_after),
+                )
+            }
+            compressed = len(gzip.compress(after, GZIP_COMPRESS_LEVEL))
+            print(
+                f"página de {count}: "
+                + " | ".join(
+                    f"{name}={rate:,.0f} linhas/s"
+                    for name, rate in results.items()
+                )
+                + f" | corpo={len(after):,} B, gzip={compressed:,} B"
+            )
+
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument(
+        "--database-url", help="Banco vazio (padrão: SQLite temporário)"
+    )
+    asyncio.run(measure(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
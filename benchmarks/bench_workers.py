@@ -0,0 +1,183 @@
+"""Benchmark de memória e vazão da API com 1..N workers do gunicorn.
+
+Para cada quantidade de workers, sobe o gunicorn com `gunicorn.conf.py`,
+espera `/health/ready`, mede o RSS e o PSS de cada worker e envia
+requisições concorrentes a `POST /reviews/` com textos distintos (sem
+acertos no cache). O PSS divide as páginas compartilhadas entre os
+processos que as usam, então mostra a economia do preload melhor que o
+RSS.
+
+Uso:
+    python benchmarks/bench_workers.py --max-workers 8 --requests 500
+    python benchmarks/bench_workers.py --no-preload
+
+Sem `DATABASE_URL`, usa um banco SQLite temporário.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import httpx
+import psutil
+
+ROOT = Path(__file__).resolve().parent.parent
+TEXT = (
+    "O atendimento foi educado e resolveram parte do problema, "
+    "mas o chamado {i} ainda aguarda retorno da equipe."
+)
+
+
+def wait_ready(base_url: str, process: subprocess.Popen, timeout: float):
+    """Aguarda `/health/ready` responder 200 ou o processo terminar."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("O gunicorn terminou antes de ficar pronto.")
+        try:
+            if httpx.get(f"{base_url}/health/ready").status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.5)
+    raise TimeoutError("A API não ficou pronta a tempo.")
+
+
+def measure_memory(master_pid: int) -> Dict[str, Any]:
+    """Mede RSS e PSS (em MiB) do mestre e de cada worker."""
+    def mib(value: Optional[int]) -> Optional[float]:
+        return round(value / 2**20, 1) if value is not None else None
+
+    def usage(process: psutil.Process) -> Dict[str, Optional[float]]:
+        info = process.memory_full_info()
+        return {
+            "rss_mib": mib(info.rss),
+            "pss_mib": mib(getattr(info, "pss", None)),
+        }
+
+    master = psutil.Process(master_pid)
+    master_usage = usage(master)
+    workers = [usage(child) for child in master.children()]
+    pss = [master_usage["pss_mib"]] + [w["pss_mib"] for w in workers]
+    return {
+        "master": master_usage,
+        "workers": workers,
+        "total_pss_mib": round(sum(pss), 1) if None not in pss else None,
+    }
+
+
+async def measure_throughput(
+    base_url: str,
+    requests: int,
+    concurrency: int,
+    offset: int,
+) -> Dict[str, Any]:
+    """Envia `requests` avaliações com `concurrency` requisições em voo."""
+    semaphore = asyncio.Semaphore(concurrency)
+    statuses: Counter = Counter()
+
+    async def send(client: httpx.AsyncClient, i: int):
+        async with semaphore:
+            response = await client.post(
+                f"{base_url}/reviews/",
+                json={
+                    "customer_name": "Benchmark",
+                    "review_text": TEXT.format(i=offset + i),
+                    "evaluation_date": "2025-01-01",
+                },
+            )
+            statuses[response.status_code] += 1
+
+    async with httpx.AsyncClient(timeout=60) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(send(client, i) for i in range(requests)))
+        elapsed = time.perf_counter() - start
+
+    return {
+        "requests": requests,
+        "errors": requests - statuses[201],
+        "status_codes": dict(statuses),
+        "seconds": round(elapsed, 2),
+        "requests_per_second": round(requests / elapsed, 1),
+    }
+
+
+def run(workers: int, args: argparse.Namespace, env: Dict[str, str]):
+    """Sobe o gunicorn com `workers` workers e executa as medições."""
+    base_url = f"http://127.0.0.1:{args.port}"
+    process = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "app.main:app"],
+        cwd=ROOT,
+        env={
+            **env,
+            "WEB_CONCURRENCY": str(workers),
+            "GUNICORN_BIND": f"127.0.0.1:{args.port}",
+            "GUNICORN_PRELOAD": "false" if args.no_preload else "true",
+        },
+    )
+    try:
+        wait_ready(base_url, process, args.startup_timeout)
+        # Os workers ficam prontos em momentos diferentes; espera todos.
+        time.sleep(args.settle_seconds)
+        memory = measure_memory(process.pid)
+        throughput = asyncio.run(
+            measure_throughput(
+                base_url, args.requests, args.concurrency, workers * 10**6
+            )
+        )
+    finally:
+        process.terminate()
+        process.wait()
+    return {"workers": workers, **memory, "throughput": throughput}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--max-workers", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--no-preload", action="store_true")
+    parser.add_argument("--startup-timeout", type=float, default=300)
+    parser.add_argument("--settle-seconds", type=float, default=5)
+    parser.add_argument("--json", help="Arquivo para gravar os resultados")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    if "DATABASE_URL" not in env:
+        database = Path(tempfile.mkdtemp()) / "bench.sqlite3"
+        env["DATABASE_URL"] = f"sqlite:///{database}"
+        subprocess.run(
+            [sys.executable, "-m", "alembic", "upgrade", "head"],
+            cwd=ROOT,
+            env=env,
+            check=True,
+        )
+
+    results = []
+    for workers in range(1, args.max_workers + 1):
+        result = run(workers, args, env)
+        results.append(result)
+        pss = [worker["pss_mib"] for worker in result["workers"]]
+        print(
+            f"workers={workers} "
+            f"rss/worker={[w['rss_mib'] for w in result['workers']]} "
+            f"pss/worker={pss} total_pss={result['total_pss_mib']} "
+            f"req/s={result['throughput']['requests_per_second']} "
+            f"status={result['throughput']['status_codes']}"
+        )
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""Configuração compartilhada dos benchmarks do classificador.
+
+Por padrão o modelo é o backend "stub", que dispensa o download do Flair;
+use `CLASSIFIER_BACKEND=flair` (ou "flair-quantized") para medir o modelo
+real. O cache de classificações fica desativado para que cada iteração
+execute o pipeline inteiro. A lematização também fica desativada, para que
+as etapas heurísticas não incluam o spaCy nem exijam o pt_core_news_sm; com
+`CLASSIFIER_LEMMATIZE=true`, ela é medida na sua própria etapa
+(`test_lematizacao`) e passa a fazer parte das heurísticas.
+"""
+
+import os
+
+os.environ.setdefault("CLASSIFIER_BACKEND", "stub")
+os.environ.setdefault("CLASSIFICATION_CACHE_SIZE", "0")
+os.environ.setdefault("CLASSIFIER_LEMMATIZE", "false")
+
+import pytest  # noqa: E402
+
+from app.config import CLASSIFIER_BACKEND  # noqa: E402
+from app.services.backends import create_backend  # noqa: E402
+from app.services.classifier import SentimentClassifier  # noqa: E402
+from samples import LONG_TEXT, MEDIUM_TEXT, SHORT_TEXT  # noqa: E402
+
+TEXTS = {"curto": SHORT_TEXT, "medio": MEDIUM_TEXT, "5000": LONG_TEXT}
+
+
+@pytest.fixture(scope="session")
+def classifier() -> SentimentClassifier:
+    """Classificador carregado uma única vez com o backend configurado."""
+    classifier = SentimentClassifier(backend=create_backend(CLASSIFIER_BACKEND))  # noqa: E501
+    # Aquecimento fora das medições.
+    classifier.predict_model([SHORT_TEXT])
+    return classifier
+
+
+@pytest.fixture(params=list(TEXTS), ids=lambda size: f"texto_{size}")
+def text(request) -> str:
+    """Texto de cada faixa de tamanho: curto, médio e 5000 caracteres."""
+    return TEXTS[request.param]
@@ -0,0 +1,13 @@
+"""Textos de exemplo usados pelos benchmarks do classificador."""
+
+SHORT_TEXT = "O atendimento foi rápido, mas a solução ficou pela metade."
+MEDIUM_TEXT = (
+    "O atendimento foi rápido e eficiente, mas senti que poderia ser mais "
+    "detalhado em alguns pontos técnicos. Por exemplo, ao explicar a falha "
+    "que ocorreu, o atendente não conseguiu detalhar a causa raiz do "
+    "problema, o que me deixou com dúvidas sobre o que realmente aconteceu. "
+    "No geral, foi uma experiência satisfatória, mas acredito que poderia "
+    "ser mais completa."
+)
+# Tamanho máximo aceito por `ReviewBase.review_text`.
+LONG_TEXT = ((MEDIUM_TEXT + " ") * 14)[:5000]
@@ -0,0 +1,89 @@
+"""Benchmarks de cada etapa da classificação de sentimentos.
+
+Uso:
+    pytest benchmarks --benchmark-json=benchmark.json
+    pytest benchmarks --benchmark-autosave
+    pytest benchmarks --benchmark-compare --benchmark-compare-fail=mean:10%
+"""
+
+import pytest
+
+from app.services.matcher import normalize_text
+
+from samples import LONG_TEXT, MEDIUM_TEXT, SHORT_TEXT
+
+BATCH_SIZE = 32
+
+
+@pytest.mark.benchmark(group="normalizacao")
+def test_normalizacao(benchmark, text):
+    """Mede a normalização (minúsculas e remoção de acentos)."""
+    benchmark(normalize_text, text)
+
+
+@pytest.mark.benchmark(group="lexicos")
+def test_lexicon_matcher(benchmark, classifier, text):
+    """Mede a contagem de todos os léxicos e das palavras de contradição
+    em varredura única."""
+    normalized = normalize_text(text)
+    benchmark(classifier.matcher.match, normalized)
+
+
+@pytest.mark.benchmark(group="padroes_neutros")
+def test_padroes_neutros(benchmark, classifier, text):
+    """Mede os padrões de neutralidade sobre o texto normalizado."""
+    normalized = normalize_text(text)
+    benchmark(classifier.neutral_matcher.match, normalized)
+
+
+@pytest.mark.benchmark(group="lematizacao")
+def test_lematizacao(benchmark, classifier, text):
+    """Mede a lematização com o cache de lemas já aquecido."""
+    if classifier.lemmatizer is None:
+        pytest.skip("Lematização desabilitada (CLASSIFIER_LEMMATIZE).")
+    classifier.lemmatizer.lemmatize(text)
+    benchmark(classifier.lemmatizer.lemmatize, text)
+
+
+@pytest.mark.benchmark(group="modelo")
+def test_predict_modelo(benchmark, classifier, text):
+    """Mede a inferência do modelo sobre o texto inteiro."""
+    benchmark(classifier.predict_model, [text])
+
+
+@pytest.mark.benchmark(group="modelo")
+def test_predict_modelo_textos_longos(benchmark, classifier, text):
+    """Mede a inferência das sentenças dentro do orçamento de tokens."""
+    inputs = classifier.prepare_text(text)
+    benchmark(classifier.score_prepared, [inputs])
+
+
+@pytest.mark.benchmark(group="heuristicas")
+def test_analyze_heuristics(benchmark, classifier, text):
+    """Mede todas as heurísticas juntas, sem o modelo."""
+    benchmark(classifier.analyze_heuristics, text)
+
+
+@pytest.mark.benchmark(group="completo")
+def test_analyze_sentiment_strength(benchmark, classifier, text):
+    """Mede heurísticas e modelo juntos, sempre executando o modelo."""
+    benchmark(classifier.analyze_sentiment_strength, text)
+
+
+@pytest.mark.benchmark(group="caminhos")
+@pytest.mark.parametrize(
+    "texts",
+    [[SHORT_TEXT], [MEDIUM_TEXT], [LONG_TEXT]],
+    ids=["curto", "medio", "5000"],
+)
+def test_classificacao_individual(benchmark, classifier, texts):
+    """Mede a classificação de um texto, sem cache."""
+    benchmark(classifier.classify_batch, texts, check_cache=False)
+
+
+@pytest.mark.benchmark(group="caminhos")
+def test_classificacao_em_lote(benchmark, classifier, text):
+    """Mede a classificação de um lote de textos distintos, sem cache,
+    por chamada ao lote inteiro."""
+    texts = [f"{text} ({i})" for i in range(BATCH_SIZE)]
+    benchmark(classifier.classify_batch, texts, check_cache=False)
@@ -0,0 +1,63 @@
+"""Configuração do gunicorn para rodar a API com vários workers uvicorn.
+
+Com `preload_app`, o mestre importa a aplicação e carrega o modelo e o
+pipeline do spaCy uma única vez antes de criar os workers, que passam a
+compartilhar os pesos por copy-on-write. O mestre não executa nenhuma
+inferência: o aquecimento (e a criação dos pools de threads do PyTorch)
+acontece no lifespan de cada worker, depois do fork.
+
+Uso:
+    gunicorn app.main:app
+
+Variáveis de ambiente:
+    GUNICORN_BIND: Endereço de escuta (padrão "0.0.0.0:8000").
+    WEB_CONCURRENCY: Número de workers (padrão 2).
+    GUNICORN_PRELOAD: "false" carrega o modelo em cada worker.
+"""
+
+import gc
+import os
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = os.getenv("GUNICORN_PRELOAD", "true").lower() == "true"
+# A carga do modelo no mestre pode passar do timeout padrão de 30s.
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+
+# Sem coleta no mestre: o coletor de ciclos escreveria nos cabeçalhos de
+# todos os objetos e as páginas compartilhadas seriam copiadas nos workers.
+if preload_app:
+    gc.disable()
+
+
+def on_starting(server):
+    """Carrega o classificador no mestre, já com a aplicação importada."""
+    from app.config import CLASSIFIER_PRELOAD
+
+    if preload_app and CLASSIFIER_PRELOAD:
+        from app.services.classifier import get_classifier
+
+        get_classifier()
+        server.log.info("Classificador carregado no processo mestre.")
+
+
+def pre_fork(server, worker):
+    """Move os objetos existentes para a geração permanente do coletor,
+    para que os workers não os percorram nem os copiem."""
+    if preload_app:
+        gc.freeze()
+
+
+def post_fork(server, worker):
+    """Reativa o coletor de lixo no worker recém-criado."""
+    gc.enable()
+
+
+def child_exit(server, worker):
+    """Remove as métricas de um worker encerrado do diretório
+    compartilhado do Prometheus, se configurado."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
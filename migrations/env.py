@@ -0,0 +1,84 @@
+"""Ambiente das migrações do Alembic.
+
+Usa `sqlalchemy.url` do alembic.ini, se definida, ou `DATABASE_URL`,
+convertida para o driver assíncrono como na aplicação.
+"""
+
+import asyncio
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import pool
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.config import DATABASE_URL
+from app.database import Base, to_async_url
+# Import abaixo é necessário p/ registrar os modelos no metadata.
+import app.models.review  # noqa: F401
+
+config = context.config
+
+if config.config_file_name is not None and config.attributes.get(
+    "configure_logger", True
+):
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = Base.metadata
+
+# Objetos da busca de texto completo, criados por SQL próprio (ver
+# `SEARCH_DDL`) e ausentes do metadata.
+SEARCH_OBJECTS = ("search_vector", "ix_reviews_search_vector")
+
+
+def include_object(obj, name, type_, reflected, compare_to) -> bool:
+    """Impede que o autogenerate proponha remover os objetos da busca."""
+    if reflected and compare_to is None and name:
+        return not (
+            name in SEARCH_OBJECTS or name.startswith("reviews_fts")
+        )
+    return True
+
+
+def database_url() -> str:
+    return to_async_url(config.get_main_option("sqlalchemy.url") or DATABASE_URL)  # noqa: E501
+
+
+def run_migrations_offline():
+    """Gera o SQL das migrações sem conectar ao banco."""
+    context.configure(
+        url=database_url(),
+        target_metadata=target_metadata,
+        include_object=include_object,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def do_run_migrations(connection: Connection):
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_object=include_object,
+        # O SQLite não altera colunas nem restrições com ALTER TABLE.
+        render_as_batch=connection.dialect.name == "sqlite",
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def run_async_migrations():
+    engine = create_async_engine(database_url(), poolclass=pool.NullPool)
+    async with engine.connect() as connection:
+        await connection.run_sync(do_run_migrations)
+    await engine.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    asyncio.run(run_async_migrations())
@@ -0,0 +1,68 @@
+"""Esquema inicial: tabela reviews, como criada pelo antigo create_tables.py.
+
+Bancos criados pelo create_tables.py já têm este esquema e devem ser
+marcados com `alembic stamp 0001` antes do primeiro `alembic upgrade`.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0001"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Colunas com índice próprio no esquema inicial.
+INDEXED_COLUMNS = (
+    "id",
+    "customer_name",
+    "review_text",
+    "evaluation_date",
+    "created_at",
+    "sentiment",
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "reviews",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("customer_name", sa.String(length=255), nullable=False),
+        sa.Column("review_text", sa.String(length=5000), nullable=False),
+        sa.Column("evaluation_date", sa.Date(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.Column(
+            "sentiment",
+            sa.Enum(
+                "POSITIVE", "NEUTRAL", "NEGATIVE", name="sentiments_enum"
+            ),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    for column in INDEXED_COLUMNS:
+        op.create_index(f"ix_reviews_{column}", "reviews", [column])
+
+
+def downgrade() -> None:
+    for column in INDEXED_COLUMNS:
+        op.drop_index(f"ix_reviews_{column}", table_name="reviews")
+    op.drop_table("reviews")
+    sa.Enum(name="sentiments_enum").drop(op.get_bind(), checkfirst=True)
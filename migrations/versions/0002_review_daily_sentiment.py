@@ -0,0 +1,50 @@
+"""Resumo diário por sentimento (review_daily_sentiment).
+
+A tabela é preenchida a partir das avaliações existentes.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "review_daily_sentiment",
+        sa.Column("evaluation_date", sa.Date(), nullable=False),
+        sa.Column(
+            "sentiment",
+            # O tipo já existe no PostgreSQL, criado com a tabela reviews.
+            postgresql.ENUM(
+                "POSITIVE",
+                "NEUTRAL",
+                "NEGATIVE",
+                name="sentiments_enum",
+                create_type=False,
+            ),
+            nullable=False,
+        ),
+        sa.Column("review_count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("evaluation_date", "sentiment"),
+    )
+    op.execute(
+        "INSERT INTO review_daily_sentiment "
+        "(evaluation_date, sentiment, review_count) "
+        "SELECT evaluation_date, sentiment, COUNT(*) FROM reviews "
+        "GROUP BY evaluation_date, sentiment"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("review_daily_sentiment")
@@ -0,0 +1,74 @@
+"""Busca de texto completo em review_text, no lugar do índice B-tree.
+
+No PostgreSQL, coluna `tsvector` gerada com índice GIN; no SQLite, tabela
+FTS5 de conteúdo externo mantida por triggers. O SQL é o mesmo de
+`SEARCH_DDL` em app/models/review.py, copiado para que a migração não
+mude junto com o modelo.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "0003"
+down_revision: Union[str, Sequence[str], None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+UPGRADE = {
+    "postgresql": [
+        "ALTER TABLE reviews ADD COLUMN search_vector tsvector "
+        "GENERATED ALWAYS AS (to_tsvector('portuguese', review_text)) "
+        "STORED",
+        "CREATE INDEX ix_reviews_search_vector ON reviews "
+        "USING GIN (search_vector)",
+    ],
+    "sqlite": [
+        "CREATE VIRTUAL TABLE reviews_fts USING fts5(review_text, "
+        "content='reviews', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2')",
+        "CREATE TRIGGER reviews_fts_insert AFTER INSERT ON reviews BEGIN "
+        "INSERT INTO reviews_fts (rowid, review_text) "
+        "VALUES (new.id, new.review_text); END",
+        "CREATE TRIGGER reviews_fts_delete AFTER DELETE ON reviews BEGIN "
+        "INSERT INTO reviews_fts (reviews_fts, rowid, review_text) "
+        "VALUES ('delete', old.id, old.review_text); END",
+        "CREATE TRIGGER reviews_fts_update AFTER UPDATE OF review_text "
+        "ON reviews BEGIN "
+        "INSERT INTO reviews_fts (reviews_fts, rowid, review_text) "
+        "VALUES ('delete', old.id, old.review_text); "
+        "INSERT INTO reviews_fts (rowid, review_text) "
+        "VALUES (new.id, new.review_text); END",
+        # Indexa as avaliações já existentes.
+        "INSERT INTO reviews_fts (reviews_fts) VALUES ('rebuild')",
+    ],
+}
+
+DOWNGRADE = {
+    "postgresql": [
+        "DROP INDEX ix_reviews_search_vector",
+        "ALTER TABLE reviews DROP COLUMN search_vector",
+    ],
+    "sqlite": [
+        "DROP TRIGGER reviews_fts_insert",
+        "DROP TRIGGER reviews_fts_delete",
+        "DROP TRIGGER reviews_fts_update",
+        "DROP TABLE reviews_fts",
+    ],
+}
+
+
+def upgrade() -> None:
+    op.drop_index("ix_reviews_review_text", table_name="reviews")
+    for statement in UPGRADE.get(op.get_bind().dialect.name, []):
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    for statement in DOWNGRADE.get(op.get_bind().dialect.name, []):
+        op.execute(statement)
+    op.create_index("ix_reviews_review_text", "reviews", ["review_text"])
@@ -0,0 +1,67 @@
+"""Revisão dos índices de reviews.
+
+Remove os índices de coluna única que nenhuma consulta usa ou que são
+prefixo de um composto (id já é a chave primária; sentiment tem só três
+valores; created_at não é filtrado) e cria:
+
+- (evaluation_date, sentiment): filtros por intervalo e sentimento e o
+  GROUP BY da reconstrução do resumo diário, apenas com o índice;
+- (evaluation_date DESC, id DESC): a ordem da paginação por chave da
+  listagem e da exportação;
+- (customer_name, evaluation_date DESC, id DESC): o filtro por cliente na
+  mesma ordem.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0004"
+down_revision: Union[str, Sequence[str], None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DROPPED_COLUMNS = (
+    "id",
+    "customer_name",
+    "evaluation_date",
+    "created_at",
+    "sentiment",
+)
+
+
+def upgrade() -> None:
+    for column in DROPPED_COLUMNS:
+        op.drop_index(f"ix_reviews_{column}", table_name="reviews")
+    op.create_index(
+        "ix_reviews_evaluation_date_sentiment",
+        "reviews",
+        ["evaluation_date", "sentiment"],
+    )
+    op.create_index(
+        "ix_reviews_evaluation_date_id",
+        "reviews",
+        [sa.text("evaluation_date DESC"), sa.text("id DESC")],
+    )
+    op.create_index(
+        "ix_reviews_customer_name_evaluation_date_id",
+        "reviews",
+        ["customer_name", sa.text("evaluation_date DESC"), sa.text("id DESC")],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_reviews_customer_name_evaluation_date_id", table_name="reviews"
+    )
+    op.drop_index("ix_reviews_evaluation_date_id", table_name="reviews")
+    op.drop_index(
+        "ix_reviews_evaluation_date_sentiment", table_name="reviews"
+    )
+    for column in DROPPED_COLUMNS:
+        op.create_index(f"ix_reviews_{column}", "reviews", [column])
@@ -0,0 +1,115 @@
+"""Hash do conteúdo e Idempotency-Key das avaliações.
+
+Adiciona `content_hash` e `idempotency_key` com índices únicos. O hash é
+calculado para as avaliações existentes; nas duplicatas já gravadas,
+apenas a mais antiga o recebe e as demais ficam com o hash nulo. O hash
+é calculado em Python, por isso o SQL gerado com `--sql` não preenche as
+avaliações existentes. O cálculo é o de `review_content_hash` em
+app/services/idempotency.py, copiado para que a migração não mude junto
+com a aplicação.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17
+"""
+
+import hashlib
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import context, op
+
+revision: str = "0005"
+down_revision: Union[str, Sequence[str], None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+reviews = sa.table(
+    "reviews",
+    sa.column("id", sa.Integer),
+    sa.column("customer_name", sa.String),
+    sa.column("review_text", sa.String),
+    sa.column("evaluation_date", sa.Date),
+    sa.column("content_hash", sa.String),
+)
+
+
+def upgrade() -> None:
+    op.add_column(
+        "reviews", sa.Column("content_hash", sa.String(64), nullable=True)
+    )
+    op.add_column(
+        "reviews",
+        sa.Column("idempotency_key", sa.String(255), nullable=True),
+    )
+
+    if not context.is_offline_mode():
+        backfill_content_hash(op.get_bind())
+
+    op.create_index(
+        "ix_reviews_content_hash", "reviews", ["content_hash"], unique=True
+    )
+    op.create_index(
+        "ix_reviews_idempotency_key",
+        "reviews",
+        ["idempotency_key"],
+        unique=True,
+    )
+
+
+def review_content_hash(customer_name, review_text, evaluation_date) -> str:
+    """SHA-256 do cliente, do texto com espaços colapsados e da data."""
+    raw = "\x00".join((
+        customer_name.strip(),
+        " ".join(review_text.split()),
+        evaluation_date.isoformat(),
+    ))
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def backfill_content_hash(conn: sa.engine.Connection) -> None:
+    """Calcula o hash das avaliações existentes, lidas em blocos pela
+    chave primária, da mais antiga para a mais recente."""
+    statement = (
+        reviews.update()
+        .where(reviews.c.id == sa.bindparam("review_id"))
+        .values(content_hash=sa.bindparam("key"))
+    )
+    seen = set()
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(
+                reviews.c.id,
+                reviews.c.customer_name,
+                reviews.c.review_text,
+                reviews.c.evaluation_date,
+            )
+            .where(reviews.c.id > last_id)
+            .order_by(reviews.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        updates = []
+        for review_id, customer_name, review_text, evaluation_date in rows:
+            key = review_content_hash(
+                customer_name, review_text, evaluation_date
+            )
+            if key not in seen:
+                seen.add(key)
+                updates.append({"review_id": review_id, "key": key})
+        if updates:
+            conn.execute(statement, updates)
+        last_id = rows[-1].id
+
+
+def downgrade() -> None:
+    op.drop_index("ix_reviews_idempotency_key", table_name="reviews")
+    op.drop_index("ix_reviews_content_hash", table_name="reviews")
+    # Fora do modo batch: no SQLite, recriar a tabela removeria os
+    # triggers da busca de texto completo.
+    op.drop_column("reviews", "idempotency_key")
+    op.drop_column("reviews", "content_hash")
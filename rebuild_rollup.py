@@ -0,0 +1,28 @@
+"""Recalcula o resumo diário de sentimentos (review_daily_sentiment).
+
+Uso:
+    python rebuild_rollup.py
+    python rebuild_rollup.py --start-date 2024-01-01 --end-date 2024-12-31
+"""
+
+import argparse
+import asyncio
+from datetime import date
+
+from app.crud.review import rebuild_daily_sentiment
+from app.database import AsyncSessionLocal, engine
+
+
+async def rebuild(start_date, end_date):
+    async with AsyncSessionLocal() as db:
+        rows = await rebuild_daily_sentiment(db, start_date, end_date)
+    await engine.dispose()
+    print(f"{rows} linhas gravadas no resumo diário.")
+
+
+parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+parser.add_argument("--start-date", type=date.fromisoformat)
+parser.add_argument("--end-date", type=date.fromisoformat)
+args = parser.parse_args()
+
+asyncio.run(rebuild(args.start_date, args.end_date))
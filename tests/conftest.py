@@ -0,0 +1,35 @@
+"""Configuração compartilhada dos testes."""
+
+import os
+
+# Banco SQLite em memória (aiosqlite) como substituto do PostgreSQL.
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
+
+import pytest  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine  # noqa: E402,E501
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from app.database import Base  # noqa: E402
+from app.models.review import Review  # noqa: E402,F401
+
+
+@pytest.fixture
+def anyio_backend():
+    """Executa os testes assíncronos com asyncio."""
+    return "asyncio"
+
+
+@pytest.fixture
+async def db_session(anyio_backend):
+    """Retorna uma sessão assíncrona sobre um SQLite em memória vazio."""
+    engine = create_async_engine(
+        "sqlite+aiosqlite://",
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        yield session
+
+    await engine.dispose()
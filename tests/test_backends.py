@@ -0,0 +1,63 @@
+"""Testes dos backends de inferência do classificador."""
+
+import pytest
+
+from app.services.backends import StubBackend, create_backend
+
+
+def test_stub_backend_deterministico():
+    """
+    Testa se o backend de testes pontua textos de forma determinística.
+
+    Asserts:
+        Textos positivos, negativos e mistos recebem o rótulo e a
+        confiança esperados, sempre os mesmos.
+    """
+    backend = create_backend("stub")
+    backend.load()
+    textos = [
+        "Atendimento excelente e rápido.",
+        "Péssimo, não ajudaram em nada.",
+        "Bom atendimento, mas não ajudou.",
+    ]
+
+    previsoes = backend.predict(textos)
+
+    assert previsoes == [
+        ("positive", 0.95),
+        ("negative", 0.95),
+        ("positive", 0.6),
+    ]
+    assert backend.predict(textos) == previsoes
+
+
+def test_backend_registra_metricas():
+    """
+    Testa as métricas de carga e de latência por lote.
+
+    Asserts:
+        O tempo de carga, os lotes e os itens pontuados são registrados.
+    """
+    backend = StubBackend()
+    backend.load()
+    backend.predict(["bom", "ruim"])
+    backend.predict([])
+
+    stats = backend.get_stats()
+    assert stats["backend"] == "stub"
+    assert stats["load_seconds"] is not None
+    assert stats["memory_bytes"] >= 0
+    assert stats["batches"] == 1
+    assert stats["items"] == 2
+    assert stats["average_batch_seconds"] is not None
+
+
+def test_backend_desconhecido():
+    """
+    Testa a configuração de um backend inexistente.
+
+    Asserts:
+        É lançado ValueError.
+    """
+    with pytest.raises(ValueError):
+        create_backend("onnx")
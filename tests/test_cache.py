@@ -0,0 +1,94 @@
+"""Testes do cache de classificações."""
+
+import pytest
+
+from app.services.cache import (
+    ClassificationCache,
+    InMemoryRedisClient,
+    RedisCacheBackend,
+    SQLiteCacheBackend,
+    build_cache_backend,
+)
+
+
+def test_lru_remove_entrada_menos_usada():
+    """
+    Testa a remoção por LRU quando a camada em memória está cheia.
+
+    Asserts:
+        A entrada menos usada é removida e a remoção é contabilizada.
+    """
+    cache = ClassificationCache("v1", max_size=2)
+    cache.set("a", "positive")
+    cache.set("b", "negative")
+    cache.get("a")
+    cache.set("c", "neutral")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "positive"
+    assert cache.get("c") == "neutral"
+    stats = cache.get_stats()
+    assert stats["evictions"] == 1
+    assert stats["hits"] == 3
+    assert stats["misses"] == 1
+    assert stats["size"] == 2
+
+
+def test_chave_ignora_espacos_e_depende_da_versao():
+    """
+    Testa a chave do cache normalizada e versionada.
+
+    Asserts:
+        Textos que diferem só em espaços compartilham a chave e uma
+        versão diferente do classificador gera outra chave.
+    """
+    cache = ClassificationCache("v1", max_size=10)
+
+    assert cache.make_key("  Muito   bom ") == cache.make_key("Muito bom")
+    assert cache.make_key("Muito bom") != ClassificationCache(
+        "v2", max_size=10
+    ).make_key("Muito bom")
+
+
+@pytest.mark.parametrize(
+    "criar_backend",
+    [
+        lambda tmp_path: SQLiteCacheBackend(str(tmp_path / "cache.sqlite3")),
+        lambda tmp_path: RedisCacheBackend(InMemoryRedisClient()),
+    ],
+    ids=["sqlite", "redis"],
+)
+def test_camada_persistente_reabastece_memoria(tmp_path, criar_backend):
+    """
+    Testa a leitura da camada persistente após a perda da camada em memória.
+
+    Args:
+        tmp_path (Path): Diretório temporário do pytest.
+        criar_backend (Callable): Fábrica do backend testado.
+
+    Asserts:
+        Um novo cache com o mesmo backend encontra a entrada gravada.
+    """
+    backend = criar_backend(tmp_path)
+    ClassificationCache("v1", max_size=10, backend=backend).set(
+        "texto", "neutral"
+    )
+
+    cache = ClassificationCache("v1", max_size=10, backend=backend)
+
+    assert cache.get("texto") == "neutral"
+    assert cache.get("texto") == "neutral"
+    stats = cache.get_stats()
+    assert stats["backend_hits"] == 1
+    assert stats["hits"] == 1
+
+
+def test_build_cache_backend_desconhecido():
+    """
+    Testa a configuração de um backend inexistente.
+
+    Asserts:
+        É lançado ValueError.
+    """
+    with pytest.raises(ValueError):
+        build_cache_backend("memcached", None)
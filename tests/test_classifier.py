@@ -1,5 +1,13 @@
+from unittest.mock import patch
+
 import pytest
-from app.services.classifier import classify_sentiment, sentiment_classifier
+from app.services.classifier import (
+    classify_sentiment,
+    classify_sentiment_async,
+    classify_sentiment_batch,
+    sentiment_classifier,
+)
+from app.services.matcher import normalize_text
 
 CASOS = [
     # POSITIVAS
@@ -92,6 +100,172 @@ def test_acuracia_geral_e_por_categoria():
             )
 
 
+def contar_expressoes(texto: str, expressoes) -> int:
+    """Referência do `LexiconMatcher`: varre o texto uma vez por
+    expressão e conta as que têm todas as palavras no texto."""
+    texto = normalize_text(texto)
+    return sum(
+        all(palavra in texto for palavra in normalize_text(expressao).split())
+        for expressao in expressoes
+    )
+
+
+def tem_contradicao(texto: str, palavras) -> bool:
+    """Referência do `LexiconMatcher` para as palavras de contradição."""
+    texto = normalize_text(texto)
+    return any(palavra in texto for palavra in palavras)
+
+
+@pytest.mark.parametrize("nome,texto,esperado", CASOS)
+def test_matcher_equivale_contagem_original(nome: str, texto: str, esperado: str):  # noqa: E501
+    """
+    Testa se o matcher compilado produz as mesmas contagens que a
+    varredura por expressão de `contar_expressoes` e `tem_contradicao`.
+
+    Args:
+        nome (str): Nome do caso de teste (para referência).
+        texto (str): Texto da avaliação.
+        esperado (str): Sentimento esperado (não utilizado).
+
+    Asserts:
+        As contagens e a flag de contradição coincidem com as originais.
+    """
+    c = sentiment_classifier
+    esperado_matcher = {
+        "very_positive": contar_expressoes(texto, c.very_positive),
+        "very_negative": contar_expressoes(texto, c.very_negative),
+        "neutral_indicators": contar_expressoes(texto, c.neutral_indicators),  # noqa: E501
+        "weakening_words": contar_expressoes(texto, c.weakening_words),
+        "has_contradiction": tem_contradicao(texto, c.contradiction_words),
+    }
+
+    assert c.matcher.match(normalize_text(texto)) == esperado_matcher
+
+
+def test_classificacao_em_lote_igual_individual():
+    """
+    Testa se a classificação em lote produz o mesmo resultado que a
+    classificação individual de cada texto.
+
+    Asserts:
+        Os sentimentos em lote coincidem com os individuais, na mesma ordem.
+    """
+    textos = [texto for _, texto, _ in CASOS]
+
+    resultados_lote = classify_sentiment_batch(textos)
+
+    assert resultados_lote == [classify_sentiment(t) for t in textos]
+
+
+@pytest.mark.anyio
+async def test_classificacao_assincrona_igual_sincrona():
+    """
+    Testa se a classificação pelo executor dedicado coincide com a
+    classificação síncrona.
+
+    Asserts:
+        Os sentimentos assíncronos coincidem com os síncronos.
+    """
+    for _, texto, _ in CASOS[:5]:
+        assert await classify_sentiment_async(texto) == classify_sentiment(texto)  # noqa: E501
+
+
+def test_regras_decidem_sem_executar_modelo():
+    """
+    Testa se textos decididos pelas regras não executam o modelo Flair.
+
+    Asserts:
+        O modelo não é chamado e o caminho rápido é contabilizado.
+    """
+    antes = sentiment_classifier.get_stats()
+
+    with patch.object(sentiment_classifier, "predict_model") as mock_predict:
+        resultado = classify_sentiment(
+            "Atendimento péssimo, horrível e inaceitável."
+        )
+
+    mock_predict.assert_not_called()
+    assert resultado == "negative"
+    depois = sentiment_classifier.get_stats()
+    assert depois["fast_path"] == antes["fast_path"] + 1
+    assert depois["model_path"] == antes["model_path"]
+
+
+def test_texto_longo_pontuado_por_sentencas_no_orcamento():
+    """
+    Testa o modo de textos longos: as sentenças dentro do orçamento de
+    tokens são pontuadas em uma única chamada ao modelo.
+
+    Asserts:
+        O modelo é chamado uma vez, com sentenças que somam no máximo o
+        orçamento, e a latência é contabilizada na faixa de textos longos.
+    """
+    texto = " ".join(
+        f"Abri o chamado número {i} na segunda-feira." for i in range(40)
+    )
+
+    with patch(
+        "app.services.classifier.CLASSIFIER_MAX_TOKENS_PER_REVIEW", 20
+    ), patch.object(
+        sentiment_classifier,
+        "predict_model",
+        side_effect=lambda textos, _: [("positive", 0.95)] * len(textos),
+    ) as mock_predict:
+        resultado = sentiment_classifier.classify_batch(
+            [texto], check_cache=False
+        )
+
+    mock_predict.assert_called_once()
+    [sentencas, _] = mock_predict.call_args.args
+    assert len(sentencas) == 3
+    assert sum(len(s.split()) for s in sentencas) == 20
+    assert resultado == ["positive"]
+    assert "<=2500" in sentiment_classifier.get_stats()["latency_by_length"]
+
+
+def test_texto_longo_regras_analisam_texto_inteiro():
+    """
+    Testa que o orçamento de tokens limita só o modelo: um padrão neutro
+    depois do corte ainda é encontrado pelas regras.
+
+    Asserts:
+        O texto é classificado como neutro pelas regras, sem o modelo.
+    """
+    texto = " ".join(
+        f"Abri o chamado número {i} na segunda-feira." for i in range(40)
+    ) + " O atendente foi educado, mas não conseguiu resolver."
+
+    with patch(
+        "app.services.classifier.CLASSIFIER_MAX_TOKENS_PER_REVIEW", 20
+    ), patch.object(
+        sentiment_classifier,
+        "predict_model",
+        side_effect=lambda textos, _: [("positive", 0.95)] * len(textos),
+    ) as mock_predict:
+        resultado = sentiment_classifier.classify_batch(
+            [texto], check_cache=False
+        )
+
+    mock_predict.assert_not_called()
+    assert resultado == ["neutral"]
+
+
+def test_cache_evita_reclassificacao():
+    """
+    Testa se um texto já classificado é servido pelo cache.
+
+    Asserts:
+        A segunda classificação não executa as heurísticas nem o modelo.
+    """
+    texto = "Suporte mediano, resolveram depois de alguns dias."
+    esperado = classify_sentiment(texto)
+
+    with patch.object(sentiment_classifier, "analyze_heuristics") as mock_analyze:  # noqa: E501
+        assert classify_sentiment(f"  {texto} ") == esperado
+
+    mock_analyze.assert_not_called()
+
+
 ORIGINAIS = [
     ("Ana Silva", "O atendimento foi rápido e eficiente, mas senti que poderia ser mais detalhado em alguns pontos técnicos. Por exemplo, ao explicar a falha que ocorreu, o atendente não conseguiu detalhar a causa raiz do problema, o que me deixou com dúvidas sobre o que realmente aconteceu. No geral, foi uma experiência satisfatória, mas acredito que poderia ser mais completa.", "neutral"),  # noqa: E501
     ("Bruno Souza", "Estou extremamente satisfeito com o suporte! Resolveram meu problema de forma ágil e com clareza nas explicações. Além de resolverem o erro no sistema que estava impedindo a execução de uma função crítica para o meu negócio, eles ainda sugeriram melhorias para evitar que o problema ocorresse novamente. O atendimento foi muito acima do esperado!", "positive"),  # noqa: E501
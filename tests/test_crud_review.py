@@ -1,11 +1,16 @@
 import pytest
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, patch
 from datetime import date
 
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import asyncpg
+
+from app.models.review import ReviewDailySentiment
 from app.schemas.review import ReviewBase, SentimentsEnum
-from app.models.review import Review
 import app.crud.review as crud
 
+pytestmark = pytest.mark.anyio
+
 
 @pytest.fixture
 def fake_review_data():
@@ -17,112 +22,296 @@ def fake_review_data():
     )
 
 
-@pytest.fixture
-def mock_db():
-    """Retorna uma sessão de banco mockada com métodos básicos."""
-    db = MagicMock()
-    db.add = MagicMock()
-    db.commit = MagicMock()
-    db.refresh = MagicMock()
-    db.query = MagicMock()
-    return db
+def review_data(text, evaluation_date):
+    """Cria um ReviewBase com o texto e a data informados."""
+    return ReviewBase(
+        customer_name="Cliente1",
+        review_text=text,
+        evaluation_date=evaluation_date,
+    )
 
 
 class TestCRUDReview:
     """Testes para as operações CRUD de avaliações."""
 
-    def test_create_review_success(self, mock_db, fake_review_data):
+    async def test_create_review_success(self, db_session, fake_review_data):
         """Testa criação correta de avaliação com sentimento mockado."""
-        crud.classify_sentiment = MagicMock(return_value=SentimentsEnum.POSITIVE.value)  # noqa: E501
+        with patch.object(crud, "classify_sentiment_async", AsyncMock(return_value=SentimentsEnum.POSITIVE.value)) as mock_classify:  # noqa: E501
+            review = await crud.create_review(db_session, fake_review_data)
 
-        review = crud.create_review(mock_db, fake_review_data)
-
-        crud.classify_sentiment.assert_called_once_with(fake_review_data.review_text)  # noqa: E501
-        mock_db.add.assert_called_once_with(review)
-        mock_db.commit.assert_called_once()
-        mock_db.refresh.assert_called_once_with(review)
-        assert review.sentiment == SentimentsEnum.POSITIVE.value
+        mock_classify.assert_awaited_once_with(fake_review_data.review_text)  # noqa: E501
+        assert review.id is not None
+        assert review.sentiment == SentimentsEnum.POSITIVE
         assert review.customer_name == fake_review_data.customer_name
 
-    def test_create_review_invalid_sentiment_raises(self, mock_db, fake_review_data):  # noqa: E501
-        """Testa erro ao classificar sentimento (simulado)."""
-        crud.classify_sentiment = MagicMock(side_effect=ValueError("Erro na classificação"))  # noqa: E501
+    async def test_create_review_with_precomputed_sentiment(self, db_session, fake_review_data):  # noqa: E501
+        """Testa que o sentimento já classificado não é recalculado."""
+        with patch.object(crud, "classify_sentiment_async", AsyncMock()) as mock_classify:  # noqa: E501
+            review = await crud.create_review(
+                db_session, fake_review_data, SentimentsEnum.NEUTRAL.value
+            )
 
-        with pytest.raises(ValueError):
-            crud.create_review(mock_db, fake_review_data)
+        mock_classify.assert_not_awaited()
+        assert review.sentiment == SentimentsEnum.NEUTRAL
 
-    def test_get_reviews_no_filters(self, mock_db):
-        """Testa obtenção de todas avaliações sem filtro."""
-        fake_reviews = [
-            Review(
-                id=1,
-                customer_name="Cliente1",
-                review_text="bom",
-                evaluation_date=date(2024, 7, 1),
-                sentiment=SentimentsEnum.POSITIVE.value,
+    async def test_create_reviews_single_commit(self, db_session, fake_review_data):  # noqa: E501
+        """Testa criação em lote com um único commit."""
+        items = [
+            (fake_review_data, SentimentsEnum.POSITIVE.value),
+            (review_data("Outro texto", date(2024, 8, 1)), SentimentsEnum.NEGATIVE.value),  # noqa: E501
+        ]
+
+        with patch.object(db_session, "commit", wraps=db_session.commit) as mock_commit:  # noqa: E501
+            reviews = await crud.create_reviews(db_session, items)
+
+        mock_commit.assert_awaited_once()
+        assert all(r.id is not None for r in reviews)
+        assert [r.sentiment for r in reviews] == [
+            SentimentsEnum.POSITIVE,
+            SentimentsEnum.NEGATIVE,
+        ]
+
+    async def test_create_review_without_refresh(self, db_session, fake_review_data):  # noqa: E501
+        """Testa que as datas geradas pelo banco vêm do próprio INSERT."""
+        with patch.object(db_session, "refresh") as mock_refresh:
+            review = await crud.create_review(
+                db_session, fake_review_data, SentimentsEnum.POSITIVE.value
+            )
+
+        mock_refresh.assert_not_called()
+        assert review.created_at is not None
+        assert review.updated_at is not None
+
+    async def test_create_reviews_bulk_commits_per_chunk(self, db_session, fake_review_data):  # noqa: E501
+        """Testa a inserção em blocos, com um commit por bloco."""
+        items = [
+            (review_data(f"Texto {i}", date(2024, 8, 1)), SentimentsEnum.POSITIVE.value)  # noqa: E501
+            for i in range(5)
+        ]
+
+        with patch.object(db_session, "commit", wraps=db_session.commit) as mock_commit:  # noqa: E501
+            reviews = await crud.create_reviews_bulk(
+                db_session, items, chunk_size=2
             )
+
+        assert mock_commit.await_count == 3
+        ids = [r.id for r in reviews]
+        assert ids == sorted(ids) and len(set(ids)) == 5
+        assert all(r.created_at is not None for r in reviews)
+        assert len(await crud.get_reviews(db_session)) == 5
+
+    async def test_create_reviews_bulk_failed_chunk(self, db_session, fake_review_data):  # noqa: E501
+        """Testa que um bloco com falha é desfeito e os anteriores são
+        mantidos."""
+        outra = review_data("Outro texto", date(2024, 8, 1))
+        # O terceiro item repete o conteúdo do primeiro, e o índice único
+        # de `content_hash` faz o segundo bloco falhar.
+        items = [
+            (fake_review_data, SentimentsEnum.POSITIVE.value),
+            (outra, SentimentsEnum.POSITIVE.value),
+            (fake_review_data, SentimentsEnum.POSITIVE.value),
         ]
-        query_mock = MagicMock()
-        query_mock.filter.return_value = query_mock
-        query_mock.order_by.return_value.all.return_value = fake_reviews
-        mock_db.query.return_value = query_mock
 
-        results = crud.get_reviews(mock_db)
-        assert results == fake_reviews
+        with pytest.raises(crud.BulkInsertError) as excinfo:
+            await crud.create_reviews_bulk(db_session, items, chunk_size=2)
+
+        assert len(excinfo.value.created) == 2
+        assert len(await crud.get_reviews(db_session)) == 2
+
+    async def test_create_review_duplicate_content(self, db_session, fake_review_data):  # noqa: E501
+        """Testa o índice único do hash do conteúdo e da Idempotency-Key."""
+        original = await crud.create_review(
+            db_session, fake_review_data, SentimentsEnum.POSITIVE.value, "k1"
+        )
+        reenvio = fake_review_data.model_copy(update={
+            "review_text": "  Texto de teste   para avaliação. ",
+        })
+        outra = review_data("Outro texto", date(2024, 8, 1))
 
-    def test_get_reviews_with_filters(self, mock_db):
+        with pytest.raises(crud.DuplicateReviewError) as por_conteudo:
+            await crud.create_review(
+                db_session, reenvio, SentimentsEnum.NEGATIVE.value
+            )
+        with pytest.raises(crud.DuplicateReviewError) as por_chave:
+            await crud.create_review(
+                db_session, outra, SentimentsEnum.NEGATIVE.value, "k1"
+            )
+
+        assert por_conteudo.value.existing.id == original.id
+        assert por_chave.value.existing.id == original.id
+        assert len(await crud.get_reviews(db_session)) == 1
+        encontradas = await crud.get_reviews_by_content_hash(
+            db_session, [crud.content_hash(reenvio)]
+        )
+        assert list(encontradas.values())[0].id == original.id
+
+    async def test_create_review_invalid_sentiment_raises(self, db_session, fake_review_data):  # noqa: E501
+        """Testa erro ao classificar sentimento (simulado)."""
+        with patch.object(crud, "classify_sentiment_async", AsyncMock(side_effect=ValueError("Erro na classificação"))):  # noqa: E501
+            with pytest.raises(ValueError):
+                await crud.create_review(db_session, fake_review_data)
+
+    async def test_get_reviews_no_filters(self, db_session):
+        """Testa obtenção de todas avaliações sem filtro."""
+        await crud.create_reviews(db_session, [
+            (review_data("bom", date(2024, 7, 1)), SentimentsEnum.POSITIVE.value),  # noqa: E501
+            (review_data("ruim", date(2024, 7, 3)), SentimentsEnum.NEGATIVE.value),  # noqa: E501
+        ])
+
+        results = await crud.get_reviews(db_session)
+
+        assert [r.review_text for r in results] == ["ruim", "bom"]
+
+    async def test_get_reviews_with_filters(self, db_session):
         """Testa obtenção de avaliações com filtro de datas."""
-        fake_reviews = []
-        query_mock = MagicMock()
-        query_mock.filter.return_value = query_mock
-        query_mock.order_by.return_value.all.return_value = fake_reviews
-        mock_db.query.return_value = query_mock
+        await crud.create_reviews(db_session, [
+            (review_data("antes", date(2023, 12, 31)), SentimentsEnum.POSITIVE.value),  # noqa: E501
+            (review_data("dentro", date(2024, 6, 1)), SentimentsEnum.NEUTRAL.value),  # noqa: E501
+            (review_data("depois", date(2025, 1, 1)), SentimentsEnum.NEGATIVE.value),  # noqa: E501
+        ])
 
         start = date(2024, 1, 1)
         end = date(2024, 12, 31)
-        results = crud.get_reviews(mock_db, start_date=start, end_date=end)
-        assert results == fake_reviews
-        # Verifica se filtros foram aplicados
-        assert query_mock.filter.call_count >= 2
+        results = await crud.get_reviews(db_session, start_date=start, end_date=end)  # noqa: E501
+        assert [r.review_text for r in results] == ["dentro"]
 
-    def test_get_review_by_id_found(self, mock_db):
-        """Testa busca de avaliação existente por ID."""
-        fake_review = Review(
-            id=1,
+    async def test_get_reviews_keyset_pagination(self, db_session):
+        """Testa a paginação por cursor, inclusive com datas repetidas."""
+        await crud.create_reviews(db_session, [
+            (review_data(f"r{i}", date(2024, 7, 1 + i // 2)), SentimentsEnum.POSITIVE.value)  # noqa: E501
+            for i in range(5)
+        ])
+
+        pages = []
+        after = None
+        while True:
+            page = await crud.get_reviews(db_session, limit=2, after=after)
+            if not page:
+                break
+            pages.append([r.review_text for r in page])
+            cursor = crud.encode_cursor(page[-1].evaluation_date, page[-1].id)  # noqa: E501
+            after = crud.decode_cursor(cursor)
+
+        assert pages == [["r4", "r3"], ["r2", "r1"], ["r0"]]
+
+    async def test_get_reviews_filters_sentiment_and_customer(self, db_session):  # noqa: E501
+        """Testa os filtros por sentimento e por nome do cliente."""
+        outro = ReviewBase(
+            customer_name="Cliente2",
+            review_text="outro",
+            evaluation_date=date(2024, 7, 2),
+        )
+        await crud.create_reviews(db_session, [
+            (review_data("bom", date(2024, 7, 1)), SentimentsEnum.POSITIVE.value),  # noqa: E501
+            (review_data("ruim", date(2024, 7, 3)), SentimentsEnum.NEGATIVE.value),  # noqa: E501
+            (outro, SentimentsEnum.POSITIVE.value),
+        ])
+
+        results = await crud.get_reviews(
+            db_session,
+            sentiment=SentimentsEnum.POSITIVE,
             customer_name="Cliente1",
-            review_text="bom",
-            evaluation_date=date(2024, 7, 1),
-            sentiment=SentimentsEnum.POSITIVE.value,
         )
-        query_mock = MagicMock()
-        query_mock.filter.return_value.first.return_value = fake_review
-        mock_db.query.return_value = query_mock
+        total = await crud.count_reviews(
+            db_session, sentiment=SentimentsEnum.POSITIVE
+        )
 
-        review = crud.get_review_by_id(mock_db, 1)
-        assert review == fake_review
+        assert [r.review_text for r in results] == ["bom"]
+        assert total == 2
 
-    def test_get_review_by_id_not_found(self, mock_db):
-        """Testa busca de avaliação inexistente por ID."""
-        query_mock = MagicMock()
-        query_mock.filter.return_value.first.return_value = None
-        mock_db.query.return_value = query_mock
+    async def test_stream_reviews_in_chunks(self, db_session):
+        """Testa a leitura em blocos de colunas, da mais antiga à mais
+        recente."""
+        await crud.create_reviews(db_session, [
+            (review_data(f"r{i}", date(2024, 7, 5 - i)), SentimentsEnum.NEUTRAL.value)  # noqa: E501
+            for i in range(5)
+        ])
 
-        review = crud.get_review_by_id(mock_db, 999)
-        assert review is None
+        chunks = [
+            list(rows)
+            async for rows in crud.stream_reviews(db_session, chunk_size=2)
+        ]
 
-    def test_get_review_report(self, mock_db):
-        """Testa geração do relatório de sentimentos."""
-        results_from_db = [
-            (SentimentsEnum.POSITIVE, 10),
-            (SentimentsEnum.NEUTRAL, 5),
-            (SentimentsEnum.NEGATIVE, 3),
+        assert [len(rows) for rows in chunks] == [2, 2, 1]
+        rows = [row for chunk in chunks for row in chunk]
+        assert [row.review_text for row in rows] == ["r4", "r3", "r2", "r1", "r0"]  # noqa: E501
+        assert rows[0].sentiment == SentimentsEnum.NEUTRAL
+
+    async def test_search_reviews_ranked_and_filtered(self, db_session):
+        """Testa a busca de texto completo com filtros, relevância e
+        paginação."""
+        await crud.create_reviews(db_session, [
+            (review_data("Boleto veio errado, boleto de novo errado", date(2024, 7, 1)), SentimentsEnum.NEGATIVE.value),  # noqa: E501
+            (review_data("Não consegui pagar o BOLETO", date(2024, 7, 2)), SentimentsEnum.NEGATIVE.value),  # noqa: E501
+            (review_data("Boleto pago sem problemas", date(2024, 7, 3)), SentimentsEnum.POSITIVE.value),  # noqa: E501
+            (review_data("Atendimento rápido", date(2024, 7, 4)), SentimentsEnum.POSITIVE.value),  # noqa: E501
+        ])
+
+        results = await crud.search_reviews(
+            db_session, "boleto", sentiment=SentimentsEnum.NEGATIVE
+        )
+        second_page = await crud.search_reviews(
+            db_session, "boleto", limit=2, offset=2
+        )
+        filtered = await crud.search_reviews(
+            db_session, "boleto", start_date=date(2024, 7, 2),
+            end_date=date(2024, 7, 2),
+        )
+
+        assert [r.evaluation_date.day for r in results] == [1, 2]
+        assert len(second_page) == 1
+        assert [r.evaluation_date.day for r in filtered] == [2]
+        assert await crud.search_reviews(db_session, "nao consegui") == [filtered[0]]  # noqa: E501
+        assert await crud.search_reviews(db_session, 'boleto" OR "rápido') == []  # noqa: E501
+        assert await crud.search_reviews(db_session, "   ") == []
+
+    def test_explain_keeps_bound_parameters(self):
+        """Testa que o EXPLAIN da contagem no PostgreSQL envia os filtros
+        como parâmetros, sem interpretar `:nome` dentro dos valores."""
+        conditions = crud._review_filters(
+            None, None, SentimentsEnum.POSITIVE, "Loja :matriz 100%"
+        )
+        compiled = crud.Explain(
+            select(crud.Review.id).where(*conditions)
+        ).compile(dialect=asyncpg.dialect())
+
+        assert compiled.string.startswith("EXPLAIN (FORMAT JSON) SELECT")
+        assert "matriz" not in compiled.string
+        assert [compiled.params[name] for name in compiled.positiontup] == [
+            SentimentsEnum.POSITIVE,
+            "Loja :matriz 100%",
         ]
 
-        query_mock = MagicMock()
-        query_mock.filter.return_value.group_by.return_value = results_from_db
-        mock_db.query.return_value = query_mock
+    def test_decode_cursor_invalid(self):
+        """Testa a rejeição de um cursor malformado."""
+        with pytest.raises(ValueError):
+            crud.decode_cursor("nao-e-um-cursor")
+
+    async def test_get_review_by_id_found(self, db_session):
+        """Testa busca de avaliação existente por ID."""
+        [created] = await crud.create_reviews(db_session, [
+            (review_data("bom", date(2024, 7, 1)), SentimentsEnum.POSITIVE.value),  # noqa: E501
+        ])
+
+        review = await crud.get_review_by_id(db_session, created.id)
+        assert review.review_text == "bom"
+
+    async def test_get_review_by_id_not_found(self, db_session):
+        """Testa busca de avaliação inexistente por ID."""
+        review = await crud.get_review_by_id(db_session, 999)
+        assert review is None
+
+    async def test_get_review_report(self, db_session):
+        """Testa geração do relatório de sentimentos."""
+        items = (
+            [(review_data(f"a{i}", date(2024, 3, 1)), SentimentsEnum.POSITIVE.value) for i in range(10)]  # noqa: E501
+            + [(review_data(f"b{i}", date(2024, 5, 1)), SentimentsEnum.NEUTRAL.value) for i in range(5)]  # noqa: E501
+            + [(review_data(f"c{i}", date(2024, 9, 1)), SentimentsEnum.NEGATIVE.value) for i in range(3)]  # noqa: E501
+            + [(review_data("d", date(2025, 1, 1)), SentimentsEnum.NEGATIVE.value)]  # noqa: E501
+        )
+        await crud.create_reviews(db_session, items)
 
-        report = crud.get_review_report(mock_db, date(2024, 1, 1), date(2024, 12, 31))  # noqa: E501
+        report = await crud.get_review_report(db_session, date(2024, 1, 1), date(2024, 12, 31))  # noqa: E501
 
         expected = {
             SentimentsEnum.POSITIVE.value: 10,
@@ -131,13 +320,54 @@ class TestCRUDReview:
         }
         assert report == expected
 
-    def test_get_review_report_empty(self, mock_db):
-        """Testa relatório vazio quando não há avaliações."""
-        query_mock = MagicMock()
-        query_mock.filter.return_value.group_by.return_value = []
-        mock_db.query.return_value = query_mock
+    async def test_daily_sentiment_updated_on_insert(self, db_session, fake_review_data):  # noqa: E501
+        """Testa a atualização do resumo diário nos caminhos individual e
+        em lote."""
+        await crud.create_review(
+            db_session, fake_review_data, SentimentsEnum.POSITIVE.value
+        )
+        await crud.create_reviews_bulk(db_session, [
+            (review_data("a", date(2024, 8, 1)), SentimentsEnum.POSITIVE.value),  # noqa: E501
+            (review_data("b", date(2024, 8, 1)), SentimentsEnum.NEGATIVE.value),  # noqa: E501
+            (review_data("x", date(2024, 8, 2)), SentimentsEnum.POSITIVE.value),  # noqa: E501
+        ], chunk_size=2)
+
+        rows = await db_session.execute(
+            select(
+                ReviewDailySentiment.evaluation_date,
+                ReviewDailySentiment.sentiment,
+                ReviewDailySentiment.review_count,
+            ).order_by(
+                ReviewDailySentiment.evaluation_date,
+                ReviewDailySentiment.sentiment,
+            )
+        )
+        assert sorted(rows.all()) == sorted([
+            (date(2024, 8, 1), SentimentsEnum.POSITIVE, 2),
+            (date(2024, 8, 1), SentimentsEnum.NEGATIVE, 1),
+            (date(2024, 8, 2), SentimentsEnum.POSITIVE, 1),
+        ])
+
+    async def test_rebuild_daily_sentiment(self, db_session):
+        """Testa a reconstrução do resumo a partir das avaliações."""
+        await crud.create_reviews(db_session, [
+            (review_data("a", date(2024, 3, 1)), SentimentsEnum.POSITIVE.value),  # noqa: E501
+            (review_data("b", date(2024, 3, 2)), SentimentsEnum.NEUTRAL.value),  # noqa: E501
+        ])
+        await db_session.execute(delete(ReviewDailySentiment))
+        await db_session.commit()
 
-        report = crud.get_review_report(mock_db, date(2024, 1, 1), date(2024, 12, 31))  # noqa: E501
+        rows = await crud.rebuild_daily_sentiment(
+            db_session, start_date=date(2024, 3, 2)
+        )
+        report = await crud.get_review_report(db_session, date(2024, 1, 1), date(2024, 12, 31))  # noqa: E501
+
+        assert rows == 1
+        assert report == {"positive": 0, "neutral": 1, "negative": 0}
+
+    async def test_get_review_report_empty(self, db_session):
+        """Testa relatório vazio quando não há avaliações."""
+        report = await crud.get_review_report(db_session, date(2024, 1, 1), date(2024, 12, 31))  # noqa: E501
         expected = {
             SentimentsEnum.POSITIVE.value: 0,
             SentimentsEnum.NEUTRAL.value: 0,
@@ -0,0 +1,75 @@
+"""Testes da configuração dos engines e das sessões de leitura e escrita."""
+
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from app.database import (
+    InstrumentedAsyncPool,
+    engine_options,
+    get_read_db,
+    get_write_db,
+)
+from app.main import app
+
+client = TestClient(app)
+
+
+def test_engine_options_sqlite_em_memoria():
+    """
+    Testa as opções de um SQLite em memória.
+
+    Asserts:
+        O pool padrão, de conexão única, é mantido.
+    """
+    assert engine_options("sqlite+aiosqlite://") == {}
+
+
+def test_engine_options_pool_e_timeout():
+    """
+    Testa as opções de pool e o tempo máximo por comando.
+
+    Asserts:
+        O pool instrumentado recebe o nome do engine e as configurações;
+        o `statement_timeout` só é enviado ao PostgreSQL.
+    """
+    postgres = engine_options(
+        "postgresql://u:s@replica/db", "reader", statement_timeout_ms=5000
+    )
+    sqlite = engine_options(
+        "sqlite:///banco.sqlite3", "writer", statement_timeout_ms=5000
+    )
+
+    assert postgres["poolclass"] is InstrumentedAsyncPool
+    assert postgres["pool_logging_name"] == "reader"
+    assert {"pool_size", "max_overflow", "pool_pre_ping"} <= set(postgres)
+    assert postgres["connect_args"] == {
+        "server_settings": {"statement_timeout": "5000"}
+    }
+    assert "connect_args" not in sqlite
+
+
+def test_rotas_get_usam_banco_de_leitura():
+    """
+    Testa a sessão usada pelas rotas de leitura e de escrita.
+
+    Asserts:
+        A listagem recebe a sessão de `get_read_db` e não a de
+        `get_write_db`.
+    """
+    async def leitura():
+        yield "sessao-leitura"
+
+    async def escrita():
+        yield "sessao-escrita"
+
+    app.dependency_overrides[get_read_db] = leitura
+    app.dependency_overrides[get_write_db] = escrita
+    try:
+        with patch("app.routers.review.get_reviews", return_value=[]) as mock_list:  # noqa: E501
+            response = client.get("/reviews/")
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert mock_list.call_args.args[0] == "sessao-leitura"
@@ -0,0 +1,112 @@
+"""Testes do hash de conteúdo e da execução única das criações."""
+
+import asyncio
+from datetime import date
+
+import pytest
+
+from app.services.idempotency import SingleFlight, review_content_hash
+
+pytestmark = pytest.mark.anyio
+
+
+def test_hash_ignora_espacamento():
+    """
+    Testa o hash do conteúdo de avaliações reenviadas.
+
+    Asserts:
+        Espaços extras não mudam o hash; outro cliente, texto ou data
+        mudam.
+    """
+    dia = date(2024, 7, 1)
+    original = review_content_hash("Ana", "Ótimo atendimento", dia)
+
+    assert review_content_hash(" Ana ", " Ótimo   atendimento\n", dia) == original  # noqa: E501
+    assert review_content_hash("Bia", "Ótimo atendimento", dia) != original
+    assert review_content_hash("Ana", "ótimo atendimento", dia) != original
+    assert review_content_hash("Ana", "Ótimo atendimento", date(2024, 7, 2)) != original  # noqa: E501
+    assert len(original) == 64
+
+
+async def test_chamadas_simultaneas_compartilham_resultado():
+    """
+    Testa chamadas simultâneas com a mesma chave.
+
+    Asserts:
+        A função é executada uma vez, só a primeira chamada recebe o
+        resultado como próprio e a chave é liberada ao final.
+    """
+    flight = SingleFlight()
+    execucoes = []
+
+    async def criar():
+        execucoes.append(1)
+        await asyncio.sleep(0.01)
+        return "avaliação"
+
+    resultados = await asyncio.gather(
+        *[flight.run("hash", criar) for _ in range(3)]
+    )
+
+    assert execucoes == [1]
+    assert resultados == [
+        ("avaliação", False), ("avaliação", True), ("avaliação", True)
+    ]
+    assert len(flight) == 0
+
+
+async def test_excecao_repassada_a_quem_aguarda():
+    """
+    Testa a falha da execução compartilhada.
+
+    Asserts:
+        Todas as chamadas recebem a exceção e uma chamada posterior
+        executa a função de novo.
+    """
+    flight = SingleFlight()
+
+    async def falhar():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("classificador indisponível")
+
+    resultados = await asyncio.gather(
+        flight.run("hash", falhar),
+        flight.run("hash", falhar),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(r, RuntimeError) for r in resultados)
+    with pytest.raises(RuntimeError):
+        await flight.run("hash", falhar)
+
+
+async def test_cancelamento_da_primeira_chamada():
+    """
+    Testa o cancelamento da chamada que executa a função, como quando o
+    cliente da primeira requisição desconecta.
+
+    Asserts:
+        Só a chamada cancelada recebe o cancelamento; uma das que
+        aguardavam executa a função e as demais recebem o seu resultado.
+    """
+    flight = SingleFlight()
+    execucoes = []
+
+    async def criar():
+        execucoes.append(1)
+        await asyncio.sleep(0.01)
+        return "avaliação"
+
+    primeira = asyncio.ensure_future(flight.run("hash", criar))
+    await asyncio.sleep(0)
+    demais = [
+        asyncio.ensure_future(flight.run("hash", criar)) for _ in range(2)
+    ]
+    await asyncio.sleep(0)
+    primeira.cancel()
+    resultados = await asyncio.gather(*demais)
+
+    assert primeira.cancelled()
+    assert execucoes == [1, 1]
+    assert resultados == [("avaliação", False), ("avaliação", True)]
+    assert len(flight) == 0
@@ -0,0 +1,78 @@
+"""Testes da divisão de textos longos e da agregação por sentença."""
+
+from app.services.long_text import (
+    aggregate_predictions,
+    fit_to_budget,
+    split_sentences,
+)
+
+
+def test_split_sentences_por_pontuacao_e_quebra_de_linha():
+    """
+    Testa a divisão em sentenças por pontuação final e quebras de linha.
+
+    Asserts:
+        Cada sentença é delimitada e trechos vazios são ignorados.
+    """
+    texto = "Abri o chamado. Ninguém respondeu!\n\nDepois resolveram"
+
+    sentencas = [texto[inicio:fim] for inicio, fim in split_sentences(texto)]
+
+    assert sentencas == ["Abri o chamado.", "Ninguém respondeu!", "Depois resolveram"]  # noqa: E501
+
+
+def test_fit_to_budget_corta_no_limite_de_tokens():
+    """
+    Testa o orçamento de tokens sobre as sentenças iniciais.
+
+    Asserts:
+        A sentença que excede o orçamento é cortada, as seguintes são
+        descartadas e a posição final aponta para o fim do corte.
+    """
+    texto = "Um dois três. Quatro cinco seis sete. Oito nove."
+
+    sentencas, fim = fit_to_budget(texto, 5)
+
+    assert sentencas == ["Um dois três.", "Quatro cinco"]
+    assert texto[:fim] == "Um dois três. Quatro cinco"
+
+
+def test_fit_to_budget_texto_dentro_do_orcamento():
+    """
+    Testa um texto que cabe inteiro no orçamento.
+
+    Asserts:
+        Todas as sentenças são mantidas e a posição final é o fim do texto.
+    """
+    texto = "Resolveram rápido. Obrigado!"
+
+    sentencas, fim = fit_to_budget(texto, 100)
+
+    assert sentencas == ["Resolveram rápido.", "Obrigado!"]
+    assert fim == len(texto)
+
+
+def test_aggregate_predictions_media_ponderada_com_sinal():
+    """
+    Testa a média das confianças com sinal ponderada pelos tokens.
+
+    Asserts:
+        Polaridades opostas reduzem a confiança e a sentença mais longa
+        define o rótulo.
+    """
+    rotulo, confianca = aggregate_predictions(
+        [("positive", 0.9), ("negative", 0.6)], [1, 3]
+    )
+
+    assert rotulo == "negative"
+    assert abs(confianca - (3 * 0.6 - 0.9) / 4) < 1e-9
+
+
+def test_aggregate_predictions_sentenca_unica():
+    """
+    Testa a agregação de uma única sentença.
+
+    Asserts:
+        O resultado é a própria pontuação do modelo.
+    """
+    assert aggregate_predictions([("negative", 0.8)], [10]) == ("negative", 0.8)  # noqa: E501
@@ -0,0 +1,196 @@
+"""Testes do casamento de léxicos em varredura única."""
+
+import random
+import re
+
+import pytest
+from app.services.matcher import (
+    KeywordSequenceMatcher,
+    LexiconMatcher,
+    normalize_text,
+)
+
+
+def test_match_conta_expressoes_por_lexico():
+    """
+    Testa a contagem de expressões com palavras fora de ordem e acentos.
+
+    Asserts:
+        Cada léxico conta as expressões cujas palavras aparecem no texto.
+    """
+    matcher = LexiconMatcher(
+        {
+            "positivas": ["muito bom", "ótimo", "nota 10"],
+            "negativas": ["não resolveu", "péssima"],
+        },
+        ["mas"],
+    )
+
+    resultado = matcher.match(normalize_text("Bom, muito! Ótimo, mas não resolveu."))  # noqa: E501
+
+    assert resultado == {
+        "positivas": 2,
+        "negativas": 1,
+        "has_contradiction": True,
+    }
+
+
+def test_match_considera_termos_contidos_em_outros():
+    """
+    Testa termos que só aparecem como substring de termos mais longos.
+
+    Asserts:
+        "ok" é encontrado dentro de "book" e "mas" dentro de "demasiado",
+        como na contagem por substring original.
+    """
+    matcher = LexiconMatcher({"fracas": ["ok", "meio"]}, ["mas"])
+
+    resultado = matcher.match(normalize_text("Um book demasiado grande"))
+
+    assert resultado == {"fracas": 1, "has_contradiction": True}
+
+
+def test_match_texto_sem_termos():
+    """
+    Testa um texto sem nenhuma expressão dos léxicos.
+
+    Asserts:
+        Todas as contagens são zero e não há contradição.
+    """
+    matcher = LexiconMatcher({"positivas": ["excelente"]}, ["porém"])
+
+    resultado = matcher.match(normalize_text("Atendimento comum"))
+
+    assert resultado == {"positivas": 0, "has_contradiction": False}
+
+
+def test_match_por_lemas():
+    """
+    Testa o casamento pelas formas lematizadas das expressões.
+
+    Asserts:
+        "atenciosa" casa com "atencioso" apenas quando os lemas do texto
+        são informados.
+    """
+    lemas = {"atenciosa": "atencioso", "atencioso": "atencioso"}
+
+    def lematizar(textos):
+        return [
+            " ".join(lemas.get(palavra, palavra) for palavra in texto.split())
+            for texto in textos
+        ]
+
+    matcher = LexiconMatcher(
+        {"positivas": ["atenciosa"]}, ["mas"], lemmatize=lematizar
+    )
+    texto = "Equipe atencioso"
+
+    sem_lemas = matcher.match(normalize_text(texto))
+    com_lemas = matcher.match(
+        normalize_text(texto), lematizar([normalize_text(texto)])[0]
+    )
+
+    assert sem_lemas["positivas"] == 0
+    assert com_lemas["positivas"] == 1
+
+
+@pytest.mark.parametrize(
+    "texto,esperado",
+    [
+        ("educado, mas nao conseguiu", True),
+        ("nao conseguiu, mas foi educado", False),
+        ("educado\nmas nao conseguiu", False),
+        ("educadomas", False),
+        ("educado demasiado nao conseguiu", True),
+    ],
+)
+def test_sequencia_em_ordem_na_mesma_linha(texto: str, esperado: bool):
+    """
+    Testa a ordem dos termos, a barreira de quebra de linha e termos
+    contidos em outras palavras.
+
+    Args:
+        texto (str): Texto já normalizado.
+        esperado (bool): Se o padrão deve ser encontrado.
+
+    Asserts:
+        O resultado coincide com o do regex "educado.*mas.*nao conseguiu".
+    """
+    matcher = KeywordSequenceMatcher([("educado", "mas", "nao conseguiu")])
+
+    assert matcher.match(texto) is esperado
+
+
+def test_sequencia_com_distancia_maxima():
+    """
+    Testa o limite de caracteres entre termos consecutivos.
+
+    Asserts:
+        Uma ocorrência próxima posterior satisfaz o limite mesmo que a
+        primeira ocorrência do termo esteja longe demais.
+    """
+    matcher = KeywordSequenceMatcher([("tentou", "mas", "solucao")], max_gap=5)  # noqa: E501
+
+    assert not matcher.match("tentou muito, mas sem solucao")
+    assert matcher.match("tentou, tentou mas solucao")
+
+
+def test_sequencia_equivale_a_regex():
+    """
+    Testa a equivalência com os regexes "a.*b" e "a.{0,n}b" em textos
+    aleatórios.
+
+    Asserts:
+        O matcher e o regex concordam em todos os casos.
+    """
+    gerador = random.Random(0)
+    pedacos = ["ab", "a", "b", "ba", "abc", " ", "\n", "x"]
+
+    for _ in range(2000):
+        padroes = [
+            tuple(gerador.choice(pedacos[:5]) for _ in range(gerador.randint(1, 3)))  # noqa: E501
+            for _ in range(gerador.randint(1, 3))
+        ]
+        distancia = gerador.choice([None, 0, 2])
+        texto = "".join(gerador.choice(pedacos) for _ in range(12))
+        separador = ".*" if distancia is None else f".{{0,{distancia}}}"
+
+        esperado = any(
+            re.search(separador.join(map(re.escape, padrao)), texto)
+            for padrao in padroes
+        )
+
+        assert KeywordSequenceMatcher(padroes, distancia).match(texto) == esperado  # noqa: E501
+
+
+def test_lemas_casam_apenas_tokens_inteiros():
+    """
+    Testa o casamento pelos lemas com palavras contidas em outras.
+
+    Asserts:
+        "reto" não casa com o lema "correto" (de "corretas") e uma
+        expressão de duas palavras casa só com a sequência contígua dos
+        lemas.
+    """
+    lemas = {"atenciosa": "atencioso", "corretas": "correto"}
+
+    def lematizar(textos):
+        return [
+            " ".join(lemas.get(palavra, palavra) for palavra in texto.split())
+            for texto in textos
+        ]
+
+    matcher = LexiconMatcher(
+        {"positivas": ["reto", "equipe atenciosa"]}, ["mas"],
+        lemmatize=lematizar,
+    )
+
+    def contar(texto):
+        normalizado = normalize_text(texto)
+        return matcher.match(normalizado, lematizar([normalizado])[0])[
+            "positivas"
+        ]
+
+    assert contar("respostas corretas") == 0
+    assert contar("atencioso equipe") == 0
+    assert contar("equipe atencioso") == 1
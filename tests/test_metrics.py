@@ -0,0 +1,117 @@
+"""Testes da instrumentação e da rota de métricas."""
+
+import pytest
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.database import InstrumentedAsyncPool
+from app.main import app
+from app.metrics import instrument_engine, statement_operation
+from app.services.backends import StubBackend
+from app.services.classifier import SentimentClassifier
+
+client = TestClient(app)
+
+
+def amostra(nome: str, **labels) -> float:
+    """Retorna o valor atual de uma amostra, ou 0 se ainda não existir."""
+    return REGISTRY.get_sample_value(nome, labels) or 0.0
+
+
+def test_metrics_expoe_latencia_por_rota():
+    """
+    Testa a latência por rota exposta em /metrics.
+
+    Asserts:
+        A rota chamada aparece pelo caminho declarado, com método e status.
+    """
+    client.get("/health/live")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert (
+        'http_request_duration_seconds_count{method="GET",'
+        'route="/health/live",status="200"}'
+    ) in response.text
+    assert "report_cache_hit_ratio" in response.text
+
+
+def test_classificacao_registra_etapas_e_sentimento():
+    """
+    Testa as métricas registradas por uma classificação decidida pelas
+    regras.
+
+    Asserts:
+        A etapa de heurísticas é medida, a do modelo não, e o sentimento é
+        contado no caminho "rules".
+    """
+    heuristicas = amostra(
+        "classifier_stage_duration_seconds_count", stage="heuristics"
+    )
+    modelo = amostra("classifier_stage_duration_seconds_count", stage="model")
+    negativas = amostra(
+        "classifications_total", sentiment="negative", path="rules"
+    )
+
+    classificador = SentimentClassifier(backend=StubBackend())
+    classificador.classify_batch(
+        ["Atendimento péssimo, horrível e inaceitável."], check_cache=False
+    )
+
+    assert amostra(
+        "classifier_stage_duration_seconds_count", stage="heuristics"
+    ) == heuristicas + 1
+    assert amostra(
+        "classifier_stage_duration_seconds_count", stage="model"
+    ) == modelo
+    assert amostra(
+        "classifications_total", sentiment="negative", path="rules"
+    ) == negativas + 1
+
+
+@pytest.mark.anyio
+async def test_engine_instrumentado_mede_consultas_e_checkout(tmp_path):
+    """
+    Testa a duração das consultas e a espera no checkout do pool.
+
+    Asserts:
+        Um SELECT é medido e o checkout da conexão e a ocupação do pool
+        são registrados com o nome do engine.
+    """
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'metricas.sqlite3'}",
+        poolclass=InstrumentedAsyncPool,
+        pool_logging_name="teste",
+    )
+    instrument_engine(engine, "teste")
+    consultas = amostra(
+        "db_query_duration_seconds_count", engine="teste", operation="SELECT"
+    )
+    checkouts = amostra("db_pool_checkout_wait_seconds_count", engine="teste")
+
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+    await engine.dispose()
+
+    assert amostra(
+        "db_query_duration_seconds_count", engine="teste", operation="SELECT"
+    ) == consultas + 1
+    assert amostra(
+        "db_pool_checkout_wait_seconds_count", engine="teste"
+    ) == checkouts + 1
+    assert amostra("db_pool_checked_out", engine="teste") == 0
+
+
+def test_statement_operation():
+    """
+    Testa a extração do comando SQL usado como rótulo.
+
+    Asserts:
+        O primeiro termo é retornado em maiúsculas.
+    """
+    assert statement_operation("  insert into reviews ...") == "INSERT"
+    assert statement_operation("") == "UNKNOWN"
@@ -0,0 +1,199 @@
+"""Testes do cache do relatório em blocos por dia."""
+
+from datetime import date
+from unittest.mock import patch
+
+import pytest
+
+from app.services.report_cache import ReportCache
+
+pytestmark = pytest.mark.anyio
+
+DIA_1 = date(2024, 1, 1)
+DIA_2 = date(2024, 1, 2)
+DIA_3 = date(2024, 1, 3)
+
+
+class Banco:
+    """Resumo diário em memória que registra os intervalos consultados."""
+
+    def __init__(self):
+        self.contagens = {
+            DIA_1: {"positive": 2, "neutral": 0, "negative": 1},
+            DIA_3: {"positive": 0, "neutral": 4, "negative": 0},
+        }
+        self.consultas = []
+
+    async def load(self, start: date, end: date):
+        self.consultas.append((start, end))
+        return {
+            dia: dict(contagem)
+            for dia, contagem in self.contagens.items()
+            if start <= dia <= end
+        }
+
+    async def load_totals(self, start: date, end: date):
+        self.consultas.append(("totais", start, end))
+        totais = {"positive": 0, "neutral": 0, "negative": 0}
+        for dia, contagem in self.contagens.items():
+            if start <= dia <= end:
+                for sentimento, quantidade in contagem.items():
+                    totais[sentimento] += quantidade
+        return totais
+
+
+async def test_relatorio_servido_da_memoria():
+    """
+    Testa a soma do relatório a partir dos dias em cache.
+
+    Asserts:
+        O primeiro relatório consulta o banco uma vez, o segundo não o
+        consulta e a taxa de acerto considera cada dia.
+    """
+    cache = ReportCache(max_days=10)
+    banco = Banco()
+
+    primeiro = await cache.get_report(
+        DIA_1, DIA_3, banco.load, banco.load_totals
+    )
+    segundo = await cache.get_report(
+        DIA_1, DIA_3, banco.load, banco.load_totals
+    )
+
+    assert primeiro == segundo == {"positive": 2, "neutral": 4, "negative": 1}
+    assert banco.consultas == [(DIA_1, DIA_3)]
+    stats = cache.get_stats()
+    assert stats["hits"] == 3
+    assert stats["misses"] == 3
+    assert stats["hit_ratio"] == 0.5
+
+
+async def test_invalidacao_relê_apenas_dias_afetados():
+    """
+    Testa a invalidação pela data das avaliações criadas.
+
+    Asserts:
+        Apenas o dia invalidado é lido de novo, em uma única consulta, e o
+        relatório reflete a nova contagem.
+    """
+    cache = ReportCache(max_days=10)
+    banco = Banco()
+    await cache.get_report(DIA_1, DIA_3, banco.load, banco.load_totals)
+
+    banco.contagens[DIA_2] = {"positive": 0, "neutral": 0, "negative": 5}
+    cache.invalidate([DIA_2, DIA_2])
+    relatorio = await cache.get_report(
+        DIA_1, DIA_3, banco.load, banco.load_totals
+    )
+
+    assert relatorio == {"positive": 2, "neutral": 4, "negative": 6}
+    assert banco.consultas[1] == (DIA_2, DIA_2)
+    assert cache.get_stats()["invalidations"] == 1
+
+
+async def test_invalidacao_durante_consulta_nao_guarda_dia():
+    """
+    Testa uma inserção confirmada enquanto o relatório consulta o banco.
+
+    Asserts:
+        O dia invalidado no meio da consulta não fica em cache e é lido de
+        novo no relatório seguinte.
+    """
+    cache = ReportCache(max_days=10)
+    banco = Banco()
+
+    async def load_com_insercao(start, end):
+        contagens = await banco.load(start, end)
+        cache.invalidate([DIA_1])
+        return contagens
+
+    await cache.get_report(DIA_1, DIA_3, load_com_insercao, banco.load_totals)
+    await cache.get_report(DIA_1, DIA_3, banco.load, banco.load_totals)
+
+    assert banco.consultas[1] == (DIA_1, DIA_1)
+
+
+async def test_dias_expiram_apos_ttl():
+    """
+    Testa a expiração dos dias em cache.
+
+    Asserts:
+        Após o TTL, os dias são lidos novamente do banco.
+    """
+    cache = ReportCache(max_days=10, ttl_seconds=60)
+    banco = Banco()
+
+    with patch("app.services.report_cache.time.monotonic", return_value=0):
+        await cache.get_report(DIA_1, DIA_3, banco.load, banco.load_totals)
+    with patch("app.services.report_cache.time.monotonic", return_value=30):
+        await cache.get_report(DIA_1, DIA_3, banco.load, banco.load_totals)
+    with patch("app.services.report_cache.time.monotonic", return_value=61):
+        await cache.get_report(DIA_1, DIA_3, banco.load, banco.load_totals)
+
+    assert len(banco.consultas) == 2
+
+
+async def test_lru_limita_dias_em_memoria():
+    """
+    Testa o limite de dias guardados em memória.
+
+    Asserts:
+        Ao passar do limite, o dia usado há mais tempo sai do cache.
+    """
+    cache = ReportCache(max_days=2)
+    banco = Banco()
+
+    await cache.get_report(DIA_1, DIA_2, banco.load, banco.load_totals)
+    await cache.get_report(DIA_3, DIA_3, banco.load, banco.load_totals)
+
+    assert cache.get_stats()["size"] == 2
+    await cache.get_report(DIA_2, DIA_3, banco.load, banco.load_totals)
+    assert len(banco.consultas) == 2
+    await cache.get_report(DIA_1, DIA_1, banco.load, banco.load_totals)
+    assert banco.consultas[-1] == (DIA_1, DIA_1)
+
+
+async def test_intervalo_maior_que_o_cache_somado_no_banco():
+    """
+    Testa um intervalo com mais dias do que cabem no cache.
+
+    Asserts:
+        O relatório é somado em uma consulta, sem ler nem guardar os dias.
+    """
+    cache = ReportCache(max_days=2)
+    banco = Banco()
+
+    relatorio = await cache.get_report(
+        date(1, 1, 1), date(9999, 12, 31), banco.load, banco.load_totals
+    )
+
+    assert relatorio == {"positive": 2, "neutral": 4, "negative": 1}
+    assert banco.consultas == [("totais", date(1, 1, 1), date(9999, 12, 31))]
+    stats = cache.get_stats()
+    assert stats["size"] == stats["hits"] == stats["misses"] == 0
+
+
+async def test_dia_invalidado_nao_volta_ao_cache_na_carencia():
+    """
+    Testa a carência após a invalidação, em que a réplica de leitura pode
+    ainda não ter a avaliação criada.
+
+    Asserts:
+        Durante a carência, o dia invalidado é lido a cada relatório; após
+        ela, volta a ser guardado.
+    """
+    cache = ReportCache(max_days=10, grace_seconds=5)
+    banco = Banco()
+    relogio = "app.services.report_cache.time.monotonic"
+
+    with patch(relogio, return_value=0):
+        await cache.get_report(DIA_1, DIA_3, banco.load, banco.load_totals)
+    with patch(relogio, return_value=10):
+        cache.invalidate([DIA_1])
+    for agora in (11, 14, 16, 17):
+        with patch(relogio, return_value=agora):
+            await cache.get_report(
+                DIA_1, DIA_3, banco.load, banco.load_totals
+            )
+
+    assert banco.consultas[1:] == [(DIA_1, DIA_1)] * 3
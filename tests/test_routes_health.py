@@ -0,0 +1,84 @@
+"""Testes das rotas de saúde e prontidão."""
+
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+client = TestClient(app)
+
+
+def test_liveness():
+    """
+    Testa a verificação de vida.
+
+    Asserts:
+        O status é 200 mesmo sem o classificador carregado.
+    """
+    response = client.get("/health/live")
+
+    assert response.status_code == 200
+    assert response.json() == {"status": "ok"}
+
+
+def test_readiness_not_ready():
+    """
+    Testa a prontidão antes do aquecimento do classificador.
+
+    Asserts:
+        O status é 503 e o corpo indica que a aplicação está iniciando.
+    """
+    status = {
+        "ready": False,
+        "load_seconds": None,
+        "warmup_seconds": None,
+        "first_request_seconds": None,
+    }
+    with patch("app.routers.health.get_classifier_status", return_value=status):  # noqa: E501
+        response = client.get("/health/ready")
+
+    assert response.status_code == 503
+    assert response.json()["status"] == "starting"
+
+
+def test_readiness_ready():
+    """
+    Testa a prontidão após o aquecimento do classificador.
+
+    Asserts:
+        O status é 200 e os tempos de inicialização são reportados.
+    """
+    status = {
+        "ready": True,
+        "load_seconds": 4.2,
+        "warmup_seconds": 0.3,
+        "first_request_seconds": None,
+    }
+    with patch("app.routers.health.get_classifier_status", return_value=status):  # noqa: E501
+        response = client.get("/health/ready")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "ready"
+    assert data["load_seconds"] == 4.2
+
+
+def test_readiness_sem_preload():
+    """
+    Testa a prontidão real, sem o classificador carregado.
+
+    Asserts:
+        Com `CLASSIFIER_PRELOAD`, a aplicação não fica pronta antes do
+        aquecimento; sem ele, fica pronta de imediato, pois o modelo só é
+        carregado na primeira requisição.
+    """
+    with patch("app.services.classifier._classifier", None), patch.dict("app.services.classifier._status", warmup_seconds=None):  # noqa: E501
+        with patch("app.services.classifier.CLASSIFIER_PRELOAD", True):
+            com_preload = client.get("/health/ready")
+        with patch("app.services.classifier.CLASSIFIER_PRELOAD", False):
+            sem_preload = client.get("/health/ready")
+
+    assert com_preload.status_code == 503
+    assert sem_preload.status_code == 200
+    assert sem_preload.json()["status"] == "ready"
@@ -1,15 +1,32 @@
 """Testes das rotas da API de avaliações."""
 
+import asyncio
+import csv
+import io
+import json
+from collections import namedtuple
 from datetime import date
 from unittest.mock import patch, MagicMock
 
+import httpx
 import pytest
 from fastapi.testclient import TestClient
 
+from app.crud.review import BulkInsertError, content_hash, decode_cursor
 from app.main import app
+from app.schemas.review import ReviewCreate, SentimentsEnum
+from app.services.report_cache import report_cache
+from app.services.scheduler import SchedulerOverloadedError
 
 client = TestClient(app)
 
+# Linha com as colunas de `REVIEW_COLUMNS`, como retornada pela listagem e
+# pela busca.
+Linha = namedtuple(
+    "Linha",
+    ["id", "customer_name", "review_text", "evaluation_date", "sentiment"],
+)
+
 
 @pytest.fixture
 def fake_review():
@@ -21,6 +38,19 @@ def fake_review():
     }
 
 
+@pytest.fixture(autouse=True)
+def sem_avaliacoes_existentes():
+    """Simula um banco sem avaliações com o mesmo conteúdo ou a mesma
+    Idempotency-Key das enviadas."""
+    with patch("app.routers.review.get_reviews_by_content_hash", return_value={}) as mock_hash, patch("app.routers.review.get_review_by_idempotency_key", return_value=None):  # noqa: E501
+        yield mock_hash
+
+
+def outra_avaliacao(fake_review, i):
+    """Retorna uma cópia da avaliação simulada com outro texto."""
+    return {**fake_review, "review_text": f"{fake_review['review_text']} {i}"}  # noqa: E501
+
+
 def test_create_review_success(fake_review):
     """
     Testa a criação de uma nova avaliação com sucesso.
@@ -32,7 +62,7 @@ def test_create_review_success(fake_review):
         O status code da resposta é 201.
         O corpo da resposta contém os dados esperados.
     """
-    with patch("app.routers.review.classify_sentiment", return_value="positive"), patch("app.routers.review.create_review") as mock_create:  # noqa: E501
+    with patch("app.routers.review.classify_sentiment_async", return_value="positive"), patch("app.routers.review.create_review") as mock_create:  # noqa: E501
         mock_create.return_value = MagicMock(
             id=1,
             customer_name=fake_review["customer_name"],
@@ -61,13 +91,7 @@ def test_list_reviews_success():
     """
     with patch("app.routers.review.get_reviews") as mock_list:
         mock_list.return_value = [
-            MagicMock(
-                id=1,
-                customer_name="Cliente A",
-                review_text="Muito bom",
-                evaluation_date=date(2024, 7, 1),
-                sentiment="positive"
-            )
+            Linha(1, "Cliente A", "Muito bom", date(2024, 7, 1), SentimentsEnum.POSITIVE)  # noqa: E501
         ]
 
         response = client.get("/reviews/")
@@ -78,6 +102,155 @@ def test_list_reviews_success():
         assert data[0]["sentiment"] == "positive"
 
 
+def test_list_reviews_next_cursor():
+    """
+    Testa a paginação da listagem de avaliações.
+
+    Asserts:
+        A página tem `limit` itens, o cabeçalho X-Next-Cursor aponta para a
+        última avaliação retornada e o total é informado quando pedido.
+    """
+    reviews = [
+        Linha(i, "Cliente A", "Muito bom", date(2024, 7, i), SentimentsEnum.POSITIVE)  # noqa: E501
+        for i in (3, 2, 1)
+    ]
+    with patch("app.routers.review.get_reviews", return_value=reviews) as mock_list, patch("app.routers.review.count_reviews", return_value=42):  # noqa: E501
+        response = client.get(
+            "/reviews/?limit=2&sentiment=positive&include_total=true"
+        )
+
+    assert response.status_code == 200
+    assert [r["id"] for r in response.json()] == [3, 2]
+    assert decode_cursor(response.headers["X-Next-Cursor"]) == (
+        date(2024, 7, 2), 2
+    )
+    assert response.headers["X-Total-Count"] == "42"
+    assert mock_list.call_args.kwargs["limit"] == 3
+    assert mock_list.call_args.kwargs["sentiment"] == "positive"
+
+
+def test_search_reviews_next_offset():
+    """
+    Testa a busca de avaliações por texto.
+
+    Asserts:
+        A página tem `limit` itens, o cabeçalho X-Next-Offset indica a
+        página seguinte e os filtros são repassados à busca.
+    """
+    reviews = [
+        Linha(i, "Cliente A", "Boleto com erro", date(2024, 7, i), SentimentsEnum.NEGATIVE)  # noqa: E501
+        for i in (1, 2, 3)
+    ]
+    with patch("app.routers.review.search_reviews", return_value=reviews) as mock_search:  # noqa: E501
+        response = client.get(
+            "/reviews/search?q=boleto&limit=2&offset=4&sentiment=negative"
+        )
+
+    assert response.status_code == 200
+    assert [r["id"] for r in response.json()] == [1, 2]
+    assert response.headers["X-Next-Offset"] == "6"
+    assert mock_search.call_args.args[1] == "boleto"
+    assert mock_search.call_args.kwargs["limit"] == 3
+    assert mock_search.call_args.kwargs["offset"] == 4
+    assert mock_search.call_args.kwargs["sentiment"] == "negative"
+
+
+def test_list_reviews_gzip():
+    """
+    Testa a compressão de uma página grande da listagem.
+
+    Asserts:
+        Com `Accept-Encoding: gzip`, a resposta vem comprimida e, sem ele,
+        sem compressão; o conteúdo é o mesmo.
+    """
+    reviews = [
+        Linha(i, "Cliente A", "Atendimento muito bom", date(2024, 7, 1), SentimentsEnum.POSITIVE)  # noqa: E501
+        for i in range(200, 0, -1)
+    ]
+    with patch("app.routers.review.get_reviews", return_value=reviews):
+        comprimida = client.get(
+            "/reviews/?limit=200", headers={"Accept-Encoding": "gzip"}
+        )
+        simples = client.get(
+            "/reviews/?limit=200", headers={"Accept-Encoding": "identity"}
+        )
+
+    assert comprimida.headers["content-encoding"] == "gzip"
+    assert "content-encoding" not in simples.headers
+    assert comprimida.json() == simples.json()
+    assert len(comprimida.json()) == 200
+
+
+def test_search_reviews_requires_query():
+    """
+    Testa a busca sem o texto buscado.
+
+    Asserts:
+        O status da resposta é 422.
+    """
+    assert client.get("/reviews/search").status_code == 422
+    assert client.get("/reviews/search?q=").status_code == 422
+
+
+def test_list_reviews_invalid_cursor():
+    """
+    Testa a listagem com um cursor malformado.
+
+    Asserts:
+        O status da resposta é 400.
+    """
+    response = client.get("/reviews/?cursor=invalido")
+
+    assert response.status_code == 400
+
+
+def fake_stream(*args, **kwargs):
+    """Simula `stream_reviews` com dois blocos de linhas."""
+    async def gerar():
+        yield [(1, "Cliente A", "Muito bom", date(2024, 7, 1), SentimentsEnum.POSITIVE)]  # noqa: E501
+        yield [(2, "Cliente B", "Ruim, \"lento\"", date(2024, 7, 2), SentimentsEnum.NEGATIVE)]  # noqa: E501
+    return gerar()
+
+
+def test_export_reviews_ndjson():
+    """
+    Testa a exportação em NDJSON.
+
+    Asserts:
+        O status é 200, o tipo é application/x-ndjson e cada linha é uma
+        avaliação em JSON.
+    """
+    with patch("app.routers.review.stream_reviews", side_effect=fake_stream) as mock_stream:  # noqa: E501
+        response = client.get("/reviews/export?start_date=2024-07-01")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    linhas = [json.loads(linha) for linha in response.text.splitlines()]
+    assert [linha["id"] for linha in linhas] == [1, 2]
+    assert linhas[1]["sentiment"] == "negative"
+    assert linhas[0]["evaluation_date"] == "2024-07-01"
+    assert mock_stream.call_args.args[1] == date(2024, 7, 1)
+
+
+def test_export_reviews_csv():
+    """
+    Testa a exportação em CSV.
+
+    Asserts:
+        O status é 200 e o corpo tem o cabeçalho e uma linha por avaliação.
+    """
+    with patch("app.routers.review.stream_reviews", side_effect=fake_stream):  # noqa: E501
+        response = client.get("/reviews/export?format=csv")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    linhas = list(csv.reader(io.StringIO(response.text)))
+    assert linhas[0] == [
+        "id", "customer_name", "review_text", "evaluation_date", "sentiment"
+    ]
+    assert linhas[2] == ["2", "Cliente B", 'Ruim, "lento"', "2024-07-02", "negative"]  # noqa: E501
+
+
 def test_get_review_by_id_found():
     """
     Testa a recuperação de uma avaliação existente por ID.
@@ -118,7 +291,15 @@ def test_get_review_by_id_not_found():
         assert "não encontrada" in response.json()["detail"]
 
 
-def test_get_review_report():
+@pytest.fixture
+def cache_vazio():
+    """Esvazia o cache do relatório antes e depois do teste."""
+    report_cache.clear()
+    yield report_cache
+    report_cache.clear()
+
+
+def test_get_review_report(cache_vazio):
     """
     Testa a geração de relatório de sentimentos.
 
@@ -126,11 +307,10 @@ def test_get_review_report():
         O status é 200.
         A resposta contém os totais por tipo de sentimento.
     """
-    with patch("app.routers.review.get_review_report") as mock_report:
-        mock_report.return_value = {
-            "positive": 10,
-            "neutral": 5,
-            "negative": 3
+    with patch("app.routers.review.get_daily_sentiment_counts") as mock_counts:  # noqa: E501
+        mock_counts.return_value = {
+            date(2024, 7, 1): {"positive": 6, "neutral": 5, "negative": 0},
+            date(2024, 7, 20): {"positive": 4, "neutral": 0, "negative": 3},
         }
 
         response = client.get("/reviews/report?start_date=2024-07-01&end_date=2024-07-31")  # noqa: E501
@@ -140,3 +320,317 @@ def test_get_review_report():
         assert data["positive"] == 10
         assert data["neutral"] == 5
         assert data["negative"] == 3
+
+
+def test_get_review_report_intervalo_longo(cache_vazio):
+    """
+    Testa um relatório com mais dias do que cabem no cache.
+
+    Asserts:
+        Os totais vêm de uma única soma no resumo diário, sem a leitura
+        por dia.
+    """
+    with patch("app.routers.review.get_daily_sentiment_counts") as mock_counts, patch("app.routers.review.get_review_report") as mock_report:  # noqa: E501
+        mock_report.return_value = {"positive": 3, "neutral": 2, "negative": 1}  # noqa: E501
+
+        response = client.get("/reviews/report?start_date=0001-01-01&end_date=2026-01-01")  # noqa: E501
+
+    assert response.status_code == 200
+    assert response.json() == {"positive": 3, "neutral": 2, "negative": 1}
+    mock_counts.assert_not_called()
+    assert mock_report.call_args.args[1:] == (date(1, 1, 1), date(2026, 1, 1))  # noqa: E501
+    assert cache_vazio.get_stats()["size"] == 0
+
+
+def test_get_review_report_cache_invalidado_pela_criacao(fake_review, cache_vazio):  # noqa: E501
+    """
+    Testa o cache do relatório entre requisições.
+
+    Args:
+        fake_review (dict): Dados simulados da avaliação.
+
+    Asserts:
+        O segundo relatório não consulta o banco; após criar uma avaliação,
+        apenas a data dela é lida de novo.
+    """
+    url = "/reviews/report?start_date=2024-06-01&end_date=2024-07-31"
+    with patch("app.routers.review.get_daily_sentiment_counts", return_value={}) as mock_counts:  # noqa: E501
+        client.get(url)
+        client.get(url)
+        assert mock_counts.call_count == 1
+
+        with patch("app.routers.review.classify_sentiment_async", return_value="positive"), patch("app.routers.review.create_review") as mock_create:  # noqa: E501
+            mock_create.return_value = MagicMock(
+                id=1,
+                customer_name=fake_review["customer_name"],
+                review_text=fake_review["review_text"],
+                evaluation_date=date(2024, 7, 1),
+                sentiment="positive",
+            )
+            client.post("/reviews/", json=fake_review)
+
+        mock_counts.return_value = {
+            date(2024, 7, 1): {"positive": 1, "neutral": 0, "negative": 0},
+        }
+        response = client.get(url)
+
+    assert response.json() == {"positive": 1, "neutral": 0, "negative": 0}
+    assert mock_counts.call_count == 2
+    assert mock_counts.call_args.args[1:] == (date(2024, 7, 1), date(2024, 7, 1))  # noqa: E501
+
+
+def test_create_reviews_batch_success(fake_review):
+    """
+    Testa a criação de avaliações em lote com um item inválido.
+
+    Args:
+        fake_review (dict): Dados simulados da avaliação.
+
+    Asserts:
+        O status da resposta é 200.
+        Os itens válidos são criados e o inválido é reportado com erro.
+        A classificação é feita em uma única chamada em lote.
+    """
+    invalid_review = {**fake_review, "review_text": "   "}
+
+    with patch("app.routers.review.classify_sentiment_batch_async", return_value=["positive", "negative"]) as mock_batch, patch("app.routers.review.create_reviews_bulk") as mock_create:  # noqa: E501
+        mock_create.return_value = [
+            MagicMock(
+                id=i,
+                customer_name=fake_review["customer_name"],
+                review_text=fake_review["review_text"],
+                evaluation_date=date.fromisoformat(fake_review["evaluation_date"]),  # noqa: E501
+                sentiment=sentiment,
+            )
+            for i, sentiment in ((1, "positive"), (2, "negative"))
+        ]
+
+        response = client.post(
+            "/reviews/batch",
+            json={"reviews": [
+                fake_review, invalid_review, outra_avaliacao(fake_review, 2)
+            ]},
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["created"] == 2
+        assert data["failed"] == 1
+        assert data["results"][0]["review"]["sentiment"] == "positive"
+        assert data["results"][1]["review"] is None
+        assert "inválidos" in data["results"][1]["error"]
+        assert data["results"][2]["review"]["id"] == 2
+        mock_batch.assert_called_once_with(
+            [fake_review["review_text"], f"{fake_review['review_text']} 2"]
+        )
+
+
+def test_create_reviews_batch_isolates_classification_errors(fake_review):
+    """
+    Testa que uma falha na passada em lote é isolada por item.
+
+    Args:
+        fake_review (dict): Dados simulados da avaliação.
+
+    Asserts:
+        Apenas o item que falha individualmente é reportado com erro.
+    """
+    with patch("app.routers.review.classify_sentiment_batch_async", side_effect=RuntimeError), patch("app.routers.review.classify_sentiment_async", side_effect=["neutral", RuntimeError]), patch("app.routers.review.create_reviews_bulk") as mock_create:  # noqa: E501
+        mock_create.return_value = [
+            MagicMock(
+                id=1,
+                customer_name=fake_review["customer_name"],
+                review_text=fake_review["review_text"],
+                evaluation_date=date.fromisoformat(fake_review["evaluation_date"]),  # noqa: E501
+                sentiment="neutral",
+            )
+        ]
+
+        response = client.post(
+            "/reviews/batch",
+            json={"reviews": [fake_review, outra_avaliacao(fake_review, 1)]},
+        )
+
+        data = response.json()
+        assert data["created"] == 1
+        assert data["results"][0]["review"]["sentiment"] == "neutral"
+        assert "classificar" in data["results"][1]["error"]
+
+
+def test_create_reviews_batch_partial_insert_failure(fake_review):
+    """
+    Testa a falha na gravação de um dos blocos do lote.
+
+    Args:
+        fake_review (dict): Dados simulados da avaliação.
+
+    Asserts:
+        Os itens dos blocos confirmados são reportados como criados e os
+        demais com erro de banco.
+    """
+    criada = MagicMock(
+        id=1,
+        customer_name=fake_review["customer_name"],
+        review_text=fake_review["review_text"],
+        evaluation_date=date.fromisoformat(fake_review["evaluation_date"]),
+        sentiment="positive",
+    )
+    erro = BulkInsertError([criada], RuntimeError("falha"))
+
+    with patch("app.routers.review.classify_sentiment_batch_async", return_value=["positive"] * 3), patch("app.routers.review.create_reviews_bulk", side_effect=erro):  # noqa: E501
+        response = client.post(
+            "/reviews/batch",
+            json={"reviews": [
+                outra_avaliacao(fake_review, i) for i in range(3)
+            ]},
+        )
+
+    data = response.json()
+    assert data["created"] == 1
+    assert data["failed"] == 2
+    assert data["results"][0]["review"]["id"] == 1
+    assert "banco de dados" in data["results"][2]["error"]
+
+
+def test_create_review_overloaded(fake_review):
+    """
+    Testa a resposta quando a fila do classificador está cheia.
+
+    Args:
+        fake_review (dict): Dados simulados da avaliação.
+
+    Asserts:
+        O status da resposta é 503.
+    """
+    with patch("app.routers.review.classify_sentiment_async", side_effect=SchedulerOverloadedError):  # noqa: E501
+        response = client.post("/reviews/", json=fake_review)
+
+    assert response.status_code == 503
+
+
+def avaliacao_gravada(fake_review, **campos):
+    """Retorna uma avaliação simulada já gravada com os dados enviados."""
+    return MagicMock(**{
+        "id": 7,
+        "customer_name": fake_review["customer_name"],
+        "review_text": fake_review["review_text"],
+        "evaluation_date": date.fromisoformat(fake_review["evaluation_date"]),  # noqa: E501
+        "sentiment": "positive",
+        "content_hash": content_hash(ReviewCreate(**fake_review)),
+        **campos,
+    })
+
+
+def test_create_review_duplicada_nao_classifica(fake_review, sem_avaliacoes_existentes):  # noqa: E501
+    """
+    Testa o reenvio de uma avaliação já gravada.
+
+    Args:
+        fake_review (dict): Dados simulados da avaliação.
+        sem_avaliacoes_existentes (MagicMock): Busca pelo hash do conteúdo.
+
+    Asserts:
+        A avaliação existente é devolvida com status 200 e o cabeçalho
+        Idempotent-Replayed, sem classificar o texto nem gravar.
+    """
+    existente = avaliacao_gravada(fake_review)
+    sem_avaliacoes_existentes.side_effect = lambda db, hashes: {
+        hashes[0]: existente
+    }
+    reenvio = {**fake_review, "review_text": f"  {fake_review['review_text']}"}  # noqa: E501
+
+    with patch("app.routers.review.classify_sentiment_async") as mock_classify, patch("app.routers.review.create_review") as mock_create:  # noqa: E501
+        response = client.post("/reviews/", json=reenvio)
+
+    assert response.status_code == 200
+    assert response.headers["Idempotent-Replayed"] == "true"
+    assert response.json()["id"] == 7
+    mock_classify.assert_not_called()
+    mock_create.assert_not_called()
+
+
+def test_create_review_idempotency_key_com_outro_conteudo(fake_review):
+    """
+    Testa o reuso de uma Idempotency-Key com outro conteúdo.
+
+    Args:
+        fake_review (dict): Dados simulados da avaliação.
+
+    Asserts:
+        A requisição é rejeitada com 409, sem classificar o texto.
+    """
+    existente = avaliacao_gravada(fake_review, content_hash="outro")
+
+    with patch("app.routers.review.get_review_by_idempotency_key", return_value=existente) as mock_key, patch("app.routers.review.classify_sentiment_async") as mock_classify:  # noqa: E501
+        response = client.post(
+            "/reviews/", json=fake_review, headers={"Idempotency-Key": "k1"}
+        )
+
+    assert response.status_code == 409
+    assert mock_key.call_args.args[1] == "k1"
+    mock_classify.assert_not_called()
+
+
+@pytest.mark.anyio
+async def test_create_review_envios_simultaneos_classificam_uma_vez(fake_review):  # noqa: E501
+    """
+    Testa envios simultâneos da mesma avaliação.
+
+    Args:
+        fake_review (dict): Dados simulados da avaliação.
+
+    Asserts:
+        O texto é classificado e gravado uma única vez; a primeira
+        resposta é 201 e as demais devolvem a mesma avaliação com 200.
+    """
+    async def classificacao_lenta(text):
+        await asyncio.sleep(0.05)
+        return "positive"
+
+    transport = httpx.ASGITransport(app=app)
+    with patch("app.routers.review.classify_sentiment_async", side_effect=classificacao_lenta) as mock_classify, patch("app.routers.review.create_review", return_value=avaliacao_gravada(fake_review)) as mock_create:  # noqa: E501
+        async with httpx.AsyncClient(transport=transport, base_url="http://teste") as async_client:  # noqa: E501
+            responses = await asyncio.gather(*[
+                async_client.post("/reviews/", json=fake_review)
+                for _ in range(3)
+            ])
+
+    assert mock_classify.call_count == 1
+    assert mock_create.call_count == 1
+    assert sorted(r.status_code for r in responses) == [200, 200, 201]
+    assert {r.json()["id"] for r in responses} == {7}
+
+
+def test_create_reviews_batch_duplicadas(fake_review, sem_avaliacoes_existentes):  # noqa: E501
+    """
+    Testa um lote com uma avaliação já gravada e um item repetido.
+
+    Args:
+        fake_review (dict): Dados simulados da avaliação.
+        sem_avaliacoes_existentes (MagicMock): Busca pelo hash do conteúdo.
+
+    Asserts:
+        Só a avaliação nova é classificada, gravada e contada em
+        `created`; a existente e a repetição no lote são devolvidas com
+        `duplicate` e contadas em `duplicates`.
+    """
+    existente = avaliacao_gravada(fake_review)
+    nova = outra_avaliacao(fake_review, 1)
+    sem_avaliacoes_existentes.return_value = {
+        existente.content_hash: existente
+    }
+
+    with patch("app.routers.review.classify_sentiment_batch_async", return_value=["negative"]) as mock_batch, patch("app.routers.review.create_reviews_bulk") as mock_create:  # noqa: E501
+        mock_create.return_value = [
+            avaliacao_gravada(nova, id=8, sentiment="negative")
+        ]
+        response = client.post(
+            "/reviews/batch", json={"reviews": [fake_review, nova, nova]}
+        )
+
+    data = response.json()
+    assert (data["created"], data["duplicates"], data["failed"]) == (1, 2, 0)
+    assert [r["review"]["id"] for r in data["results"]] == [7, 8, 8]
+    assert [r["duplicate"] for r in data["results"]] == [True, False, True]
+    assert data["results"][2]["index"] == 2
+    mock_batch.assert_called_once_with([nova["review_text"]])
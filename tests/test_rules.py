@@ -0,0 +1,177 @@
+"""Testes das regras heurísticas carregadas de arquivo e da sua recarga."""
+
+import json
+import os
+import threading
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.backends import StubBackend
+from app.services.classifier import SentimentClassifier
+from app.services.rules import (
+    DEFAULT_RULES_PATH,
+    RulesWatcher,
+    load_rules_config,
+    validate_rules_config,
+)
+
+client = TestClient(app)
+
+TEXTO = "Resolveram com uma gambiarra."
+
+
+def gravar_regras(caminho, **alteracoes) -> dict:
+    """Grava uma cópia das regras padrão com as alterações informadas."""
+    config = load_rules_config(DEFAULT_RULES_PATH)
+    config.update(alteracoes)
+    caminho.write_text(json.dumps(config, ensure_ascii=False))
+    return config
+
+
+@pytest.fixture
+def classificador() -> SentimentClassifier:
+    """Classificador isolado, com backend determinístico."""
+    return SentimentClassifier(backend=StubBackend())
+
+
+def test_regras_padrao_carregadas_do_arquivo(classificador):
+    """
+    Testa se o classificador usa os léxicos e limiares do arquivo padrão.
+
+    Asserts:
+        Os léxicos e padrões do classificador são os do arquivo e a versão
+        do arquivo é reportada.
+    """
+    config = load_rules_config(DEFAULT_RULES_PATH)
+
+    assert classificador.very_positive == config["very_positive"]
+    assert classificador.negations == config["negations"]
+    assert classificador.neutral_patterns == [
+        tuple(padrao) for padrao in config["neutral_patterns"]
+    ]
+    assert classificador.rules.thresholds == config["thresholds"]
+    assert classificador.get_rules_info()["version"] == config["version"]
+
+
+@pytest.mark.parametrize(
+    "alteracao",
+    [
+        {"version": ""},
+        {"very_negative": "péssima"},
+        {"neutral_patterns": [[]]},
+        {"thresholds": {"rules_positive": 3}},
+    ],
+)
+def test_validacao_rejeita_regras_invalidas(alteracao: dict):
+    """
+    Testa a validação da estrutura do arquivo de regras.
+
+    Asserts:
+        Versão vazia, léxico que não é lista, padrão vazio e limiares
+        ausentes levantam ValueError.
+    """
+    config = load_rules_config(DEFAULT_RULES_PATH)
+    config.update(alteracao)
+
+    with pytest.raises(ValueError):
+        validate_rules_config(config)
+
+
+def test_recarga_troca_regras_sem_recarregar_modelo(classificador, tmp_path):
+    """
+    Testa a recarga das regras a partir de um novo arquivo.
+
+    Asserts:
+        Após a recarga, o novo termo e o novo limiar decidem o texto sem o
+        modelo, a versão do cache muda e o backend não é recarregado.
+    """
+    versao_anterior = classificador.version
+    assert classificador.analyze_heuristics(TEXTO)["very_negative"] == 0
+
+    caminho = tmp_path / "regras.json"
+    config = load_rules_config(DEFAULT_RULES_PATH)
+    gravar_regras(
+        caminho,
+        version="2",
+        very_negative=config["very_negative"] + ["gambiarra"],
+        thresholds={**config["thresholds"], "rules_strong_negative": 1},
+    )
+
+    with patch.object(classificador.backend, "load") as mock_load:
+        info = classificador.reload_rules(str(caminho))
+    mock_load.assert_not_called()
+
+    assert info["reloaded"] is True
+    assert info["version"] == "2"
+    assert classificador.version != versao_anterior
+    assert classificador.cache.version == classificador.version
+    with patch.object(classificador, "predict_model") as mock_predict:
+        assert classificador.classify_sentiment(TEXTO) == "negative"
+    mock_predict.assert_not_called()
+
+    assert classificador.reload_rules()["reloaded"] is False
+
+
+def test_recarga_invalida_mantem_regras(classificador, tmp_path):
+    """
+    Testa a recarga a partir de um arquivo inválido.
+
+    Asserts:
+        A recarga levanta ValueError e as regras e a versão em uso são
+        mantidas.
+    """
+    regras = classificador.rules
+    versao = classificador.version
+    caminho = tmp_path / "regras.json"
+    gravar_regras(caminho, thresholds={})
+
+    with pytest.raises(ValueError):
+        classificador.reload_rules(str(caminho))
+
+    assert classificador.rules is regras
+    assert classificador.version == versao
+
+
+def test_watcher_recarrega_quando_arquivo_muda(tmp_path):
+    """
+    Testa o monitoramento da data de modificação do arquivo de regras.
+
+    Asserts:
+        A função de recarga é chamada após o arquivo ser alterado.
+    """
+    caminho = tmp_path / "regras.json"
+    gravar_regras(caminho)
+    alterado = threading.Event()
+    watcher = RulesWatcher(str(caminho), alterado.set, interval_seconds=0.01)
+    watcher.start()
+    try:
+        mtime = os.stat(caminho).st_mtime
+        os.utime(caminho, (mtime + 10, mtime + 10))
+        assert alterado.wait(timeout=5)
+    finally:
+        watcher.stop()
+
+
+def test_rota_recarga():
+    """
+    Testa a rota de recarga das regras.
+
+    Asserts:
+        O status é 200 com a versão recarregada, e 422 quando o arquivo é
+        inválido.
+    """
+    info = {"version": "2", "digest": "abc", "reloaded": True}
+    with patch("app.routers.rules.reload_rules", return_value=info):
+        response = client.post("/rules/reload")
+    assert response.status_code == 200
+    assert response.json() == info
+
+    with patch(
+        "app.routers.rules.reload_rules",
+        side_effect=ValueError("'thresholds' deve ser um objeto."),
+    ):
+        response = client.post("/rules/reload")
+    assert response.status_code == 422
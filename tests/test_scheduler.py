@@ -0,0 +1,141 @@
+"""Testes do agendador de inferência em micro-lotes."""
+
+import threading
+
+import pytest
+
+from app.services.scheduler import (
+    InferenceScheduler,
+    SchedulerOverloadedError,
+)
+
+
+def test_agrupa_requisicoes_concorrentes():
+    """
+    Testa se textos enviados juntos são classificados em um único lote.
+
+    Asserts:
+        Todos os textos cabem em um lote e cada chamador recebe o próprio
+        resultado.
+    """
+    lotes = []
+    liberar = threading.Event()
+
+    def classify_batch(texts):
+        liberar.wait()
+        lotes.append(list(texts))
+        return [text.upper() for text in texts]
+
+    scheduler = InferenceScheduler(
+        classify_batch, max_batch_size=4, max_wait_ms=1000
+    )
+    futures = [scheduler.submit(f"t{i}") for i in range(4)]
+    liberar.set()
+
+    assert [f.result(timeout=5) for f in futures] == ["T0", "T1", "T2", "T3"]
+    assert lotes == [["t0", "t1", "t2", "t3"]]
+    metrics = scheduler.get_metrics()
+    assert metrics["batches"] == 1
+    assert metrics["average_batch_size"] == 4
+    scheduler.stop()
+
+
+def test_respeita_tamanho_maximo_do_lote():
+    """
+    Testa a divisão da fila em lotes de no máximo `max_batch_size`.
+
+    Asserts:
+        Nenhum lote ultrapassa o tamanho máximo configurado.
+    """
+    tamanhos = []
+
+    def classify_batch(texts):
+        tamanhos.append(len(texts))
+        return texts
+
+    scheduler = InferenceScheduler(
+        classify_batch, max_batch_size=2, max_wait_ms=50
+    )
+    futures = [scheduler.submit(str(i)) for i in range(5)]
+
+    assert [f.result(timeout=5) for f in futures] == ["0", "1", "2", "3", "4"]
+    assert max(tamanhos) <= 2
+    assert sum(tamanhos) == 5
+    scheduler.stop()
+
+
+def test_erro_no_lote_propagado_aos_chamadores():
+    """
+    Testa a propagação de uma falha na classificação em lote.
+
+    Asserts:
+        O `Future` de cada chamador do lote recebe a exceção.
+    """
+    def classify_batch(texts):
+        raise RuntimeError("falha no modelo")
+
+    scheduler = InferenceScheduler(classify_batch, max_wait_ms=1)
+    future = scheduler.submit("texto")
+
+    with pytest.raises(RuntimeError):
+        future.result(timeout=5)
+    scheduler.stop()
+
+
+def test_fila_cheia_rejeita_texto():
+    """
+    Testa a rejeição quando a fila atinge a profundidade máxima.
+
+    Asserts:
+        É lançado SchedulerOverloadedError e a rejeição é contabilizada.
+    """
+    liberar = threading.Event()
+    iniciado = threading.Event()
+
+    def classify_batch(texts):
+        iniciado.set()
+        liberar.wait()
+        return texts
+
+    scheduler = InferenceScheduler(
+        classify_batch, max_batch_size=1, max_wait_ms=0, max_queue_size=1
+    )
+    scheduler.submit("em processamento")
+    iniciado.wait(timeout=5)
+    scheduler.submit("na fila")
+
+    with pytest.raises(SchedulerOverloadedError):
+        scheduler.submit("rejeitado")
+
+    assert scheduler.get_metrics()["rejected"] == 1
+    liberar.set()
+    scheduler.stop()
+
+
+def test_chamador_cancelado_nao_afeta_o_lote():
+    """
+    Testa o cancelamento de um chamador enquanto o texto espera na fila.
+
+    Asserts:
+        O texto cancelado não é classificado, o outro chamador do mesmo
+        lote recebe o resultado e a thread continua atendendo os
+        seguintes.
+    """
+    lotes = []
+
+    def classify_batch(texts):
+        lotes.append(list(texts))
+        return [text.upper() for text in texts]
+
+    scheduler = InferenceScheduler(
+        classify_batch, max_batch_size=3, max_wait_ms=200
+    )
+    cancelado = scheduler.submit("t0")
+    irmao = scheduler.submit("t1")
+    assert cancelado.cancel()
+
+    assert irmao.result(timeout=5) == "T1"
+    assert cancelado.cancelled()
+    assert scheduler.submit("t2").result(timeout=5) == "T2"
+    assert lotes == [["t1"], ["t2"]]
+    scheduler.stop()